@@ -14,5 +14,5 @@ if __name__ == "__main__":
         port=config.APP_PORT,
         reload=config.APP_MODE == config.AppMode.TESTING,
         reload_dirs=reload_dirs,
-        workers=1,
+        workers=config.APP_WORKERS,
     )
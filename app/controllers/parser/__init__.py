@@ -1,6 +1,6 @@
 from fastapi import Security
 
-from app.controllers.parser import parse, strategies, queue, poll
+from app.controllers.parser import parse, strategies, queue, poll, cancel, batch, batch_poll, stream, elements, assets, precheck, upload_create, upload_status, upload_chunk, upload_finalize
 from app.core import config
 from app.core.route import CriaRouter
 from app.core.schemas import AppMode
@@ -12,8 +12,19 @@ router = CriaRouter(
 )
 
 router.include_views(
+    precheck.view,
     queue.view,
+    upload_create.view,
+    upload_status.view,
+    upload_chunk.view,
+    upload_finalize.view,
     poll.view,
+    stream.view,
+    elements.view,
+    assets.view,
+    cancel.view,
+    batch.view,
+    batch_poll.view,
     parse.view,
     strategies.view,
 )
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Path
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.blob.store import Blob
+
+view = APIRouter()
+
+
+class ParserAssetResponse(APIResponse):
+    pass
+
+
+@cbv(view)
+class ParserAssetRoute(CriaRoute):
+    ResponseModel = ParserAssetResponse
+    Description = "Download an asset referenced by the 'data_ref' of a parse result. Supports range requests."
+
+    @view.get(
+        path="/parser/assets/{asset_id}",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            asset_id: str = Path(pattern=r"^[A-Za-z0-9_-]{1,128}$")
+    ) -> ResponseModel:
+        blob: Blob | None = await request.app.criaparse.get_asset(asset_id=asset_id)
+
+        if blob is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The asset with the ID {asset_id} was not found!",
+            )
+
+        # Assets never change once written
+        headers: dict = {"Cache-Control": "private, max-age=86400, immutable"}
+
+        # Sent straight from disk, with Range support
+        if blob.path is not None:
+            return FileResponse(path=blob.path, media_type=blob.content_type, headers=headers)
+
+        return Response(content=blob.data, media_type=blob.content_type, headers=headers)
+
+
+__all__ = ["view"]
@@ -0,0 +1,55 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.daemon.batch import BatchProgress
+
+view = APIRouter()
+
+
+class ParserBatchPollResponse(APIResponse):
+    batch: Optional[BatchProgress] = None
+
+
+@cbv(view)
+class ParserBatchPollRoute(CriaRoute):
+    ResponseModel = ParserBatchPollResponse
+    Description = "Poll the aggregate progress of a batch of parse jobs. Poll each job for its results."
+
+    @view.get(
+        path="/parser/batch/poll",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            batch_id: uuid.UUID
+    ) -> ResponseModel:
+        progress: BatchProgress | None = await request.app.criaparse.poll_batch(batch_id=str(batch_id))
+
+        if progress is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The batch with the ID {batch_id} was not found!",
+            )
+
+        return self.ResponseModel(
+            code="SUCCESS",
+            status=200,
+            message=f"{progress.finished} of {progress.total} jobs have finished.",
+            batch=progress
+        )
+
+
+__all__ = ["view"]
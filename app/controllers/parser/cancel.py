@@ -0,0 +1,66 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.daemon.job import JobData
+
+view = APIRouter()
+
+
+class ParserCancelResponse(APIResponse):
+    job: Optional[JobData] = None
+
+
+@cbv(view)
+class ParserCancelRoute(CriaRoute):
+    ResponseModel = ParserCancelResponse
+    Description = "Cancel a queued or running file parse job."
+
+    @view.post(
+        path="/parser/cancel",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            job_id: uuid.UUID
+    ) -> ResponseModel:
+        job_data: JobData | None = await request.app.criaparse.cancel(job_id=str(job_id))
+
+        # If no job is found
+        if job_data is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The job with the ID {job_id} was not found!",
+            )
+
+        # Too late to cancel
+        if job_data.finished and not job_data.cancelled:
+            return self.ResponseModel(
+                code="INVALID_REQUEST",
+                status=400,
+                message="The job has already finished.",
+                job=job_data
+            )
+
+        # Success!
+        return self.ResponseModel(
+            code="SUCCESS",
+            status=200,
+            message="Successfully cancelled the parse job.",
+            job=job_data
+        )
+
+
+__all__ = ["view"]
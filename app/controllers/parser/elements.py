@@ -0,0 +1,69 @@
+import uuid
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+
+view = APIRouter()
+
+
+class ParserElementsResponse(APIResponse):
+    pass
+
+
+@cbv(view)
+class ParserElementsRoute(CriaRoute):
+    ResponseModel = ParserElementsResponse
+    Description = (
+        "Stream the elements of a file parse job as newline-delimited JSON while it runs. "
+        "The stream ends when the job finishes or is cancelled. Poll the job for its status & assets."
+    )
+
+    @view.get(
+        path="/parser/elements",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            job_id: uuid.UUID
+    ) -> ResponseModel:
+
+        if not await request.app.criaparse.has_job(job_id=str(job_id)):
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The job with the ID {job_id} was not found!",
+            )
+
+        return StreamingResponse(
+            self.stream(request=request, elements=request.app.criaparse.elements(job_id=str(job_id))),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @classmethod
+    async def stream(cls, request: Request, elements: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Write one element per line until the job ends or the client disconnects"""
+
+        try:
+            async for element in elements:
+                if await request.is_disconnected():
+                    return
+
+                yield element + "\n"
+        finally:
+            await elements.aclose()
+
+
+__all__ = ["view"]
@@ -7,7 +7,7 @@ from starlette.requests import Request
 
 from app.controllers.schemas import catch_exceptions, APIResponse, exception_response
 from app.core.route import CriaRoute
-from criaparse.models import Element, ParserResponse, Asset, ParserStrategy, FileUnsupportedParseError, ElementType
+from criaparse.models import Element, ParserResponse, Asset, ParserStrategy, FileUnsupportedParseError, ElementType, FileTooLargeError
 from criaparse.parsers.generic.errors import ParseModelMissingError
 
 view = APIRouter()
@@ -62,6 +62,12 @@ class ParserParseRoute(CriaRoute):
                 al_extension=al_extension,
                 group_by_h1=group_by_h1
             )
+        except FileTooLargeError as ex:
+            return self.ResponseModel(
+                code="FILE_TOO_LARGE",
+                status=413,
+                message=str(ex)
+            )
         except FileUnsupportedParseError as ex:
             return self.ResponseModel(
                 code="INVALID_PAYLOAD",
@@ -1,13 +1,13 @@
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi_utils.cbv import cbv
 from starlette.requests import Request
 
-from app.controllers.schemas import catch_exceptions, APIResponse
+from app.controllers.schemas import catch_exceptions, APIResponse, negotiate_media_type, MSGPACK_MEDIA_TYPE
 from app.core.route import CriaRoute
-from criaparse.daemon.job import JobData
+from criaparse.daemon.job import JobData, SerializedJobData
 
 view = APIRouter()
 
@@ -33,25 +33,56 @@ class ParserPollRoute(CriaRoute):
     async def execute(
             self,
             request: Request,
-            job_id: uuid.UUID
+            job_id: uuid.UUID,
+            progress_only: bool = Query(default=False, description="Only return the job's progress. Its results are kept to be polled for later.")
     ) -> ResponseModel:
-        job_data: JobData | None = await request.app.criaparse.poll(job_id=job_id)
 
-        # If no job is found
-        if job_data is None:
+        if progress_only:
+            job_data: JobData | None = await request.app.criaparse.poll(job_id=str(job_id), progress_only=True)
+
+            if job_data is None:
+                return self.not_found(job_id=job_id)
+
             return self.ResponseModel(
-                code="NOT_FOUND",
-                status=404,
-                message=f"The job with the ID {job_id} was not found!",
+                code="SUCCESS",
+                status=200,
+                message=self.describe(finished=job_data.finished, cancelled=job_data.cancelled, cancel_reason=job_data.cancel_reason),
+                job=job_data
             )
 
-        # Success!
+        # Stored results are spliced into the response as they are, rather than parsed & re-serialized
+        serialized: SerializedJobData | None = await request.app.criaparse.poll_serialized(job_id=str(job_id))
+
+        # If no job is found
+        if serialized is None:
+            return self.not_found(job_id=job_id)
+
+        media_type: str = negotiate_media_type(request=request)
+
         return self.ResponseModel(
             code="SUCCESS",
             status=200,
-            message="Successfully parsed the document." if job_data.finished else "Currently parsing the document.",
-            job=job_data
+            message=self.describe(finished=serialized.finished, cancelled=serialized.cancelled, cancel_reason=serialized.cancel_reason)
+        ).to_response(
+            media_type=media_type,
+            spliced={'job': serialized.to_msgpack() if media_type == MSGPACK_MEDIA_TYPE else serialized.to_json()}
         )
 
+    def not_found(self, job_id: uuid.UUID) -> ResponseModel:
+        return self.ResponseModel(
+            code="NOT_FOUND",
+            status=404,
+            message=f"The job with the ID {job_id} was not found!",
+        )
+
+    @classmethod
+    def describe(cls, finished: bool, cancelled: bool, cancel_reason: str | None) -> str:
+        """Describe the state of a job"""
+
+        if cancelled:
+            return f"The job was cancelled. {cancel_reason}"
+
+        return "Successfully parsed the document." if finished else "Currently parsing the document."
+
 
 __all__ = ["view"]
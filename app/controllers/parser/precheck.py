@@ -0,0 +1,80 @@
+from typing import Optional, List
+
+from fastapi import APIRouter, Query
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.cache.result import CacheLookup
+from criaparse.models import Element, Asset, ParserStrategy
+
+view = APIRouter()
+
+
+class ParserPrecheckResponse(APIResponse):
+    job_id: Optional[str] = None
+    nodes: Optional[List[Element]] = None
+    assets: Optional[List[Asset]] = None
+
+
+@cbv(view)
+class ParserPrecheckRoute(CriaRoute):
+    ResponseModel = ParserPrecheckResponse
+    Description = "Check whether a file was already parsed, or is being parsed, by its SHA-256 before uploading it."
+
+    @view.get(
+        path="/parser/precheck",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            strategy: ParserStrategy,
+            sha256: str = Query(pattern=r"^[0-9a-fA-F]{64}$", description="The SHA-256 hex digest of the file"),
+            llm_model_id: Optional[int] = None,
+            embedding_model_id: Optional[int] = None,
+            al_extension: Optional[bool] = False,
+            group_by_h1: bool = Query(default=True, description="Whether the file would be queued with GENERIC elements grouped by H1 section")
+    ) -> ResponseModel:
+
+        # Options match the queue route's, so the same upload would hit the same cache entry
+        lookup: CacheLookup = await request.app.criaparse.precheck(
+            sha256=sha256.lower(),
+            strategy=strategy,
+            llm_model_id=llm_model_id,
+            embedding_model_id=embedding_model_id,
+            al_extension=al_extension,
+            group_by_h1=group_by_h1
+        )
+
+        if lookup.response is not None:
+            return self.ResponseModel(
+                code="SUCCESS",
+                status=200,
+                message="The file was already parsed.",
+                nodes=lookup.response.elements,
+                assets=lookup.response.assets
+            )
+
+        if lookup.job_id is not None:
+            return self.ResponseModel(
+                code="SUCCESS",
+                status=200,
+                message="The file is being parsed by another upload's job. Its result is that upload's to poll, so precheck again for it once the job is finished.",
+                job_id=lookup.job_id
+            )
+
+        return self.ResponseModel(
+            code="NOT_FOUND",
+            status=404,
+            message="The file hasn't been parsed with these options. Upload it to queue a job.",
+        )
+
+
+__all__ = ["view"]
@@ -1,13 +1,15 @@
 from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, Query
 from fastapi_utils.cbv import cbv
 from starlette.requests import Request
+from starlette.responses import Response
 
 from app.controllers.schemas import catch_exceptions, APIResponse, exception_response
 from app.core.route import CriaRoute
+from criaparse.daemon.admission import QueueFullError
 from criaparse.daemon.job import Job, JobData
-from criaparse.models import ParserStrategy, FileUnsupportedParseError
+from criaparse.models import ParserStrategy, FileUnsupportedParseError, FileTooLargeError
 from criaparse.parsers.generic.errors import ParseModelMissingError
 
 view = APIRouter()
@@ -42,22 +44,43 @@ class ParserParseRoute(CriaRoute):
     async def execute(
             self,
             request: Request,
+            response: Response,
             strategy: ParserStrategy,
             llm_model_id: Optional[int] = None,
             embedding_model_id: Optional[int] = None,
             al_extension: Optional[bool] = False,
+            priority: int = Query(default=0, ge=-10, le=10, description="Higher priority jobs are scheduled sooner"),
+            timeout: Optional[int] = Query(default=None, ge=1, description="Cancel the job if it hasn't finished within this many seconds"),
+            stream_elements: bool = Query(default=False, description="Stream the job's elements on /parser/elements as they're finalized, while it runs"),
+            group_by_h1: Optional[bool] = Query(default=None, description="Group GENERIC elements by H1 section. Grouped elements are only final once the whole document is parsed, so this defaults to false when streaming elements."),
             file: UploadFile = File(...),
     ) -> ResponseModel:
 
         try:
-            # Queue a Job (indexing path) with H1 grouping enabled
+            # Queue a Job (indexing path), grouped by H1 unless its elements are streamed
             job: Job = await request.app.criaparse.queue(
                 file=file,
                 strategy=strategy,
                 llm_model_id=llm_model_id,
                 embedding_model_id=embedding_model_id,
                 al_extension=al_extension,
-                group_by_h1=True
+                priority=priority,
+                timeout=timeout,
+                stream_elements=stream_elements,
+                group_by_h1=group_by_h1 if group_by_h1 is not None else not stream_elements
+            )
+        except QueueFullError as ex:
+            response.headers["Retry-After"] = str(ex.retry_after)
+            return self.ResponseModel(
+                code="RATE_LIMIT",
+                status=429,
+                message=str(ex)
+            )
+        except FileTooLargeError as ex:
+            return self.ResponseModel(
+                code="FILE_TOO_LARGE",
+                status=413,
+                message=str(ex)
             )
         except FileUnsupportedParseError as ex:
             return self.ResponseModel(
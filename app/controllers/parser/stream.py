@@ -0,0 +1,102 @@
+import uuid
+from typing import Optional, AsyncIterator
+
+from fastapi import APIRouter
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.client import CriaParse
+from criaparse.daemon.job import JobData, JobEvent, SerializedJobData
+
+view = APIRouter()
+
+
+class ParserStreamResponse(APIResponse):
+    job: Optional[JobData] = None
+
+
+@cbv(view)
+class ParserStreamRoute(CriaRoute):
+    ResponseModel = ParserStreamResponse
+    Description = (
+        "Stream the progress of a file parse job as Server-Sent Events. "
+        "Sends a 'status' event, then 'step', 'finished' or 'cancelled' events as they happen, "
+        "then a 'result' event with the same job data as a poll."
+    )
+
+    @view.get(
+        path="/parser/stream",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            job_id: uuid.UUID
+    ) -> ResponseModel:
+        criaparse: CriaParse = request.app.criaparse
+        events: AsyncIterator[JobEvent | None] = criaparse.events(job_id=str(job_id))
+
+        # Wait for the first event, so a missing job is still a JSON 404
+        first_event: JobEvent | None = await anext(events, None)
+
+        if first_event is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The job with the ID {job_id} was not found!",
+            )
+
+        return StreamingResponse(
+            self.stream(request=request, criaparse=criaparse, first_event=first_event, events=events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @classmethod
+    async def stream(
+            cls,
+            request: Request,
+            criaparse: CriaParse,
+            first_event: JobEvent,
+            events: AsyncIterator[JobEvent | None]
+    ) -> AsyncIterator[str]:
+        """Format the job's events as Server-Sent Events, ending with the job data"""
+
+        last_event: JobEvent = first_event
+        yield f"event: {first_event.event.value}\ndata: {first_event.json()}\n\n"
+
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    return
+
+                # Comments keep proxies from closing idle connections
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                last_event = event
+                yield f"event: {event.event.value}\ndata: {event.json()}\n\n"
+
+            if not (last_event.finished or last_event.cancelled):
+                return
+
+            # Retrieved the same way as a poll, so a finished job's data is cleaned up
+            job_data: SerializedJobData | None = await criaparse.poll_serialized(job_id=last_event.job_id)
+
+            if job_data is not None:
+                yield f"event: result\ndata: {job_data.to_json().decode()}\n\n"
+
+        finally:
+            await events.aclose()
+
+
+__all__ = ["view"]
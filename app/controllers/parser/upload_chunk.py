@@ -0,0 +1,84 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request, ClientDisconnect
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.daemon.upload import UploadSession, UploadOffsetError
+from criaparse.models import FileTooLargeError
+
+view = APIRouter()
+
+
+class ParserUploadChunkResponse(APIResponse):
+    upload: Optional[UploadSession] = None
+
+
+@cbv(view)
+class ParserUploadChunkRoute(CriaRoute):
+    ResponseModel = ParserUploadChunkResponse
+    Description = "Send the next chunk of a resumable upload as the raw request body."
+
+    @view.put(
+        path="/parser/uploads/{upload_id}",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            upload_id: uuid.UUID,
+            offset: int = Query(ge=0, description="Where the chunk starts in the file. Must be the upload's current offset.")
+    ) -> ResponseModel:
+
+        try:
+            # Streamed straight to disk, never held in memory whole
+            upload: UploadSession | None = await request.app.criaparse.write_upload(
+                upload_id=str(upload_id),
+                offset=offset,
+                chunks=request.stream()
+            )
+        except UploadOffsetError as ex:
+            return self.ResponseModel(
+                code="INVALID_REQUEST",
+                status=409,
+                message=str(ex),
+                upload=await request.app.criaparse.get_upload(upload_id=str(upload_id))
+            )
+        except FileTooLargeError as ex:
+            return self.ResponseModel(
+                code="FILE_TOO_LARGE",
+                status=413,
+                message=str(ex)
+            )
+        except ClientDisconnect:
+            # Expected of the uploads this is for. What was received is kept, to be resumed from.
+            return self.ResponseModel(
+                code="INVALID_REQUEST",
+                status=400,
+                message="The connection dropped before the chunk was received."
+            )
+
+        if upload is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The upload with the ID {upload_id} was not found!",
+            )
+
+        return self.ResponseModel(
+            code="SUCCESS",
+            status=200,
+            message=f"Received {upload.offset} of {upload.size} bytes.",
+            upload=upload
+        )
+
+
+__all__ = ["view"]
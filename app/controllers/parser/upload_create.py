@@ -0,0 +1,81 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.daemon.admission import QueueFullError
+from criaparse.daemon.upload import UploadSession
+from criaparse.models import ParserStrategy, FileTooLargeError
+
+view = APIRouter()
+
+
+class ParserUploadCreateResponse(APIResponse):
+    upload: Optional[UploadSession] = None
+
+
+@cbv(view)
+class ParserUploadCreateRoute(CriaRoute):
+    ResponseModel = ParserUploadCreateResponse
+    Description = "Start a resumable upload of a very large file. Send it in chunks, then finalize it to queue a parse job."
+
+    @view.post(
+        path="/parser/uploads",
+        name=Description,
+        summary=Description,
+        description=Description,
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            response: Response,
+            strategy: ParserStrategy,
+            filename: str = Query(min_length=1, max_length=255),
+            size: int = Query(ge=1, description="The size of the whole file, in bytes"),
+            content_type: str = Query(default="application/octet-stream", description="The mimetype of the file")
+    ) -> ResponseModel:
+
+        try:
+            upload: UploadSession | None = await request.app.criaparse.create_upload(
+                filename=filename,
+                content_type=content_type,
+                strategy=strategy,
+                size=size
+            )
+        except QueueFullError as ex:
+            response.headers["Retry-After"] = str(ex.retry_after)
+            return self.ResponseModel(
+                code="RATE_LIMIT",
+                status=429,
+                message=str(ex)
+            )
+        except FileTooLargeError as ex:
+            return self.ResponseModel(
+                code="FILE_TOO_LARGE",
+                status=413,
+                message=str(ex)
+            )
+
+        if upload is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message="Resumable uploads are not enabled on this server.",
+            )
+
+        return self.ResponseModel(
+            code="SUCCESS",
+            status=200,
+            message="Successfully started the upload.",
+            upload=upload
+        )
+
+
+__all__ = ["view"]
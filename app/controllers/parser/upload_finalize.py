@@ -0,0 +1,107 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.controllers.schemas import catch_exceptions, APIResponse, exception_response
+from app.core.route import CriaRoute
+from criaparse.daemon.admission import QueueFullError
+from criaparse.daemon.job import Job, JobData
+from criaparse.daemon.upload import UploadOffsetError
+from criaparse.models import FileUnsupportedParseError
+from criaparse.parsers.generic.errors import ParseModelMissingError
+
+view = APIRouter()
+
+
+class ParserUploadFinalizeResponse(APIResponse):
+    job: Optional[JobData] = None
+
+
+@cbv(view)
+class ParserUploadFinalizeRoute(CriaRoute):
+    ResponseModel = ParserUploadFinalizeResponse
+    Description = "Finish a resumable upload & queue a parse job for its file"
+
+    @view.post(
+        path="/parser/uploads/{upload_id}/finalize",
+        name=Description,
+        summary=Description,
+        description=Description,
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    @exception_response(
+        ParseModelMissingError,
+        ResponseModel(
+            code="INVALID_PAYLOAD",
+            status=400,
+            message="You must provide valid LLM & embedding models for this parsing strategy!",
+        )
+    )
+    async def execute(
+            self,
+            request: Request,
+            response: Response,
+            upload_id: uuid.UUID,
+            llm_model_id: Optional[int] = None,
+            embedding_model_id: Optional[int] = None,
+            al_extension: Optional[bool] = False,
+            priority: int = Query(default=0, ge=-10, le=10, description="Higher priority jobs are scheduled sooner"),
+            timeout: Optional[int] = Query(default=None, ge=1, description="Cancel the job if it hasn't finished within this many seconds"),
+            stream_elements: bool = Query(default=False, description="Stream the job's elements on /parser/elements as they're finalized, while it runs"),
+            group_by_h1: Optional[bool] = Query(default=None, description="Group GENERIC elements by H1 section. Grouped elements are only final once the whole document is parsed, so this defaults to false when streaming elements."),
+    ) -> ResponseModel:
+
+        try:
+            # Queued like an upload to /parser/queue
+            job: Job | None = await request.app.criaparse.finalize_upload(
+                upload_id=str(upload_id),
+                llm_model_id=llm_model_id,
+                embedding_model_id=embedding_model_id,
+                al_extension=al_extension,
+                priority=priority,
+                timeout=timeout,
+                stream_elements=stream_elements,
+                group_by_h1=group_by_h1 if group_by_h1 is not None else not stream_elements
+            )
+        except UploadOffsetError as ex:
+            return self.ResponseModel(
+                code="INVALID_REQUEST",
+                status=409,
+                message=str(ex)
+            )
+        except QueueFullError as ex:
+            response.headers["Retry-After"] = str(ex.retry_after)
+            return self.ResponseModel(
+                code="RATE_LIMIT",
+                status=429,
+                message=str(ex)
+            )
+        except FileUnsupportedParseError as ex:
+            return self.ResponseModel(
+                code="INVALID_PAYLOAD",
+                status=400,
+                message=str(ex)
+            )
+
+        if job is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The upload with the ID {upload_id} was not found!",
+            )
+
+        return self.ResponseModel(
+            code="SUCCESS",
+            status=200,
+            message="Successfully queued the parse job.",
+            job=job.data
+        )
+
+
+__all__ = ["view"]
@@ -0,0 +1,55 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi_utils.cbv import cbv
+from starlette.requests import Request
+
+from app.controllers.schemas import catch_exceptions, APIResponse
+from app.core.route import CriaRoute
+from criaparse.daemon.upload import UploadSession
+
+view = APIRouter()
+
+
+class ParserUploadStatusResponse(APIResponse):
+    upload: Optional[UploadSession] = None
+
+
+@cbv(view)
+class ParserUploadStatusRoute(CriaRoute):
+    ResponseModel = ParserUploadStatusResponse
+    Description = "Get how much of a resumable upload was received, to resume it from its offset."
+
+    @view.get(
+        path="/parser/uploads/{upload_id}",
+        name=Description,
+        summary=Description,
+        description=Description
+    )
+    @catch_exceptions(
+        ResponseModel
+    )
+    async def execute(
+            self,
+            request: Request,
+            upload_id: uuid.UUID
+    ) -> ResponseModel:
+        upload: UploadSession | None = await request.app.criaparse.get_upload(upload_id=str(upload_id))
+
+        if upload is None:
+            return self.ResponseModel(
+                code="NOT_FOUND",
+                status=404,
+                message=f"The upload with the ID {upload_id} was not found!",
+            )
+
+        return self.ResponseModel(
+            code="SUCCESS",
+            status=200,
+            message=f"Received {upload.offset} of {upload.size} bytes.",
+            upload=upload
+        )
+
+
+__all__ = ["view"]
@@ -2,9 +2,48 @@ import logging
 import time
 import traceback
 from functools import wraps
-from typing import Optional, Type, Literal, TypeVar, Callable, Awaitable
+from typing import Optional, Type, Literal, TypeVar, Callable, Awaitable, Mapping, List
 
+import msgpack
 from pydantic import BaseModel, Field
+from starlette.requests import Request
+from starlette.responses import Response
+
+JSON_MEDIA_TYPE: str = "application/json"
+MSGPACK_MEDIA_TYPE: str = "application/msgpack"
+
+# Clients may ask for msgpack by either name
+MSGPACK_MEDIA_TYPES: List[str] = [MSGPACK_MEDIA_TYPE, "application/x-msgpack"]
+
+
+def negotiate_media_type(request: Optional[Request]) -> str:
+    """
+    Pick the media type to respond with from the request's Accept header
+
+    :param request: The request
+    :return: msgpack if the client accepts it, otherwise JSON
+
+    """
+
+    if request is None:
+        return JSON_MEDIA_TYPE
+
+    for accepted in request.headers.get("accept", "").split(","):
+        media_type, *params = [part.strip().lower() for part in accepted.split(";")]
+
+        if media_type not in MSGPACK_MEDIA_TYPES:
+            continue
+
+        # A quality of 0 means "not acceptable"
+        quality: str = next((param[2:] for param in params if param.startswith("q=")), "1")
+
+        try:
+            if float(quality) > 0:
+                return MSGPACK_MEDIA_TYPE
+        except ValueError:
+            continue
+
+    return JSON_MEDIA_TYPE
 
 
 class APIResponse(BaseModel):
@@ -21,6 +60,17 @@ class APIResponse(BaseModel):
 
     def dict(self, *args, **kwargs):
 
+        self.fill_message()
+        data: dict = super().dict(*args, **kwargs)
+
+        if data["error"] is None:
+            del data["error"]
+
+        return data
+
+    def fill_message(self) -> None:
+        """Fall back to a generic message for the status"""
+
         self.message = self.message or {
             200: 'Request completed successfully!',
             409: 'The requested resource already exists!',
@@ -29,12 +79,44 @@ class APIResponse(BaseModel):
             404: 'Womp womp. Not found!'
         }.get(self.status)
 
-        data: dict = super().dict(*args, **kwargs)
-
-        if data["error"] is None:
-            del data["error"]
-
-        return data
+    def to_response(
+            self,
+            headers: Optional[Mapping[str, str]] = None,
+            media_type: str = JSON_MEDIA_TYPE,
+            spliced: Optional[Mapping[str, bytes]] = None
+    ) -> Response:
+        """
+        Render the response with its status as the HTTP status code
+
+        :param headers: Headers to send with the response (e.g. Retry-After)
+        :param media_type: JSON or msgpack
+        :param spliced: Map<Field, Value> of fields already encoded in the media type, appended as they are
+        :return: The response
+
+        """
+
+        self.fill_message()
+        spliced = spliced or {}
+        exclude: set = set(spliced) | ({'error'} if self.error is None else set())
+
+        if media_type == MSGPACK_MEDIA_TYPE:
+            data: dict = self.model_dump(mode="json", exclude=exclude)
+            content: bytes = msgpack.Packer().pack_map_header(len(data) + len(spliced)) + b"".join(
+                [msgpack.packb(key) + msgpack.packb(value) for key, value in data.items()] +
+                [msgpack.packb(key) + value for key, value in spliced.items()]
+            )
+        else:
+            content: bytes = self.model_dump_json(exclude=exclude).encode()
+
+            if spliced:
+                content = content[:-1] + b"".join(b',"' + key.encode() + b'":' + value for key, value in spliced.items()) + b"}"
+
+        return Response(
+            content=content,
+            status_code=self.status,
+            headers={**(headers or {}), "Vary": "Accept"},
+            media_type=media_type
+        )
 
     class Config:
         @staticmethod
@@ -54,7 +136,8 @@ def catch_exceptions(
         output_shape: Type[APIResponse]
 ) -> Callable[..., Callable[..., Awaitable[APIResponseModel]]]:
     """
-    Wrapper for controllers that handles exceptions & re-shapes them to match the response model
+    Wrapper for controllers that handles exceptions & re-shapes them to match the response model.
+    Response models are rendered here with their status, as JSON or msgpack depending on what the client accepts.
 
     :param output_shape:
     :return:
@@ -63,18 +146,30 @@ def catch_exceptions(
     def error_handler(func):
 
         @wraps(func)
-        async def wrapper(*args, **kwargs) -> APIResponseModel:
+        async def wrapper(*args, **kwargs) -> Response:
             try:
-                return await func(*args, **kwargs)
+                result: APIResponseModel | Response = await func(*args, **kwargs)
             except Exception:
                 logging.error(traceback.format_exc())
-                return output_shape(
+                result = output_shape(
                     code="ERROR",
                     status=500,
                     message=f"An internal error occurred!",
                     error=traceback.format_exc()
                 )
 
+            if not isinstance(result, APIResponse):
+                return result
+
+            # FastAPI drops the headers set on an injected Response once one is returned directly
+            injected: Response | None = next((value for value in kwargs.values() if isinstance(value, Response)), None)
+            request: Request | None = next((value for value in kwargs.values() if isinstance(value, Request)), None)
+
+            return result.to_response(
+                headers=injected.headers if injected is not None else None,
+                media_type=negotiate_media_type(request=request)
+            )
+
         return wrapper
 
     return error_handler
@@ -16,7 +16,7 @@ from starlette.middleware.cors import CORSMiddleware
 from app.controllers.__init__ import router
 from criaparse.client import CriaParse
 from . import config
-from .middleware import StatusMiddleware
+from .middleware import UploadLimitMiddleware
 from .security.get_api_key import BadAPIKeyException, GetApiKey
 
 
@@ -81,12 +81,19 @@ class CriaParseAPI(FastAPI):
 
     def include_middlewares(self) -> None:
         """
-        Include CORS handling
+        Include upload limits & CORS handling
 
         :return: None
 
         """
 
+        # Added first so refusals still pass through the CORS handling
+        self.add_middleware(
+            UploadLimitMiddleware,
+            limits={strategy: limit * 1024 * 1024 for strategy, limit in config.PARSE_MAX_FILE_MB.items()},
+            paths={"/parser/queue": 1, "/parser/parse": 1, "/parser/batch": config.PARSE_BATCH_MAX_FILES}
+        )
+
         self.add_middleware(
             CORSMiddleware,
             allow_origins=self.ORIGINS,
@@ -95,10 +102,6 @@ class CriaParseAPI(FastAPI):
             allow_headers=self.ORIGINS,
         )
 
-        self.add_middleware(
-            StatusMiddleware
-        )
-
     async def preflight_checks(self) -> bool:
         """
         Run preflight checks to confirm app is ready to "fly"
@@ -152,7 +155,39 @@ class CriaParseAPI(FastAPI):
 
         # Set the SDK and Redis pool
         criaparse_api.criadex = criadex_sdk
-        criaparse_api.criaparse = CriaParse(criadex=criadex_sdk, redis=redis_pool, workers=config.PARSE_WORKERS)
+        criaparse_api.criaparse = CriaParse(
+            criadex=criadex_sdk,
+            redis=redis_pool,
+            workers=config.PARSE_WORKERS,
+            concurrency=config.PARSE_CONCURRENCY,
+            aging_factor=config.PARSE_QUEUE_AGING_FACTOR,
+            executor_mode=config.PARSE_EXECUTOR_MODE,
+            executor_processes=config.PARSE_EXECUTOR_PROCESSES,
+            queue_backend=config.PARSE_QUEUE_BACKEND,
+            queue_claim_idle_ms=config.PARSE_QUEUE_CLAIM_IDLE_SECONDS * 1000,
+            queue_max_jobs=config.PARSE_QUEUE_MAX_JOBS or None,
+            queue_max_bytes=config.PARSE_QUEUE_MAX_MB * 1024 * 1024 or None,
+            abandon_seconds=config.PARSE_JOB_ABANDON_SECONDS or None,
+            checkpoint_directory=config.PARSE_CHECKPOINT_DIR or None,
+            result_cache_ttl_seconds=config.PARSE_RESULT_CACHE_TTL_SECONDS,
+            result_cache_max_bytes=config.PARSE_RESULT_CACHE_MAX_MB * 1024 * 1024,
+            artifact_cache_path=config.PARSE_ARTIFACT_CACHE_PATH if config.PARSE_ARTIFACT_CACHE_MAX_MB else None,
+            artifact_cache_max_bytes=config.PARSE_ARTIFACT_CACHE_MAX_MB * 1024 * 1024,
+            caption_cache_path=config.PARSE_CAPTION_CACHE_PATH if config.PARSE_CAPTION_CACHE_MAX_MB else None,
+            caption_cache_max_bytes=config.PARSE_CAPTION_CACHE_MAX_MB * 1024 * 1024,
+            caption_cache_perceptual=config.PARSE_CAPTION_CACHE_PERCEPTUAL,
+            embedding_cache_path=config.PARSE_EMBEDDING_CACHE_PATH if config.PARSE_EMBEDDING_CACHE_MAX_MB else None,
+            embedding_cache_max_bytes=config.PARSE_EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+            batch_max_files=config.PARSE_BATCH_MAX_FILES,
+            asset_directory=config.PARSE_ASSET_DIR or None,
+            asset_max_age_seconds=config.PARSE_ASSET_MAX_AGE_SECONDS,
+            record_encoding=config.PARSE_RECORD_ENCODING,
+            spool_directory=config.PARSE_SPOOL_DIR or None,
+            spool_max_memory_bytes=config.PARSE_SPOOL_MAX_MEMORY_BYTES,
+            max_file_bytes={strategy: limit * 1024 * 1024 for strategy, limit in config.PARSE_MAX_FILE_MB.items()},
+            upload_directory=config.PARSE_UPLOAD_DIR or None,
+            upload_max_age_seconds=config.PARSE_UPLOAD_MAX_AGE_SECONDS
+        )
         criaparse_api.criaparse.start()
 
         # Shutdown is after yield
@@ -1,9 +1,14 @@
 import os
-from typing import Optional
+import tempfile
+from typing import Optional, Dict
 
 from dotenv import load_dotenv
 
-from .schemas import AppMode, check_env_path, CriadexCredentials, RedisCredentials
+from criaparse.daemon.encoding import RecordEncoding
+from criaparse.daemon.executor import ExecutorMode
+from criaparse.daemon.stream import QueueBackend
+from criaparse.models import ParserStrategy
+from .schemas import AppMode, check_env_path, CriadexCredentials, RedisCredentials, parse_strategy_limits
 
 ENV_PATH: str = os.environ.get('ENV_PATH', "../.env")
 ENV_LOADED: bool = load_dotenv(dotenv_path=check_env_path(ENV_PATH))
@@ -11,6 +16,7 @@ ENV_LOADED: bool = load_dotenv(dotenv_path=check_env_path(ENV_PATH))
 APP_MODE: AppMode = AppMode[os.environ.get('APP_API_MODE', AppMode.TESTING.name)]
 APP_HOST: str = "0.0.0.0"
 APP_PORT: int = int(os.environ.get('APP_API_PORT', 25574))
+APP_WORKERS: int = int(os.environ.get('APP_API_WORKERS', 1))  # Use the REDIS queue backend when running more than one
 APP_TITLE: str = "CriaParse ⚙️"
 APP_VERSION = "1.0.0"
 DOCS_URL: str = "/"
@@ -50,3 +56,78 @@ CRIADEX_CREDENTIALS: CriadexCredentials = CriadexCredentials(
 )
 
 PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', "4"))
+
+# Jobs of each strategy a worker may run at once, e.g. 'GENERIC=4,PARAGRAPH=1'. GENERIC mostly waits on Azure OpenAI.
+PARSE_CONCURRENCY: Dict[ParserStrategy, int] = parse_strategy_limits(
+    os.environ.get('PARSE_CONCURRENCY', ""),
+    defaults={strategy: 4 if strategy == ParserStrategy.GENERIC else 1 for strategy in ParserStrategy}
+)
+
+# Seconds a queued job waits per estimated second of work before smaller jobs can no longer overtake it
+PARSE_QUEUE_AGING_FACTOR = float(os.environ.get('PARSE_QUEUE_AGING_FACTOR', "1.0"))
+
+# Where CPU-bound DOCX converters run (INLINE, THREAD or PROCESS)
+PARSE_EXECUTOR_MODE: ExecutorMode = ExecutorMode[os.environ.get('PARSE_EXECUTOR_MODE', ExecutorMode.PROCESS.name)]
+PARSE_EXECUTOR_PROCESSES = int(os.environ.get('PARSE_EXECUTOR_PROCESSES', str(os.cpu_count() or 1)))
+
+# Where queued jobs wait for a worker (MEMORY or REDIS). REDIS shares the queue between processes & hosts.
+PARSE_QUEUE_BACKEND: QueueBackend = QueueBackend[os.environ.get('PARSE_QUEUE_BACKEND', QueueBackend.MEMORY.name)]
+PARSE_QUEUE_CLAIM_IDLE_SECONDS = int(os.environ.get('PARSE_QUEUE_CLAIM_IDLE_SECONDS', "600"))
+
+# Refuse new jobs with a 429 once the queued & running jobs exceed either limit. 0 disables a limit.
+PARSE_QUEUE_MAX_JOBS = int(os.environ.get('PARSE_QUEUE_MAX_JOBS', "1000"))
+PARSE_QUEUE_MAX_MB = int(os.environ.get('PARSE_QUEUE_MAX_MB', "2048"))
+
+# Cancel jobs nobody has polled for this many seconds. 0 disables reaping.
+PARSE_JOB_ABANDON_SECONDS = int(os.environ.get('PARSE_JOB_ABANDON_SECONDS', "900"))
+
+# Where intermediate job outputs are checkpointed, so jobs reclaimed from the REDIS queue resume. Empty disables.
+# GENERIC jobs resume after the whole SemanticDocumentParser run (all nine steps) or the Al extension, not between SDP steps.
+# Mount a volume shared between pods to resume jobs interrupted by a rolling deploy on another host.
+PARSE_CHECKPOINT_DIR: str = os.environ.get('PARSE_CHECKPOINT_DIR', "")
+
+# Responses cached by file hash, strategy & options. Entries expire this long after they were last used.
+PARSE_RESULT_CACHE_TTL_SECONDS = int(os.environ.get('PARSE_RESULT_CACHE_TTL_SECONDS', str(60 * 60 * 24 * 7)))
+PARSE_RESULT_CACHE_MAX_MB = int(os.environ.get('PARSE_RESULT_CACHE_MAX_MB', "512"))  # 0 disables the cache
+
+# Local sqlite cache of intermediate artifacts (DOCX HTML, table DataFrames), so re-parses with other options skip them
+PARSE_ARTIFACT_CACHE_PATH: str = os.environ.get('PARSE_ARTIFACT_CACHE_PATH', os.path.join(tempfile.gettempdir(), "criaparse", "artifacts.sqlite3"))
+PARSE_ARTIFACT_CACHE_MAX_MB = int(os.environ.get('PARSE_ARTIFACT_CACHE_MAX_MB', "1024"))  # 0 disables the cache
+
+# Local sqlite cache of image captions. PERCEPTUAL also matches re-encoded/resized copies of an image (requires Pillow).
+PARSE_CAPTION_CACHE_PATH: str = os.environ.get('PARSE_CAPTION_CACHE_PATH', os.path.join(tempfile.gettempdir(), "criaparse", "captions.sqlite3"))
+PARSE_CAPTION_CACHE_MAX_MB = int(os.environ.get('PARSE_CAPTION_CACHE_MAX_MB', "256"))  # 0 disables the cache
+PARSE_CAPTION_CACHE_PERCEPTUAL: bool = os.environ.get('PARSE_CAPTION_CACHE_PERCEPTUAL', "false").lower() == "true"
+
+# Local sqlite cache of float32 text embeddings used by the semantic splitter
+PARSE_EMBEDDING_CACHE_PATH: str = os.environ.get('PARSE_EMBEDDING_CACHE_PATH', os.path.join(tempfile.gettempdir(), "criaparse", "embeddings.sqlite3"))
+PARSE_EMBEDDING_CACHE_MAX_MB = int(os.environ.get('PARSE_EMBEDDING_CACHE_MAX_MB', "512"))  # 0 disables the cache
+
+# Max # of files in one batch upload, counting the files of an uploaded ZIP
+PARSE_BATCH_MAX_FILES = int(os.environ.get('PARSE_BATCH_MAX_FILES', "500"))
+
+# Where extracted assets (images) are written & served from by /parser/assets, instead of inlined as base64. Empty inlines them.
+# Mount a volume shared between pods so any of them can serve an asset. Should outlive PARSE_RESULT_CACHE_TTL_SECONDS.
+PARSE_ASSET_DIR: str = os.environ.get('PARSE_ASSET_DIR', "")
+PARSE_ASSET_MAX_AGE_SECONDS = int(os.environ.get('PARSE_ASSET_MAX_AGE_SECONDS', str(60 * 60 * 24 * 8)))
+
+# How job data & cached responses are written to Redis. This version reads both, but older pods only read JSON.
+# Leave it on JSON through a rolling deploy, & switch to MSGPACK only once every pod runs this version.
+# Job progress is also kept in a hash now, which older pods can't read either (jobs they wrote as one string are still read here).
+# Drain the queue before deploying, or expect polls that land on an older pod to fail for jobs queued on a newer one until the rollout ends.
+PARSE_RECORD_ENCODING: RecordEncoding = RecordEncoding[os.environ.get('PARSE_RECORD_ENCODING', RecordEncoding.JSON.name)]
+
+# Uploads over PARSE_SPOOL_MAX_MEMORY_BYTES wait for a worker as files in this directory instead of in memory. Empty to hold every upload in memory.
+PARSE_SPOOL_DIR: str = os.environ.get('PARSE_SPOOL_DIR', "")
+PARSE_SPOOL_MAX_MEMORY_BYTES = int(os.environ.get('PARSE_SPOOL_MAX_MEMORY_BYTES', str(8 * 1024 * 1024)))
+
+# The largest file each strategy accepts in MB, e.g. 'GENERIC=512,PARAGRAPH=64'. Larger uploads are refused with a 413 as they stream in. 0 for no limit.
+PARSE_MAX_FILE_MB: Dict[ParserStrategy, int] = parse_strategy_limits(
+    os.environ.get('PARSE_MAX_FILE_MB', ""),
+    defaults={strategy: 512 if strategy == ParserStrategy.GENERIC else 64 for strategy in ParserStrategy}
+)
+
+# Where resumable uploads (/parser/uploads) are assembled before they're queued. Empty disables them.
+# Uploads without a chunk for PARSE_UPLOAD_MAX_AGE_SECONDS are deleted.
+PARSE_UPLOAD_DIR: str = os.environ.get('PARSE_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), "criaparse", "uploads"))
+PARSE_UPLOAD_MAX_AGE_SECONDS = int(os.environ.get('PARSE_UPLOAD_MAX_AGE_SECONDS', str(60 * 60 * 24)))
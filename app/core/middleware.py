@@ -1,34 +1,120 @@
-import json
+from typing import Dict, List
+from urllib.parse import parse_qs
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
+from app.controllers.schemas import APIResponse
+from criaparse.models import ParserStrategy
 
-class StatusMiddleware(BaseHTTPMiddleware):
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+class UploadLimitMiddleware:
+    """
+    Refuses uploads over their strategy's size limit with a 413 as they stream in,
+    rather than once FastAPI has buffered the whole request body to parse the form.
 
-        response: Response = await call_next(request)
+    """
 
-        if response.headers.get('content-type') == 'application/json':
-            return await self.handle_json_status(response)
+    # Multipart boundaries & part headers on top of the file itself
+    MULTIPART_OVERHEAD_BYTES: int = 64 * 1024
 
-        return response
+    def __init__(
+            self,
+            app: ASGIApp,
+            limits: Dict[ParserStrategy, int],
+            paths: Dict[str, int]
+    ):
+        """
+        Create the middleware
 
-    async def handle_json_status(self, response: Response):
-        binary = b''
+        :param app: The app
+        :param limits: Map<Strategy, Bytes> of the largest file each strategy accepts. 0 or missing for no limit.
+        :param paths: Map<Path, Files> of the routes taking files & the strategy as a query param, to the most files each takes at once
 
-        # noinspection PyUnresolvedReferences
-        async for data in response.body_iterator:
-            binary += data
+        """
 
-        body: dict = json.loads(binary.decode())
+        self.app: ASGIApp = app
+        self._limits: Dict[ParserStrategy, int] = limits
+        self._paths: Dict[str, int] = paths
 
-        if "error" in body and not body["error"]:
-            del body["error"]
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
 
-        return JSONResponse(
-            content=body,
-            status_code=body.get('status', response.status_code)
-        )
+        if scope["type"] != "http" or scope["path"] not in self._paths:
+            return await self.app(scope, receive, send)
+
+        max_bytes: int | None = self._max_bytes(scope=scope)
+
+        if max_bytes is None:
+            return await self.app(scope, receive, send)
+
+        # Known up front, so refused without reading any of the body
+        content_length: str | None = Headers(scope=scope).get("content-length")
+
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes + self.MULTIPART_OVERHEAD_BYTES:
+            return await self._refuse(scope=scope, receive=receive, send=send, max_bytes=max_bytes)
+
+        received: int = 0
+        refused: bool = False
+        response_started: bool = False
+
+        async def receive_limited() -> Message:
+            nonlocal received, refused
+            message: Message = await receive()
+
+            if message["type"] != "http.request" or refused:
+                return message
+
+            received += len(message.get("body", b""))
+
+            if received <= max_bytes + self.MULTIPART_OVERHEAD_BYTES:
+                return message
+
+            # Chunked uploads are only found to be too large part way through
+            refused = True
+
+            if not response_started:
+                await self._refuse(scope=scope, receive=receive, send=send, max_bytes=max_bytes)
+
+            # The route stops reading the body as if the client had gone
+            return {"type": "http.disconnect"}
+
+        async def send_unless_refused(message: Message) -> None:
+            nonlocal response_started
+
+            if refused:
+                return
+
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_limited, send_unless_refused)
+        except Exception:
+            # The route failing on the cut-off body isn't an error
+            if not refused:
+                raise
+
+    def _max_bytes(self, scope: Scope) -> int | None:
+        """Get the size limit of the request, from the requested strategy's & the # of files the route takes"""
+
+        values: List[str] = parse_qs(scope.get("query_string", b"").decode()).get("strategy", [])
+
+        # The route refuses missing & unknown strategies
+        if not values or values[0] not in [strategy.value for strategy in ParserStrategy]:
+            return None
+
+        max_file_bytes: int | None = self._limits.get(ParserStrategy(values[0])) or None
+        return max_file_bytes * self._paths[scope["path"]] if max_file_bytes is not None else None
+
+    @classmethod
+    async def _refuse(cls, scope: Scope, receive: Receive, send: Send, max_bytes: int) -> None:
+        """Send the 413"""
+
+        response: Response = APIResponse(
+            code="FILE_TOO_LARGE",
+            status=413,
+            message=f"The upload is over {max_bytes} bytes, the most that can be parsed with this strategy."
+        ).to_response(headers={"Connection": "close"})
+
+        await response(scope, receive, send)
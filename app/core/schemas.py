@@ -2,7 +2,7 @@ import json
 import os
 from enum import Enum
 from json import JSONDecodeError
-from typing import Optional
+from typing import Optional, Dict
 
 from fastapi import Form
 from pydantic import BaseModel
@@ -10,6 +10,7 @@ from starlette import status
 from starlette.exceptions import HTTPException
 
 from app.controllers.schemas import APIResponse, RATE_LIMIT
+from criaparse.models import ParserStrategy
 
 
 class AppMode(Enum):
@@ -44,6 +45,25 @@ def check_env_path(env_path: str) -> str:
     return env_path
 
 
+def parse_strategy_limits(value: str, defaults: Dict[ParserStrategy, int]) -> Dict[ParserStrategy, int]:
+    """
+    Parse a per-strategy limit from an environment variable formatted as 'GENERIC=4,PARAGRAPH=1'
+
+    :param value: The environment variable value
+    :param defaults: Limits for strategies not listed in the value
+    :return: Map<Strategy, Limit>
+
+    """
+
+    limits: Dict[ParserStrategy, int] = dict(defaults)
+
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        strategy, _, limit = item.partition("=")
+        limits[ParserStrategy(strategy.strip().upper())] = int(limit)
+
+    return limits
+
+
 class RateLimitResponse(APIResponse):
     status: int = 429
     code: RATE_LIMIT
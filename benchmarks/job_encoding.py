@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Redis encoding of finished job results.
+
+Compares the legacy JSON encoding against msgpack + zstd on synthetic results shaped like real ones:
+narrative text drawn from a fixed vocabulary (so it compresses like prose, not like random bytes),
+tables, and base64 images of incompressible bytes. Reports the encode & decode time of the full
+round trip through ParserResponse, and the payload size. With REDIS_URL set, also reports Redis' own
+MEMORY USAGE of each key.
+
+Usage: [REDIS_URL=redis://localhost:6379] python -m benchmarks.job_encoding
+"""
+import asyncio
+import base64
+import os
+import random
+import statistics
+import time
+
+from redis.asyncio import Redis, from_url
+
+from criaparse.daemon.encoding import RecordEncoding, configure_record_encoding, decode_record, encode_record
+from criaparse.models import Asset, Element, ElementType, ParserResponse
+
+SEED: int = 1740
+ROUNDS: int = 5
+
+# (Name, elements, images, image KB)
+RESULT_SHAPES: list[tuple[str, int, int, int]] = [
+    ("syllabus", 40, 0, 0),
+    ("report", 600, 20, 60),
+    ("image-heavy pdf", 1500, 200, 80),
+]
+
+VOCABULARY: list[str] = (
+    "the course students assignment will be must submit academic integrity policy week lecture exam final "
+    "grade percent due date late penalty office hours email instructor university department reading chapter "
+    "lab tutorial participation project group report presentation accommodation accessibility services"
+).split()
+
+
+def create_response(elements: int, images: int, image_kb: int, rng: random.Random) -> ParserResponse:
+    """Create a result of the given shape"""
+
+    output_elements: list[Element] = []
+
+    for idx in range(elements):
+        element_type: ElementType = ElementType.TABLE if idx % 25 == 0 else ElementType.NARRATIVE_TEXT
+        text: str = " ".join(rng.choices(VOCABULARY, k=rng.randint(20, 200)))
+        output_elements.append(Element(type=element_type, text=text, metadata={"page_number": idx // 10, "filename": "document.pdf"}))
+
+    assets: list[Asset] = [
+        Asset(
+            uuid=f"{idx:032x}",
+            data_mimetype="image/png",
+            data_base64=base64.b64encode(rng.randbytes(image_kb * 1024)).decode(),
+            description=" ".join(rng.choices(VOCABULARY, k=40))
+        )
+        for idx in range(images)
+    ]
+
+    return ParserResponse(elements=output_elements, assets=assets, timings={"total": 120.5})
+
+
+def time_round_trip(response: ParserResponse, encoding: RecordEncoding) -> tuple[float, float, bytes]:
+    """Time encoding & decoding the result, returning the median ms of each & the payload"""
+
+    configure_record_encoding(encoding=encoding)
+    encode_times: list[float] = []
+    decode_times: list[float] = []
+    data: bytes = b""
+
+    for _ in range(ROUNDS):
+        start: float = time.perf_counter()
+        data = encode_record(response.model_dump(mode="json"))
+        encode_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ParserResponse(**decode_record(data))
+        decode_times.append(time.perf_counter() - start)
+
+    return statistics.median(encode_times) * 1000, statistics.median(decode_times) * 1000, data
+
+
+async def memory_usage(redis: Redis | None, key: str, data: bytes) -> str:
+    """Get Redis' memory usage of the payload, if connected"""
+
+    if redis is None:
+        return "-"
+
+    await redis.set(key, data, ex=60)
+    usage: int = await redis.memory_usage(key, samples=0)
+    await redis.delete(key)
+
+    return f"{usage / 1024:.0f}KB"
+
+
+async def main() -> None:
+    rng: random.Random = random.Random(SEED)
+    redis: Redis | None = from_url(os.environ["REDIS_URL"]) if os.environ.get("REDIS_URL") else None
+
+    print(f"{'result':<16} {'encoding':<8} {'encode':>9} {'decode':>9} {'payload':>10} {'redis':>10}")
+
+    for name, elements, images, image_kb in RESULT_SHAPES:
+        response: ParserResponse = create_response(elements=elements, images=images, image_kb=image_kb, rng=rng)
+
+        for encoding in RecordEncoding:
+            encode_ms, decode_ms, data = time_round_trip(response=response, encoding=encoding)
+            usage: str = await memory_usage(redis=redis, key=f"criaparse:benchmark:{encoding.value}", data=data)
+            print(f"{name:<16} {encoding.value:<8} {encode_ms:7.1f}ms {decode_ms:7.1f}ms {len(data) / 1024:8.0f}KB {usage:>10}")
+
+    if redis is not None:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
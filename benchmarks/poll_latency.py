@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark the latency of polling large finished jobs through the API.
+
+Compares the legacy StatusMiddleware (a BaseHTTPMiddleware that buffered every JSON response,
+parsed it & re-rendered it to apply its status) against the current app, where the status is
+applied when the response model is rendered & large poll responses pass through untouched.
+Both serve the real poll route, against stored results reused between polls instead of Redis.
+
+Usage: ENV_PATH=.env python -m benchmarks.poll_latency
+"""
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+import app.core  # noqa: F401 (The controllers must be imported through the app)
+from app.controllers.parser import poll
+from criaparse.daemon.encoding import encode_record
+from criaparse.daemon.job import SerializedJobData
+from criaparse.models import Element, ElementType, ParserResponse
+
+SEED: int = 1740
+ROUNDS: int = 20
+
+# (Name, elements)
+RESULT_SHAPES: list[tuple[str, int]] = [
+    ("syllabus", 40),
+    ("report", 600),
+    ("textbook", 6000),
+]
+
+VOCABULARY: list[str] = (
+    "the course students assignment will be must submit academic integrity policy week lecture exam final "
+    "grade percent due date late penalty office hours email instructor university department reading chapter"
+).split()
+
+
+class LegacyStatusMiddleware(BaseHTTPMiddleware):
+    """The middleware the status used to be applied by"""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+        response: Response = await call_next(request)
+
+        if response.headers.get('content-type') != 'application/json':
+            return response
+
+        binary = b''
+
+        # noinspection PyUnresolvedReferences
+        async for data in response.body_iterator:
+            binary += data
+
+        body: dict = json.loads(binary.decode())
+
+        if "error" in body and not body["error"]:
+            del body["error"]
+
+        headers: dict = {
+            key: value for key, value in response.headers.items()
+            if key not in ('content-length', 'content-type')
+        }
+
+        return JSONResponse(content=body, status_code=body.get('status', response.status_code), headers=headers)
+
+
+class SimulatedCriaParse:
+    """Quacks like CriaParse, but serves the same stored result on every poll"""
+
+    def __init__(self, job: SerializedJobData):
+        self._job: SerializedJobData = job
+
+    async def poll_serialized(self, job_id: str) -> SerializedJobData:
+        return self._job
+
+
+def create_job(elements: int, rng: random.Random) -> SerializedJobData:
+    """Create a finished job as stored, with a result of the given size"""
+
+    response: ParserResponse = ParserResponse(
+        elements=[
+            Element(
+                type=ElementType.NARRATIVE_TEXT,
+                text=" ".join(rng.choices(VOCABULARY, k=rng.randint(20, 200))),
+                metadata={"page_number": idx // 10, "filename": "document.pdf"}
+            )
+            for idx in range(elements)
+        ]
+    )
+
+    progress: dict = {"job_id": str(uuid.uuid4()), "step": 3, "step_name": "Finished", "steps": 3, "strategy": "GENERIC", "finished": True}
+
+    return SerializedJobData(
+        job_id=progress["job_id"],
+        finished=True,
+        cancelled=False,
+        cancel_reason=None,
+        progress={field: json.dumps(value).encode() for field, value in progress.items()},
+        result=encode_record(response.model_dump(mode="json"))
+    )
+
+
+def create_app(job: SerializedJobData, legacy: bool) -> FastAPI:
+    """Create an app serving the poll route"""
+
+    app: FastAPI = FastAPI()
+    app.criaparse = SimulatedCriaParse(job=job)
+    app.include_router(poll.view)
+
+    if legacy:
+        app.add_middleware(LegacyStatusMiddleware)
+
+    return app
+
+
+async def time_polls(app: FastAPI) -> tuple[float, float, int]:
+    """Time polls of the app, returning the median & p95 ms, and the response size"""
+
+    times: list[float] = []
+    size: int = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        for _ in range(ROUNDS):
+            start: float = time.perf_counter()
+            response: httpx.Response = await client.get("/parser/poll", params={"job_id": str(uuid.uuid4())})
+            times.append(time.perf_counter() - start)
+            size = len(response.content)
+
+    return statistics.median(times) * 1000, statistics.quantiles(times, n=20)[-1] * 1000, size
+
+
+async def main() -> None:
+    rng: random.Random = random.Random(SEED)
+
+    print(f"{'result':<10} {'size':>9} {'legacy p50':>11} {'p95':>9} {'current p50':>12} {'p95':>9}")
+
+    for name, elements in RESULT_SHAPES:
+        job: SerializedJobData = create_job(elements=elements, rng=rng)
+        legacy_p50, legacy_p95, size = await time_polls(app=create_app(job=job, legacy=True))
+        current_p50, current_p95, _ = await time_polls(app=create_app(job=job, legacy=False))
+        print(f"{name:<10} {size / 1024:7.0f}KB {legacy_p50:9.1f}ms {legacy_p95:7.1f}ms {current_p50:10.1f}ms {current_p95:7.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark queue wait times under a mix of small & large jobs.
+
+Compares the legacy dispatch (each job pushed onto the private queue of the worker with the
+fewest queued jobs) against the Daemon's shared queue, both in FIFO order (aging factor of 0)
+and shortest-job-first. Job durations are simulated with sleeps, scaled down so that one
+"minute" of parsing takes SCALE seconds. The cost estimate is taken to be exact.
+
+Usage: python -m benchmarks.queue_wait
+"""
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from asyncio import Queue
+
+from criaparse.daemon.daemon import Daemon
+
+WORKERS: int = 4
+JOBS: int = 200
+SCALE: float = 0.01  # Seconds per simulated minute
+SEED: int = 1740
+
+# (Probability, minutes) => Mostly small syllabi, some long GENERIC PDFs
+JOB_MIX: list[tuple[float, float]] = [(0.85, 0.5), (0.10, 5), (0.05, 20)]
+
+
+class SimulatedJobData:
+
+    def __init__(self):
+        self.job_id: str = str(uuid.uuid4())
+        self.strategy: str = "GENERIC"
+
+
+class SimulatedFile:
+
+    def __init__(self):
+        self.size: int = 0
+
+
+class SimulatedJob:
+    """Quacks like a Job, but sleeps instead of parsing"""
+
+    def __init__(self, duration: float, waits: list[float]):
+        self.data = SimulatedJobData()
+        self.file = SimulatedFile()
+        self._completed = asyncio.Event()
+        self._duration: float = duration
+        self._waits: list[float] = waits
+        self._queued_at: float = time.perf_counter()
+        self.cost: float = 0.0
+        self.priority: int = 0
+
+    async def estimate_cost(self) -> float:
+        # Taken to be exact
+        self.cost = self._duration
+        return self.cost
+
+    async def run(self) -> None:
+        self._waits.append(time.perf_counter() - self._queued_at)
+        await asyncio.sleep(self._duration)
+
+    async def set_response(self, response) -> None:
+        pass
+
+    def set_completed(self) -> None:
+        self._completed.set()
+
+    async def wait(self) -> None:
+        await self._completed.wait()
+
+
+def job_durations() -> list[float]:
+    rng = random.Random(SEED)
+    weights, minutes = zip(*JOB_MIX)
+    return [m * SCALE for m in rng.choices(minutes, weights=weights, k=JOBS)]
+
+
+async def arrivals(durations: list[float], waits: list[float], dispatch) -> None:
+    """Submit jobs at a steady rate slightly below the mean service rate"""
+    mean_duration: float = statistics.mean(durations)
+    interval: float = mean_duration / WORKERS * 1.1
+
+    for duration in durations:
+        await dispatch(SimulatedJob(duration=duration, waits=waits))
+        await asyncio.sleep(interval)
+
+
+async def drain(waits: list[float]) -> None:
+    while len(waits) < JOBS:
+        await asyncio.sleep(SCALE)
+
+
+async def run_least_queued(durations: list[float]) -> list[float]:
+    """Legacy: per-worker queues, dispatched to the worker with the lowest qsize()"""
+    waits: list[float] = []
+    queues: list[Queue] = [Queue() for _ in range(WORKERS)]
+
+    async def worker(queue: Queue) -> None:
+        while True:
+            job = await queue.get()
+            await job.run()
+
+    tasks = [asyncio.create_task(worker(queue)) for queue in queues]
+
+    async def dispatch(job) -> None:
+        await min(queues, key=lambda q: q.qsize()).put(job)
+
+    await arrivals(durations, waits, dispatch)
+    await drain(waits)
+
+    for task in tasks:
+        task.cancel()
+
+    return waits
+
+
+async def run_shared_queue(durations: list[float], aging_factor: float) -> list[float]:
+    """Current: the Daemon's shared queue"""
+    waits: list[float] = []
+    daemon = Daemon(workers=WORKERS, aging_factor=aging_factor)
+    daemon.start()
+
+    await arrivals(durations, waits, lambda job: daemon.queue(job=job))
+    await drain(waits)
+    await daemon.stop()
+
+    return waits
+
+
+def report(name: str, waits: list[float]) -> None:
+    # Convert back to simulated minutes
+    minutes = sorted(wait / SCALE for wait in waits)
+    p50 = minutes[len(minutes) // 2]
+    p95 = minutes[int(len(minutes) * 0.95) - 1]
+    print(f"{name:<20} p50={p50:6.2f}min  p95={p95:6.2f}min  max={minutes[-1]:6.2f}min")
+
+
+async def main() -> None:
+    durations = job_durations()
+    print(f"{JOBS} jobs, {WORKERS} workers, mix={JOB_MIX}")
+    report("least-qsize", await run_least_queued(durations))
+    report("shared FIFO", await run_shared_queue(durations, aging_factor=0))
+    report("shortest-first", await run_shared_queue(durations, aging_factor=1))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
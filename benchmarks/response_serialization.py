@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendering large API responses, & decoding them on the client.
+
+Compares FastAPI's default rendering (jsonable_encoder + stdlib json, which the routes used before
+rendering their own responses) against the JSON & msgpack the API now negotiates, for parse responses
+and for polls of stored results. Results are shaped like the job encoding benchmark's.
+
+Usage: ENV_PATH=.env python -m benchmarks.response_serialization
+"""
+import json
+import random
+import statistics
+import time
+import uuid
+from typing import Callable
+
+import msgpack
+from fastapi.encoders import jsonable_encoder
+
+import app.core  # noqa: F401 (The controllers must be imported through the app)
+from app.controllers.parser.parse import ParserParseResponse
+from app.controllers.parser.poll import ParserPollResponse
+from app.controllers.schemas import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from benchmarks.job_encoding import RESULT_SHAPES, create_response
+from criaparse.daemon.encoding import encode_record, decode_record
+from criaparse.daemon.job import JobData, SerializedJobData
+from criaparse.models import ParserResponse
+
+SEED: int = 1740
+ROUNDS: int = 5
+
+
+def time_median(func: Callable[[], bytes | object]) -> tuple[float, bytes | object]:
+    """Time a function, returning the median ms & its last output"""
+
+    times: list[float] = []
+    output: bytes | object = None
+
+    for _ in range(ROUNDS):
+        start: float = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times) * 1000, output
+
+
+def render_parse(response: ParserResponse) -> dict[str, Callable[[], bytes]]:
+    """Ways of rendering a parse response"""
+
+    model: ParserParseResponse = ParserParseResponse(nodes=response.elements, assets=response.assets)
+
+    return {
+        "fastapi": lambda: json.dumps(jsonable_encoder(model)).encode(),
+        "json": lambda: model.to_response(media_type=JSON_MEDIA_TYPE).body,
+        "msgpack": lambda: model.to_response(media_type=MSGPACK_MEDIA_TYPE).body,
+    }
+
+
+def render_poll(response: ParserResponse) -> dict[str, Callable[[], bytes]]:
+    """Ways of rendering a poll of a stored result. FastAPI's way includes building the job's models."""
+
+    progress: dict = {"job_id": str(uuid.uuid4()), "step": 3, "step_name": "Finished", "steps": 3, "strategy": "GENERIC", "finished": True}
+    job: SerializedJobData = SerializedJobData(
+        job_id=progress["job_id"],
+        finished=True,
+        cancelled=False,
+        cancel_reason=None,
+        progress={field: json.dumps(value).encode() for field, value in progress.items()},
+        result=encode_record(response.model_dump(mode="json"))
+    )
+
+    return {
+        "fastapi": lambda: json.dumps(jsonable_encoder(ParserPollResponse(job=JobData(_redis=None, **progress, response=decode_record(job.result))))).encode(),
+        "json": lambda: ParserPollResponse().to_response(media_type=JSON_MEDIA_TYPE, spliced={'job': job.to_json()}).body,
+        "msgpack": lambda: ParserPollResponse().to_response(media_type=MSGPACK_MEDIA_TYPE, spliced={'job': job.to_msgpack()}).body,
+    }
+
+
+def main() -> None:
+    rng: random.Random = random.Random(SEED)
+    decoders: dict[str, Callable[[bytes], object]] = {"fastapi": json.loads, "json": json.loads, "msgpack": msgpack.unpackb}
+
+    print(f"{'result':<16} {'route':<6} {'format':<8} {'render':>9} {'client':>9} {'body':>10}")
+
+    for name, elements, images, image_kb in RESULT_SHAPES:
+        response: ParserResponse = create_response(elements=elements, images=images, image_kb=image_kb, rng=rng)
+
+        for route, renderers in [("parse", render_parse(response)), ("poll", render_poll(response))]:
+            for output_format, render in renderers.items():
+                render_ms, body = time_median(render)
+                decode_ms, _ = time_median(lambda: decoders[output_format](body))
+                print(f"{name:<16} {route:<6} {output_format:<8} {render_ms:7.1f}ms {decode_ms:7.1f}ms {len(body) / 1024:8.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
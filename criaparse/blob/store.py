@@ -0,0 +1,174 @@
+import asyncio
+import glob
+import logging
+import mimetypes
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import List
+
+from pydantic import BaseModel
+
+
+class Blob(BaseModel):
+    """
+    A stored blob. Local stores give a path so it can be served without reading it into memory.
+
+    """
+
+    content_type: str
+    path: str | None = None
+    data: bytes | None = None
+
+
+class BlobStore(ABC):
+    """
+    Store for the raw bytes of extracted assets, referenced from responses by key instead of inlined
+
+    """
+
+    def start(self) -> None:
+        """Start any background upkeep"""
+
+    async def stop(self) -> None:
+        """Stop any background upkeep"""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        """
+        Store a blob
+
+        :param key: The key, e.g. the asset UUID
+        :param data: The raw bytes
+        :param content_type: The mimetype of the blob
+
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, key: str) -> Blob | None:
+        """
+        Get a blob
+
+        :param key: The key
+        :return: The blob, or None if it doesn't exist
+
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def touch(self, keys: List[str]) -> None:
+        """Keep blobs that are still referenced from expiring"""
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blob store on the local filesystem, sharded by the first 2 characters of the key.
+
+    Point the directory at a volume shared between pods so any of them can serve an asset.
+
+    """
+
+    def __init__(self, directory: str, max_age_seconds: int = 60 * 60 * 24 * 8):
+        """
+        Create the blob store
+
+        :param directory: The directory blobs are written to
+        :param max_age_seconds: Blobs untouched for this long are pruned
+
+        """
+
+        self._directory: str = directory
+        self._max_age_seconds: int = max_age_seconds
+        self._task: asyncio.Task | None = None
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    def start(self) -> None:
+        """Create the directory & prune old blobs every hour"""
+        os.makedirs(self._directory, exist_ok=True)
+        self._task = asyncio.create_task(self._prune_periodically())
+
+    async def stop(self) -> None:
+        """Stop pruning"""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def put(self, key: str, data: bytes, content_type: str) -> None:
+        await asyncio.to_thread(self._put, key, data, content_type)
+
+    async def get(self, key: str) -> Blob | None:
+        path: str | None = await asyncio.to_thread(self._find, key)
+
+        if path is None:
+            return None
+
+        return Blob(path=path, content_type=mimetypes.guess_type(path)[0] or "application/octet-stream")
+
+    async def touch(self, keys: List[str]) -> None:
+        await asyncio.to_thread(self._touch, keys)
+
+    def prune(self) -> None:
+        """Delete the blobs untouched for longer than the max age"""
+
+        cutoff: float = time.time() - self._max_age_seconds
+
+        for path in glob.glob(os.path.join(self._directory, "*", "*")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.prune)
+                await asyncio.sleep(60 * 60)
+
+            except asyncio.CancelledError:
+                break
+
+            except OSError:
+                self._logger.error(self._logger_prefix + f"Failed to prune {self._directory}.", exc_info=True)
+                await asyncio.sleep(60 * 60)
+
+    def _put(self, key: str, data: bytes, content_type: str) -> None:
+        # The extension records the content type, so no metadata is stored alongside the blob
+        path: str = self._create_path(key=key) + (mimetypes.guess_extension(content_type) or "")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Written to a temporary file first so a blob is never served half-written
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+
+        os.replace(path + ".tmp", path)
+
+    def _find(self, key: str) -> str | None:
+        base: str = self._create_path(key=key)
+        paths: List[str] = [path for path in glob.glob(glob.escape(base) + ".*") if not path.endswith(".tmp")]
+
+        if os.path.isfile(base):
+            paths.append(base)
+
+        return paths[0] if paths else None
+
+    def _touch(self, keys: List[str]) -> None:
+        for key in keys:
+            path: str | None = self._find(key=key)
+
+            if path is not None:
+                os.utime(path)
+
+    def _create_path(self, key: str) -> str:
+        """Get the path of a blob, without its extension"""
+
+        # Keys come from requests, so never let one escape the directory
+        key = os.path.basename(key)
+        return os.path.join(self._directory, key[:2], key)
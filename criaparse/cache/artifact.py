@@ -0,0 +1,121 @@
+import contextlib
+import contextvars
+import hashlib
+import pickle
+from typing import Callable, TypeVar, BinaryIO, Generator
+
+from criaparse.cache.sqlite import SqliteStore
+
+Artifact = TypeVar("Artifact")
+
+
+class ArtifactCache(SqliteStore):
+    """
+    On-disk cache of intermediate pipeline artifacts (e.g. DOCX HTML, table DataFrames),
+    keyed by the content hash of a stage's input & the stage name.
+
+    Re-parsing a file with different options only recomputes the stages whose inputs changed.
+
+    """
+
+    def get_or_compute(self, stage: str, content: bytes | None, compute: Callable[[], Artifact], digest: str | None = None) -> Artifact:
+        """
+        Get the output of a stage, computing & storing it on a miss
+
+        :param stage: The name of the stage. Rename it when its output changes.
+        :param content: The input of the stage
+        :param compute: Computes the output of the stage
+        :param digest: The SHA-256 hex digest of the input, if already known. The content isn't needed then.
+        :return: The output of the stage
+
+        """
+
+        key: str = f"{stage}:{digest or hashlib.sha256(content).hexdigest()}"
+        data: bytes | None = self.get(key=key)
+
+        if data is not None:
+            return pickle.loads(data)
+
+        artifact: Artifact = compute()
+        self.put(key=key, value=pickle.dumps(artifact))
+
+        return artifact
+
+
+# Converters run in pool processes, so each process is configured with its own handle to the cache
+_artifact_cache: ArtifactCache | None = None
+
+# The SHA-256 of the file being converted, set by the executor so converters never re-read the file to hash it
+_source_digest: contextvars.ContextVar[str | None] = contextvars.ContextVar("source_digest", default=None)
+
+
+def configure_artifact_cache(path: str | None, max_bytes: int) -> None:
+    """
+    Configure the artifact cache of the current process. Used as the converter pool's initializer.
+
+    :param path: The path to the sqlite file. None disables the cache.
+    :param max_bytes: The max total size of cached artifacts
+
+    """
+
+    global _artifact_cache
+    _artifact_cache = ArtifactCache(path=path, max_bytes=max_bytes) if path else None
+
+
+def cached_artifact(stage: str, content: bytes, compute: Callable[[], Artifact]) -> Artifact:
+    """
+    Get the output of a stage from the artifact cache, if configured
+
+    :param stage: The name of the stage
+    :param content: The input of the stage
+    :param compute: Computes the output of the stage
+    :return: The output of the stage
+
+    """
+
+    if _artifact_cache is None:
+        return compute()
+
+    return _artifact_cache.get_or_compute(stage=stage, content=content, compute=compute)
+
+
+@contextlib.contextmanager
+def source_digest(sha256: str | None) -> Generator[None, None, None]:
+    """
+    Set the SHA-256 of the file converters are running against
+
+    :param sha256: The SHA-256 hex digest of the file, if known
+
+    """
+
+    token: contextvars.Token = _source_digest.set(sha256)
+
+    try:
+        yield
+    finally:
+        _source_digest.reset(token)
+
+
+def cached_source_artifact(stage: str, file_buffer: BinaryIO, compute: Callable[[], Artifact]) -> Artifact:
+    """
+    Get the output of a stage whose input is the whole file being converted, if configured
+
+    :param stage: The name of the stage
+    :param file_buffer: The file, in memory or on disk
+    :param compute: Computes the output of the stage
+    :return: The output of the stage
+
+    """
+
+    if _artifact_cache is None:
+        return compute()
+
+    digest: str | None = _source_digest.get()
+
+    # Converters called outside the executor hash the file themselves, leaving it rewound
+    if digest is None:
+        file_buffer.seek(0)
+        digest = hashlib.file_digest(file_buffer, "sha256").hexdigest()
+        file_buffer.seek(0)
+
+    return _artifact_cache.get_or_compute(stage=stage, content=None, compute=compute, digest=digest)
@@ -0,0 +1,221 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+from typing import Any, List, Sequence
+
+from llama_index.core.base.llms.types import CompletionResponse
+from llama_index.multi_modal_llms.azure_openai import AzureOpenAIMultiModal
+from pydantic import PrivateAttr
+
+from criaparse.cache.sqlite import SqliteStore
+
+try:
+    from PIL import Image
+except ImportError:  # Perceptual matching is optional
+    Image = None
+
+
+class CaptionCache(SqliteStore):
+    """
+    On-disk cache of image captions, keyed by the model, the prompt & the content hash of the images.
+
+    With `perceptual` enabled, captions are also keyed by an average hash of each image, so the same logo
+    re-encoded or resized in another document is a hit too. Requires Pillow.
+
+    """
+
+    # Side of the greyscale thumbnail the average hash is computed from (256 bits)
+    PERCEPTUAL_HASH_SIZE: int = 16
+
+    def __init__(self, path: str, max_bytes: int, perceptual: bool = False):
+        """
+        Create the caption cache
+
+        :param path: The path to the sqlite file
+        :param max_bytes: The max total size of cached captions
+        :param perceptual: Whether to also match visually identical images
+
+        """
+
+        super().__init__(path=path, max_bytes=max_bytes)
+        self._perceptual: bool = perceptual and Image is not None
+
+    def create_keys(self, model: str, prompt: str, images: List[bytes]) -> List[str]:
+        """
+        Get the keys a caption is stored under, exact match first
+
+        :param model: The model
+        :param prompt: The prompt
+        :param images: The raw images
+        :return: The cache keys
+
+        """
+
+        prefix: str = f"caption:{model}:{hashlib.sha256(prompt.encode()).hexdigest()}"
+        keys: List[str] = [prefix + ":" + "|".join(hashlib.sha256(image).hexdigest() for image in images)]
+
+        if self._perceptual:
+            perceptual_hashes: List[str | None] = [self.perceptual_hash(image=image) for image in images]
+
+            if all(perceptual_hashes):
+                keys.append(prefix + ":p:" + "|".join(perceptual_hashes))
+
+        return keys
+
+    def get_caption(self, keys: List[str]) -> str | None:
+        """Get the caption stored under any of the keys"""
+
+        for key in keys:
+            caption: bytes | None = self.get(key=key)
+
+            if caption is not None:
+                return caption.decode()
+
+        return None
+
+    def put_caption(self, keys: List[str], caption: str) -> None:
+        """Store a caption under each of the keys"""
+
+        for key in keys:
+            self.put(key=key, value=caption.encode())
+
+    @classmethod
+    def perceptual_hash(cls, image: bytes) -> str | None:
+        """
+        Get the average hash of an image
+
+        :param image: The raw image
+        :return: The hash as hex, or None if the image can't be decoded
+
+        """
+
+        try:
+            with Image.open(io.BytesIO(image)) as img:
+                pixels: List[int] = list(img.convert("L").resize((cls.PERCEPTUAL_HASH_SIZE, cls.PERCEPTUAL_HASH_SIZE)).getdata())
+        except Exception:
+            return None
+
+        mean: float = sum(pixels) / len(pixels)
+        bits: int = sum(1 << idx for idx, pixel in enumerate(pixels) if pixel > mean)
+
+        return f"{bits:0{cls.PERCEPTUAL_HASH_SIZE ** 2 // 4}x}"
+
+
+class CachedAzureOpenAIMultiModal(AzureOpenAIMultiModal):
+    """Azure OpenAI multimodal model that consults a caption cache before any completion with images"""
+
+    _captions: CaptionCache | None = PrivateAttr(default=None)
+    _lookups: int = PrivateAttr(default=0)
+    _hits: int = PrivateAttr(default=0)
+
+    def __init__(self, captions: CaptionCache | None = None, **kwargs: Any):
+        """
+        Create the model
+
+        :param captions: The caption cache. None to never cache.
+        :param kwargs: AzureOpenAIMultiModal kwargs
+
+        """
+
+        super().__init__(**kwargs)
+        self._captions = captions
+
+    @property
+    def caption_cache_hit_rate(self) -> float:
+        """The share of completions with images served from the cache"""
+        return self._hits / self._lookups if self._lookups else 0.0
+
+    async def acomplete(self, prompt: str, image_documents: Sequence[Any], **kwargs: Any) -> CompletionResponse:
+        if self._captions is None or not image_documents:
+            return await super().acomplete(prompt, image_documents, **kwargs)
+
+        # Hashing & sqlite stay off the event loop
+        keys: List[str] = await asyncio.to_thread(self._create_keys, prompt, image_documents)
+        caption: str | None = await asyncio.to_thread(self._captions.get_caption, keys)
+
+        if caption is not None:
+            return self._record_hit(caption=caption)
+
+        response: CompletionResponse = await super().acomplete(prompt, image_documents, **kwargs)
+        await asyncio.to_thread(self._captions.put_caption, keys, response.text)
+
+        return response
+
+    def complete(self, prompt: str, image_documents: Sequence[Any], **kwargs: Any) -> CompletionResponse:
+        if self._captions is None or not image_documents:
+            return super().complete(prompt, image_documents, **kwargs)
+
+        keys: List[str] = self._create_keys(prompt, image_documents)
+        caption: str | None = self._captions.get_caption(keys)
+
+        if caption is not None:
+            return self._record_hit(caption=caption)
+
+        response: CompletionResponse = super().complete(prompt, image_documents, **kwargs)
+        self._captions.put_caption(keys, response.text)
+
+        return response
+
+    def _record_hit(self, caption: str) -> CompletionResponse:
+        self._hits += 1
+        return CompletionResponse(text=caption)
+
+    def _create_keys(self, prompt: str, image_documents: Sequence[Any]) -> List[str]:
+        self._lookups += 1
+        return self._captions.create_keys(
+            model=f"{self.engine}:{self.model}",
+            prompt=prompt,
+            images=[self.image_bytes(image_document) for image_document in image_documents]
+        )
+
+    @classmethod
+    def image_bytes(cls, image_document: Any) -> bytes:
+        """
+        Get the raw image of an ImageNode or ImageBlock
+
+        :param image_document: The image
+        :return: The decoded image, or failing that whatever identifies it
+
+        """
+
+        image: str | bytes | None = getattr(image_document, "image", None)
+
+        if image:
+            try:
+                return base64.b64decode(image, validate=True)
+            except (binascii.Error, ValueError):
+                return image.encode() if isinstance(image, str) else image
+
+        path: str | None = getattr(image_document, "image_path", None) or getattr(image_document, "path", None)
+
+        if path:
+            with open(path, "rb") as f:
+                return f.read()
+
+        url: str | None = getattr(image_document, "image_url", None) or getattr(image_document, "url", None)
+        return str(url).encode()
+
+
+# Captioning runs in the API process, which configures the cache on start
+_caption_cache: CaptionCache | None = None
+
+
+def configure_caption_cache(path: str | None, max_bytes: int, perceptual: bool = False) -> None:
+    """
+    Configure the caption cache of the current process
+
+    :param path: The path to the sqlite file. None disables the cache.
+    :param max_bytes: The max total size of cached captions
+    :param perceptual: Whether to also match visually identical images
+
+    """
+
+    global _caption_cache
+    _caption_cache = CaptionCache(path=path, max_bytes=max_bytes, perceptual=perceptual) if path else None
+
+
+def get_caption_cache() -> CaptionCache | None:
+    """Get the caption cache of the current process, if configured"""
+    return _caption_cache
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import re
+from array import array
+from typing import Any, Dict, List
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+
+from criaparse.cache.sqlite import SqliteStore
+
+WHITESPACE_PATTERN: re.Pattern = re.compile(r"\s+")
+
+
+class EmbeddingCache(SqliteStore):
+    """On-disk cache of embeddings, keyed by the embedding model & a hash of the whitespace-normalized text"""
+
+    @classmethod
+    def create_key(cls, model: str, text: str) -> str:
+        """
+        Get the key of a text's embedding
+
+        :param model: The embedding model
+        :param text: The text
+        :return: The cache key
+
+        """
+
+        normalized: str = WHITESPACE_PATTERN.sub(" ", text).strip()
+        return f"embedding:{model}:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+    @classmethod
+    def pack(cls, embedding: Embedding) -> bytes:
+        """Store an embedding as float32, half the size of the float64 it's returned as"""
+        return array("f", embedding).tobytes()
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Embedding:
+        """Load a float32 embedding"""
+        return array("f", data).tolist()
+
+    def get_embeddings(self, model: str, texts: List[str]) -> List[Embedding | None]:
+        """
+        Get the cached embeddings of texts
+
+        :param model: The embedding model
+        :param texts: The texts
+        :return: The embedding of each text, None for misses
+
+        """
+
+        keys: List[str] = [self.create_key(model=model, text=text) for text in texts]
+        hits: Dict[str, bytes] = self.get_many(keys=keys)
+
+        return [self.unpack(hits[key]) if key in hits else None for key in keys]
+
+    def put_embeddings(self, model: str, texts: List[str], embeddings: List[Embedding]) -> None:
+        """Cache the embeddings of texts"""
+        self.put_many(items={self.create_key(model=model, text=text): self.pack(embedding) for text, embedding in zip(texts, embeddings)})
+
+
+class CachedEmbedding(BaseEmbedding):
+    """Embedding model that only sends texts it hasn't embedded before to the model it wraps"""
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _embeddings: EmbeddingCache | None = PrivateAttr(default=None)
+    _model_key: str = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, model_key: str, embeddings: EmbeddingCache | None = None, **kwargs: Any):
+        """
+        Create the embedding model
+
+        :param embed_model: The model to wrap
+        :param model_key: Identifies the wrapped model (e.g. its deployment) in cache keys
+        :param embeddings: The embedding cache. None to never cache.
+
+        """
+
+        super().__init__(model_name=embed_model.model_name, embed_batch_size=embed_model.embed_batch_size, **kwargs)
+        self._embed_model = embed_model
+        self._embeddings = embeddings
+        self._model_key = model_key
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._get_text_embeddings([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return (await self._aget_text_embeddings([query]))[0]
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        if self._embeddings is None:
+            return self._embed_model.get_text_embedding_batch(texts)
+
+        embeddings: List[Embedding | None] = self._embeddings.get_embeddings(model=self._model_key, texts=texts)
+        misses: List[int] = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+
+        if misses:
+            computed: List[Embedding] = self._embed_model.get_text_embedding_batch([texts[idx] for idx in misses])
+            self._fill(texts=texts, embeddings=embeddings, misses=misses, computed=computed)
+
+        return embeddings
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        if self._embeddings is None:
+            return await self._embed_model.aget_text_embedding_batch(texts)
+
+        # sqlite stays off the event loop
+        embeddings: List[Embedding | None] = await asyncio.to_thread(self._embeddings.get_embeddings, self._model_key, texts)
+        misses: List[int] = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+
+        if misses:
+            computed: List[Embedding] = await self._embed_model.aget_text_embedding_batch([texts[idx] for idx in misses])
+            await asyncio.to_thread(self._fill, texts, embeddings, misses, computed)
+
+        return embeddings
+
+    def _fill(self, texts: List[str], embeddings: List[Embedding | None], misses: List[int], computed: List[Embedding]) -> None:
+        """Slot freshly computed embeddings in with the cached ones & cache them"""
+
+        for idx, embedding in zip(misses, computed):
+            embeddings[idx] = embedding
+
+        self._embeddings.put_embeddings(model=self._model_key, texts=[texts[idx] for idx in misses], embeddings=computed)
+
+
+# Embedding runs in the API process, which configures the cache on start
+_embedding_cache: EmbeddingCache | None = None
+
+
+def configure_embedding_cache(path: str | None, max_bytes: int) -> None:
+    """
+    Configure the embedding cache of the current process
+
+    :param path: The path to the sqlite file. None disables the cache.
+    :param max_bytes: The max total size of cached embeddings
+
+    """
+
+    global _embedding_cache
+    _embedding_cache = EmbeddingCache(path=path, max_bytes=max_bytes) if path else None
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Get the embedding cache of the current process, if configured"""
+    return _embedding_cache
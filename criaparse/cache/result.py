@@ -0,0 +1,223 @@
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, Any, List
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+from criaparse.daemon.encoding import encode_record, decode_record
+from criaparse.models import ParserResponse
+
+
+class CacheLookup(BaseModel):
+    """
+    What's known about parsing a file before it's uploaded
+
+    """
+
+    # The cached response, if the file was already parsed
+    response: ParserResponse | None = None
+
+    # The job parsing the file, if it's being parsed now. Its result is its uploader's, so it's followed
+    # by prechecking again (or polling with progress_only) rather than by polling it in full.
+    job_id: str | None = None
+
+
+class ResultCache:
+    """
+    Content-addressed cache of parser responses in Redis.
+
+    Responses are keyed by the SHA-256 of the file, the strategy & the options that change the output.
+    Entries expire `ttl_seconds` after they were last used. Once they total more than `max_bytes`,
+    the least recently used are evicted first.
+
+    While a response is being parsed, its key points to the job parsing it, so clients can follow that job instead of uploading the file again.
+
+    """
+
+    INDEX_KEY: str = "criaparse:result:index"
+    SIZES_KEY: str = "criaparse:result:sizes"
+    BYTES_KEY: str = "criaparse:result:bytes"
+
+    # The options that change a parser's output
+    KEY_OPTIONS: List[str] = ["al_extension", "group_by_h1", "llm_model_id", "embedding_model_id"]
+
+    # How many entries to evict per round trip
+    EVICT_BATCH: int = 16
+
+    # As long as job data is kept
+    IN_FLIGHT_TTL_SECONDS: int = 60 * 60
+
+    def __init__(
+            self,
+            redis: Redis,
+            ttl_seconds: int = 60 * 60 * 24 * 7,
+            max_bytes: int = 512 * 1024 * 1024
+    ):
+        """
+        Create the result cache
+
+        :param redis: The Redis pool
+        :param ttl_seconds: How long an entry is kept after it was last used
+        :param max_bytes: The max total size of cached responses
+
+        """
+
+        self._redis: Redis = redis
+        self._ttl_seconds: int = ttl_seconds
+        self._max_bytes: int = max_bytes
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    @classmethod
+    def create_key(cls, sha256: str, strategy: str, options: Dict[str, Any]) -> str:
+        """
+        Get the cache key for parsing a file
+
+        :param sha256: The SHA-256 hex digest of the file
+        :param strategy: The parser strategy
+        :param options: The job options
+        :return: The redis Key of the cached response
+
+        """
+
+        fingerprint: str = json.dumps({
+            "sha256": sha256,
+            "strategy": strategy,
+            **{option: options.get(option) for option in cls.KEY_OPTIONS}
+        }, sort_keys=True)
+
+        return f"criaparse:result:{hashlib.sha256(fingerprint.encode()).hexdigest()}"
+
+    async def get(self, key: str) -> ParserResponse | None:
+        """
+        Get a cached response & mark it as recently used
+
+        :param key: The cache key
+        :return: The response, or None on a miss
+
+        """
+
+        data: bytes | None = await self._redis.get(key)
+
+        if data is None:
+            return None
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(self.INDEX_KEY, {key: time.time()})
+            pipe.expire(key, self._ttl_seconds)
+            await pipe.execute()
+
+        return ParserResponse(**decode_record(data))
+
+    async def put(self, key: str, response: ParserResponse) -> None:
+        """
+        Cache a response, evicting others if the cache is over its size
+
+        :param key: The cache key
+        :param response: The response
+
+        """
+
+        # Filling the cache must never fail the job
+        try:
+            data: bytes = encode_record(response.model_dump(mode="json"))
+            size: int = len(data)
+
+            if size > self._max_bytes:
+                # Nothing will be cached for the clients following the job
+                await self.clear_in_flight(key=key)
+                return
+
+            previous_size: bytes | None = await self._redis.hget(self.SIZES_KEY, key)
+
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.set(key, data, ex=self._ttl_seconds)
+                pipe.zadd(self.INDEX_KEY, {key: time.time()})
+                pipe.hset(self.SIZES_KEY, key, size)
+                pipe.incrby(self.BYTES_KEY, size - int(previous_size or 0))
+                pipe.delete(self._create_in_flight_key(key=key))
+                await pipe.execute()
+
+            await self._evict()
+
+        except Exception:
+            self._logger.error(self._logger_prefix + "Failed to cache a parser response.", exc_info=True)
+
+    async def _evict(self) -> None:
+        """Forget expired entries, then evict the least recently used until the cache fits"""
+
+        expired: List[bytes] = await self._redis.zrangebyscore(self.INDEX_KEY, "-inf", time.time() - self._ttl_seconds)
+
+        if expired:
+            await self._remove(keys=expired)
+
+        while (excess := int(await self._redis.get(self.BYTES_KEY) or 0) - self._max_bytes) > 0:
+            oldest: List[bytes] = await self._redis.zrange(self.INDEX_KEY, 0, self.EVICT_BATCH - 1)
+
+            if not oldest:
+                break
+
+            # Only evict as many of the oldest as it takes to fit
+            victims: List[bytes] = []
+
+            for key, size in zip(oldest, await self._redis.hmget(self.SIZES_KEY, oldest)):
+                victims.append(key)
+                excess -= int(size or 0)
+
+                if excess <= 0:
+                    break
+
+            await self._remove(keys=victims)
+
+    async def _remove(self, keys: List[bytes]) -> None:
+        """Remove entries & release their bytes"""
+
+        sizes: List[bytes | None] = await self._redis.hmget(self.SIZES_KEY, keys)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            pipe.zrem(self.INDEX_KEY, *keys)
+            pipe.hdel(self.SIZES_KEY, *keys)
+            pipe.decrby(self.BYTES_KEY, sum(int(size or 0) for size in sizes))
+            await pipe.execute()
+
+    async def set_in_flight(self, key: str, job_id: str) -> None:
+        """
+        Record the job parsing a response that isn't cached yet
+
+        :param key: The cache key
+        :param job_id: The ID of the job
+
+        """
+
+        await self._redis.set(self._create_in_flight_key(key=key), job_id, ex=self.IN_FLIGHT_TTL_SECONDS)
+
+    async def get_in_flight(self, key: str) -> str | None:
+        """
+        Get the job parsing a response that isn't cached yet
+
+        :param key: The cache key
+        :return: The ID of the job, or None if there is none
+
+        """
+
+        job_id: bytes | None = await self._redis.get(self._create_in_flight_key(key=key))
+        return job_id.decode() if job_id is not None else None
+
+    async def clear_in_flight(self, key: str) -> None:
+        """Forget the job parsing a response, e.g. once it's failed or been cancelled"""
+
+        # Like filling the cache, must never fail the job
+        try:
+            await self._redis.delete(self._create_in_flight_key(key=key))
+        except Exception:
+            self._logger.error(self._logger_prefix + "Failed to clear the job parsing a response.", exc_info=True)
+
+    @classmethod
+    def _create_in_flight_key(cls, key: str) -> str:
+        """Get the redis Key of the job parsing a response"""
+        return f"{key}:inflight"
@@ -0,0 +1,176 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+
+class SqliteStore:
+    """
+    Bounded key-value store in a local sqlite file, evicting the least recently used entries.
+
+    Safe to share between the threads & processes of one host. Each thread keeps its own connection.
+    Errors are logged & treated as misses, since a cache must never fail a parse.
+
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Create the store
+
+        :param path: The path to the sqlite file
+        :param max_bytes: The max total size of stored values
+
+        """
+
+        self._path: str = path
+        self._max_bytes: int = max_bytes
+        self._local: threading.local = threading.local()
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Get a value & mark it as recently used
+
+        :param key: The key
+        :return: The value, or None on a miss
+
+        """
+
+        try:
+            connection: sqlite3.Connection = self._connection()
+            row: tuple | None = connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                return None
+
+            with connection:
+                connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+
+            return row[0]
+
+        except sqlite3.Error:
+            self._logger.warning(self._logger_prefix + f"Failed to read {self._path}.", exc_info=True)
+            return None
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Get several values & mark them as recently used
+
+        :param keys: The keys
+        :return: Map<Key, Value> of the hits
+
+        """
+
+        try:
+            connection: sqlite3.Connection = self._connection()
+            hits: Dict[str, bytes] = {}
+
+            # Bounded by sqlite's limit on query parameters
+            for idx in range(0, len(keys), 500):
+                chunk: List[str] = keys[idx:idx + 500]
+                placeholders: str = ",".join("?" * len(chunk))
+                hits.update(connection.execute(f"SELECT key, value FROM entries WHERE key IN ({placeholders})", chunk).fetchall())
+
+            if hits:
+                with connection:
+                    connection.executemany("UPDATE entries SET accessed = ? WHERE key = ?", [(time.time(), key) for key in hits])
+
+            return hits
+
+        except sqlite3.Error:
+            self._logger.warning(self._logger_prefix + f"Failed to read {self._path}.", exc_info=True)
+            return {}
+
+    def put_many(self, items: Dict[str, bytes]) -> None:
+        """
+        Store several values in one transaction, evicting the least recently used if the store is over its size
+
+        :param items: Map<Key, Value> to store
+
+        """
+
+        rows: List[tuple] = [(key, value, len(value), time.time()) for key, value in items.items() if len(value) <= self._max_bytes]
+
+        if not rows:
+            return
+
+        try:
+            connection: sqlite3.Connection = self._connection()
+
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)", rows)
+                self._evict(connection=connection)
+
+        except sqlite3.Error:
+            self._logger.warning(self._logger_prefix + f"Failed to write {self._path}.", exc_info=True)
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting the least recently used if the store is over its size
+
+        :param key: The key
+        :param value: The value
+
+        """
+
+        if len(value) > self._max_bytes:
+            return
+
+        try:
+            connection: sqlite3.Connection = self._connection()
+
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), time.time())
+                )
+
+                self._evict(connection=connection)
+
+        except sqlite3.Error:
+            self._logger.warning(self._logger_prefix + f"Failed to write {self._path}.", exc_info=True)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Delete the least recently used entries until the store fits"""
+
+        excess: int = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0] - self._max_bytes
+
+        if excess <= 0:
+            return
+
+        # The oldest entries whose running total covers the excess
+        connection.execute(
+            """
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed ROWS UNBOUNDED PRECEDING) - size AS freed
+                    FROM entries
+                ) WHERE freed < ?
+            )
+            """,
+            (excess,)
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the file on first use"""
+
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+
+            # WAL lets readers in other processes carry on while one writes
+            connection = sqlite3.connect(self._path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._local.connection = connection
+
+        return connection
@@ -1,12 +1,30 @@
-from typing import List
+import asyncio
+import json
+import os
+import time
+import zipfile
+from typing import List, Dict, Any, Tuple, AsyncIterator
 
 from CriadexSDK import CriadexSDK
 from fastapi import UploadFile
 from redis.asyncio import Redis
 
+from criaparse.blob.store import Blob, BlobStore, LocalBlobStore
+from criaparse.cache.artifact import configure_artifact_cache
+from criaparse.cache.caption import configure_caption_cache
+from criaparse.cache.embedding import configure_embedding_cache
+from criaparse.cache.result import CacheLookup, ResultCache
+from criaparse.daemon.admission import AdmissionController
+from criaparse.daemon.batch import BatchData, BatchProgress, BatchTooLargeError, expand_zip, is_zip, list_zip
+from criaparse.daemon.cancellation import JobCanceller
+from criaparse.daemon.checkpoint import CheckpointStore
 from criaparse.daemon.daemon import Daemon
-from criaparse.daemon.job import Job, JobData
-from criaparse.models import ParserResponse, ParserStrategy
+from criaparse.daemon.encoding import RecordEncoding, configure_record_encoding
+from criaparse.daemon.executor import ConverterExecutor, ExecutorMode
+from criaparse.daemon.job import Job, JobData, JobEvent, JobEventType, SerializedJobData
+from criaparse.daemon.stream import JobStream, QueueBackend
+from criaparse.daemon.upload import UploadSession, UploadStore
+from criaparse.models import ParserResponse, ParserStrategy, ParserFile, ElementType, FileTooLargeError
 
 
 class CriaParse:
@@ -16,22 +34,137 @@ class CriaParse:
             self,
             criadex: CriadexSDK,
             redis: Redis,
-            workers: int
+            workers: int,
+            concurrency: Dict[ParserStrategy, int] | None = None,
+            aging_factor: float = 1.0,
+            executor_mode: ExecutorMode = ExecutorMode.INLINE,
+            executor_processes: int = 1,
+            queue_backend: QueueBackend = QueueBackend.MEMORY,
+            queue_claim_idle_ms: int = 10 * 60 * 1000,
+            queue_max_jobs: int | None = None,
+            queue_max_bytes: int | None = None,
+            abandon_seconds: int | None = None,
+            checkpoint_directory: str | None = None,
+            result_cache_ttl_seconds: int = 60 * 60 * 24 * 7,
+            result_cache_max_bytes: int | None = None,
+            artifact_cache_path: str | None = None,
+            artifact_cache_max_bytes: int = 1024 * 1024 * 1024,
+            caption_cache_path: str | None = None,
+            caption_cache_max_bytes: int = 256 * 1024 * 1024,
+            caption_cache_perceptual: bool = False,
+            embedding_cache_path: str | None = None,
+            embedding_cache_max_bytes: int = 512 * 1024 * 1024,
+            batch_max_files: int = 500,
+            asset_directory: str | None = None,
+            asset_max_age_seconds: int = 60 * 60 * 24 * 8,
+            record_encoding: RecordEncoding = RecordEncoding.JSON,
+            spool_directory: str | None = None,
+            spool_max_memory_bytes: int = 8 * 1024 * 1024,
+            max_file_bytes: Dict[ParserStrategy, int] | None = None,
+            upload_directory: str | None = None,
+            upload_max_age_seconds: int = 60 * 60 * 24
     ):
         """Initialize CriaParse"""
 
         self._criadex: CriadexSDK = criadex
-        self._parsers = {strategy: strategy.create() for strategy in ParserStrategy.iterator()}
+
+        # Both encodings are always read. JSON until every process can read MSGPACK.
+        configure_record_encoding(encoding=record_encoding)
+
+        self._executor = ConverterExecutor(
+            mode=executor_mode,
+            processes=executor_processes,
+            # Converters consult the on-disk artifact cache from whichever process they run in
+            initializer=configure_artifact_cache,
+            initargs=(artifact_cache_path, artifact_cache_max_bytes)
+        )
+        self._checkpoints: CheckpointStore | None = CheckpointStore(directory=checkpoint_directory) if checkpoint_directory else None
+
+        # Asset bytes are written once & served by reference instead of inlined as base64 in every response
+        self._assets: BlobStore | None = LocalBlobStore(directory=asset_directory, max_age_seconds=asset_max_age_seconds) if asset_directory else None
+
+        self._parsers = {
+            strategy: strategy.create(executor=self._executor, checkpoints=self._checkpoints, assets=self._assets)
+            for strategy in ParserStrategy.iterator()
+        }
         self._redis: Redis = redis
-        self._daemon = Daemon(workers=workers)
+        self._daemon = Daemon(workers=workers, concurrency=concurrency, aging_factor=aging_factor)
+
+        # With the Redis backend, jobs are published to a stream every CriaParse process consumes from
+        self._stream: JobStream | None = JobStream(
+            redis=redis,
+            daemon=self._daemon,
+            build_job=self._build_job,
+            claim_idle_ms=queue_claim_idle_ms
+        ) if queue_backend == QueueBackend.REDIS else None
+
+        self._batch_max_files: int = batch_max_files
+
+        # Large uploads wait for a worker as a file on disk rather than bytes in memory
+        self._spool_directory: str | None = spool_directory
+        self._spool_max_memory_bytes: int = spool_max_memory_bytes
+
+        # Map<Strategy, Bytes> of the largest file each strategy accepts. 0 or missing for no limit.
+        self._max_file_bytes: Dict[ParserStrategy, int] = max_file_bytes or {}
+
+        # Very large files can be uploaded in chunks, resuming where a dropped connection left off
+        self._uploads: UploadStore | None = UploadStore(directory=upload_directory, max_age_seconds=upload_max_age_seconds) if upload_directory else None
+
+        # Refuse new jobs while the backlog is too deep, rather than buffering every upload in memory
+        self._admission = AdmissionController(max_jobs=queue_max_jobs, max_bytes=queue_max_bytes)
+        self._canceller = JobCanceller(redis=redis, daemon=self._daemon, abandon_seconds=abandon_seconds)
+
+        # Images repeated across documents (logos, crests, banners) are only captioned once
+        configure_caption_cache(path=caption_cache_path, max_bytes=caption_cache_max_bytes, perceptual=caption_cache_perceptual)
+
+        # As is boilerplate text (academic integrity statements, accessibility policies...) embedded by the semantic splitter
+        configure_embedding_cache(path=embedding_cache_path, max_bytes=embedding_cache_max_bytes)
+
+        # Re-uploads of unchanged files are served from the cache instead of being parsed again
+        self._results: ResultCache | None = ResultCache(
+            redis=redis,
+            ttl_seconds=result_cache_ttl_seconds,
+            max_bytes=result_cache_max_bytes
+        ) if result_cache_max_bytes else None
 
     def start(self) -> None:
-        """Start the Daemon responsible for handling asynchronous parsing jobs."""
+        """Start the Daemon responsible for handling asynchronous parsing jobs & the converter pool."""
+        self._executor.start()
+
+        if self._spool_directory is not None:
+            os.makedirs(self._spool_directory, exist_ok=True)
+
+        if self._checkpoints is not None:
+            self._checkpoints.start()
+
+        if self._assets is not None:
+            self._assets.start()
+
+        if self._uploads is not None:
+            self._uploads.start()
+
         self._daemon.start()
+        self._canceller.start()
+
+        if self._stream is not None:
+            self._stream.start()
 
     async def close(self):
         """Stop the Daemon responsible for handling asynchronous parsing jobs & cancel all jobs."""
+
+        # Stop consuming first so in-flight stream entries are left for another consumer, not acknowledged
+        if self._stream is not None:
+            await self._stream.stop()
+
+        await self._canceller.stop()
         await self._daemon.stop()
+        self._executor.stop()
+
+        if self._assets is not None:
+            await self._assets.stop()
+
+        if self._uploads is not None:
+            await self._uploads.stop()
 
     @property
     def parsing_strategies(self) -> List[str]:
@@ -46,51 +179,556 @@ class CriaParse:
     ) -> ParserResponse:
         """(NOT RECOMMENDED) Synchronously parse a file using a specific strategy. This will lead to HTTP timeouts on large documents when hooked into FastAPI."""
 
-        job: Job = await Job.create(
-            parser=self._parsers[strategy],
-            criadex=self._criadex,
-            redis=self._redis,
-            file=file,
-            **kwargs
-        )
+        # Convert the file here to prevent io stream closing by FastAPI
+        parser_file: ParserFile = await self._read_upload(file=file, strategy=strategy)
+
+        try:
+            cache_key: str | None = self._create_cache_key(sha256=parser_file.sha256, strategy=strategy, options=kwargs)
+
+            if (response := await self._get_cached_response(cache_key=cache_key)) is not None:
+                return response
+
+            job: Job = await Job.create(
+                parser=self._parsers[strategy],
+                criadex=self._criadex,
+                redis=self._redis,
+                file=parser_file,
+                **kwargs
+            )
+
+            # Wait for response without using a worker
+            response: ParserResponse = await job.run()
+        finally:
+            parser_file.close()
+
+        if cache_key is not None:
+            await self._results.put(key=cache_key, response=response)
 
-        # Wait for response without using a worker
-        return await job.future
+        return response
+
+    async def backlog(self) -> Tuple[int, int]:
+        """Check the # of queued & running jobs, and the total size of their files"""
+
+        if self._stream is not None:
+            return await self._stream.backlog()
+
+        return self._daemon.backlog
 
     async def queue(
             self,
             file: UploadFile,
             strategy: ParserStrategy,
+            timeout: int | None = None,
             **kwargs
     ) -> Job:
-        """Queue a job to be processed by the daemon"""
+        """
+        Queue a job to be processed by the daemon
+
+        :param file: The file to parse
+        :param strategy: The parser strategy
+        :param timeout: Cancel the job if it hasn't finished within this many seconds
+        :raises QueueFullError: If the backlog is over its limits
+        :raises FileTooLargeError: If the file is over the strategy's size limit
+
+        """
+
+        # Check before reading the upload into memory
+        await self._check_admission(size=file.size or 0)
+
+        # Convert the file here to prevent io stream closing by FastAPI
+        parser_file: ParserFile = await self._read_upload(file=file, strategy=strategy)
+
+        try:
+            return await self._queue_file(
+                file=parser_file,
+                strategy=strategy,
+                **self._queue_options(strategy=strategy, timeout=timeout, **kwargs)
+            )
+        except BaseException:
+            parser_file.close()
+            raise
+
+    async def queue_batch(
+            self,
+            files: List[UploadFile],
+            strategy: ParserStrategy,
+            timeout: int | None = None,
+            **kwargs
+    ) -> BatchData:
+        """
+        Queue a batch of files, or a single ZIP archive of them, as one job per file
+
+        :param files: The files to parse
+        :param strategy: The parser strategy
+        :param timeout: Cancel each job if it hasn't finished within this many seconds
+        :raises QueueFullError: If the backlog is over its limits
+        :raises BatchTooLargeError: If there are too many files
+        :raises FileTooLargeError: If a file is over the strategy's size limit
+
+        """
+
+        if len(files) > self._batch_max_files:
+            raise BatchTooLargeError(f"A batch can have at most {self._batch_max_files} files, but {len(files)} were uploaded.")
+
+        await self._check_admission(size=sum(file.size or 0 for file in files), jobs=len(files))
+        batch_data: BatchData = BatchData(strategy=strategy, _redis=self._redis)
+        parser_files: List[ParserFile] = []
+        queued: int = 0
+
+        try:
+            for file in files:
+                parser_files.append(await self._read_upload(file=file, strategy=strategy))
+
+            # Archives are only known to hold more files once they are opened
+            if len(parser_files) == 1 and is_zip(parser_files[0]):
+                archive: ParserFile = parser_files[0]
+                entries: List[zipfile.ZipInfo] = await asyncio.to_thread(list_zip, archive, self._batch_max_files)
+                max_bytes: int | None = self.max_file_bytes(strategy=strategy)
+
+                # Checked against the sizes the archive claims before anything is decompressed, so a ZIP bomb is never inflated
+                for info in entries:
+                    if max_bytes is not None and info.file_size > max_bytes:
+                        raise FileTooLargeError(f"The file \"{info.filename}\" is {info.file_size} bytes, but at most {max_bytes} bytes can be parsed.")
+
+                await self._check_admission(size=sum(info.file_size for info in entries), jobs=len(entries))
+
+                # Claimed sizes are still enforced as the files are extracted
+                parser_files = await asyncio.to_thread(
+                    expand_zip,
+                    archive,
+                    entries,
+                    self._spool_directory,
+                    self._spool_max_memory_bytes,
+                    max_bytes
+                )
+                archive.close()
+
+            options: Dict[str, Any] = self._queue_options(strategy=strategy, timeout=timeout, **kwargs)
+
+            # Resolve the models once for every job in the batch
+            model_info: Dict[str, Any] | None = None
+
+            if options.get('llm_model_id') and options.get('embedding_model_id'):
+                model_info = await Job.resolve_model_info(
+                    criadex=self._criadex,
+                    llm_model_id=options['llm_model_id'],
+                    embedding_model_id=options['embedding_model_id']
+                )
+
+            for parser_file in parser_files:
+                job: Job = await self._queue_file(file=parser_file, strategy=strategy, model_info=model_info, **options)
+                batch_data.jobs[job.data.job_id] = parser_file.filename
+                queued += 1
+
+            await batch_data.upsert()
+        except BaseException:
+            # Queued jobs release their own files
+            for parser_file in parser_files[queued:]:
+                parser_file.close()
+
+            # The client never learns the batch ID, so nobody would poll the jobs already queued
+            await asyncio.gather(*[
+                self._canceller.cancel(job_id=job_id, reason="Another file of the batch failed to queue.")
+                for job_id in batch_data.jobs
+            ], return_exceptions=True)
+            raise
+
+        return batch_data
+
+    async def create_upload(self, filename: str, content_type: str, strategy: ParserStrategy, size: int) -> UploadSession | None:
+        """
+        Start a resumable upload, to be sent in chunks & queued once it's finalized
+
+        :param filename: The name of the file
+        :param content_type: The mimetype of the file
+        :param strategy: The parser strategy
+        :param size: The size of the whole file, in bytes
+        :return: The upload session, or None if resumable uploads are disabled
+        :raises QueueFullError: If the backlog is over its limits
+        :raises FileTooLargeError: If the file is over the strategy's size limit
+
+        """
+
+        if self._uploads is None:
+            return None
+
+        max_bytes: int | None = self.max_file_bytes(strategy=strategy)
+
+        if max_bytes is not None and size > max_bytes:
+            raise FileTooLargeError(f"The file \"{filename}\" is {size} bytes, but at most {max_bytes} bytes can be parsed.")
+
+        # Check before the client spends any time uploading
+        await self._check_admission(size=size)
+
+        return await self._uploads.create(filename=filename, content_type=content_type, strategy=strategy, size=size)
+
+    async def get_upload(self, upload_id: str) -> UploadSession | None:
+        """Get a resumable upload, with the offset to resume it from"""
+        return await self._uploads.get(upload_id=upload_id) if self._uploads is not None else None
+
+    async def write_upload(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> UploadSession | None:
+        """
+        Append a chunk to a resumable upload
+
+        :param upload_id: The ID of the upload
+        :param offset: Where the chunk starts in the file
+        :param chunks: The chunk, as it streams in
+        :return: The upload session, or None if it doesn't exist
+        :raises UploadOffsetError: If the chunk doesn't start where the upload left off
+        :raises FileTooLargeError: If the chunk runs past the size of the file
+
+        """
+
+        if self._uploads is None:
+            return None
+
+        return await self._uploads.write(upload_id=upload_id, offset=offset, chunks=chunks)
+
+    async def finalize_upload(self, upload_id: str, timeout: int | None = None, **kwargs) -> Job | None:
+        """
+        Queue the file of a finished resumable upload as a job
+
+        :param upload_id: The ID of the upload
+        :param timeout: Cancel the job if it hasn't finished within this many seconds
+        :return: The job, or None if the upload doesn't exist
+        :raises UploadOffsetError: If the upload hasn't received the whole file
+        :raises QueueFullError: If the backlog is over its limits
+
+        """
+
+        session: UploadSession | None = await self.get_upload(upload_id=upload_id)
+
+        if session is None:
+            return None
+
+        # Refused uploads are kept, so they can be finalized once the backlog clears
+        await self._check_admission(size=session.size)
+
+        # Put back if the job isn't queued, so the finalize can be retried without uploading the file again
+        async with self._uploads.finalize(upload_id=upload_id) as parser_file:
+            if parser_file is None:
+                return None
+
+            return await self._queue_file(
+                file=parser_file,
+                strategy=session.strategy,
+                **self._queue_options(strategy=session.strategy, timeout=timeout, **kwargs)
+            )
+
+    async def poll_batch(self, batch_id: str) -> BatchProgress | None:
+        """Poll the aggregate progress of a batch"""
+
+        batch_data: BatchData | None = await BatchData.from_redis(batch_id=batch_id, redis=self._redis)
+
+        if batch_data is None:
+            return None
+
+        progress: BatchProgress = await batch_data.progress()
+
+        # Keep the unfinished jobs from being reaped as abandoned
+        await self._canceller.touch(*[status.job_id for status in progress.jobs if status.finished is False])
+
+        return progress
+
+    def max_file_bytes(self, strategy: ParserStrategy) -> int | None:
+        """The largest file a strategy accepts, in bytes. None for no limit."""
+        return self._max_file_bytes.get(strategy) or None
+
+    async def _read_upload(self, file: UploadFile, strategy: ParserStrategy) -> ParserFile:
+        """Read an upload before FastAPI closes it, spooling it to disk if it's large"""
+        return await ParserFile.from_upload_file(
+            upload_file=file,
+            spool_directory=self._spool_directory,
+            spool_max_memory_bytes=self._spool_max_memory_bytes,
+            max_bytes=self.max_file_bytes(strategy=strategy)
+        )
+
+    async def _check_admission(self, size: int, jobs: int = 1) -> None:
+        """Refuse new jobs if the backlog is over its limits. Throughput is measured locally, so Retry-After errs long with several consumers."""
+
+        backlog_jobs, backlog_bytes = await self.backlog()
+
+        self._admission.check(
+            size=size,
+            backlog_jobs=backlog_jobs,
+            backlog_bytes=backlog_bytes,
+            throughput=self._daemon.throughput,
+            jobs=jobs
+        )
+
+    @classmethod
+    def _queue_options(cls, strategy: ParserStrategy, timeout: int | None, **kwargs) -> Dict[str, Any]:
+        """Get the options of a queued job"""
 
         # Default to H1-grouped nodes for indexing when using the GENERIC strategy
         if strategy == ParserStrategy.GENERIC and 'group_by_h1' not in kwargs:
             kwargs['group_by_h1'] = True
 
+        # Stored as an absolute time so it survives being passed through the job stream
+        if timeout is not None:
+            kwargs['deadline'] = time.time() + timeout
+
+        return kwargs
+
+    async def _queue_file(
+            self,
+            file: ParserFile,
+            strategy: ParserStrategy,
+            model_info: Dict[str, Any] | None = None,
+            **kwargs
+    ) -> Job:
+        """Queue a job for a file that has been read"""
+
+        parser_file: ParserFile = file
+        cache_key: str | None = self._create_cache_key(sha256=parser_file.sha256, strategy=strategy, options=kwargs)
+
+        # On a hit, the job is finished before it's even polled
+        if (response := await self._get_cached_response(cache_key=cache_key)) is not None:
+            return await Job.create_finished(
+                parser=self._parsers[strategy],
+                redis=self._redis,
+                file=parser_file,
+                response=response,
+                **kwargs
+            )
+
         job: Job = await Job.create(
             parser=self._parsers[strategy],
             criadex=self._criadex,
             redis=self._redis,
-            file=file,
+            file=parser_file,
+            model_info=model_info,
             **kwargs
         )
 
-        return await self._daemon.queue(job=job)
+        # The client has until the abandon window passes to start polling
+        await self._canceller.touch(job.data.job_id)
+
+        # Clients checking for the same file follow this job rather than uploading it again
+        if cache_key is not None:
+            await self._results.set_in_flight(key=cache_key, job_id=job.data.job_id)
+
+        try:
+            if self._stream is not None:
+                return await self._stream.publish(job=job)
+
+            self._cache_response(job=job, cache_key=cache_key)
+            return await self._daemon.queue(job=job)
+        except BaseException:
+            if cache_key is not None:
+                await self._results.clear_in_flight(key=cache_key)
+            raise
 
-    async def poll(self, job_id: str) -> JobData | None:
-        """Poll the status of a job"""
+    async def precheck(self, sha256: str, strategy: ParserStrategy, **kwargs) -> CacheLookup:
+        """
+        Check whether a file was already parsed, or is being parsed, before it's uploaded
+
+        :param sha256: The SHA-256 hex digest of the file
+        :param strategy: The strategy it would be parsed with
+        :param kwargs: The options it would be queued with
+        :return: The cached response or the ID of the job parsing it, or neither if it must be uploaded.
+            The job's result is its uploader's, so check again for it once the job is finished rather than polling it in full.
+
+        """
+
+        cache_key: str | None = self._create_cache_key(sha256=sha256, strategy=strategy, options=self._queue_options(strategy=strategy, timeout=None, **kwargs))
+
+        if cache_key is None:
+            return CacheLookup()
+
+        if (response := await self._get_cached_response(cache_key=cache_key)) is not None:
+            return CacheLookup(response=response)
+
+        job_id: str | None = await self._results.get_in_flight(key=cache_key)
+
+        if job_id is None:
+            return CacheLookup()
+
+        job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis, include_response=False)
+
+        # Cancelled & expired jobs will never fill the cache, & finished ones would have by now
+        if job_data is None or job_data.cancelled or job_data.finished:
+            await self._results.clear_in_flight(key=cache_key)
+            return CacheLookup()
+
+        # Checking again keeps the job from being reaped as abandoned, like polling it
+        await self._canceller.touch(job_id)
+
+        return CacheLookup(job_id=job_id)
+
+    async def cancel(self, job_id: str, reason: str = "Cancelled by the client.") -> JobData | None:
+        """Cancel a queued or running job, wherever it's held"""
+        return await self._canceller.cancel(job_id=job_id, reason=reason)
+
+    async def _build_job(
+            self,
+            job_id: str,
+            strategy: ParserStrategy,
+            file: ParserFile,
+            options: Dict[str, Any]
+    ) -> Job:
+        """Rebuild a job consumed from the job stream"""
+
+        job: Job = await Job.create(
+            parser=self._parsers[strategy],
+            criadex=self._criadex,
+            redis=self._redis,
+            file=file,
+            job_id=job_id,
+            **options
+        )
+
+        self._cache_response(job=job, cache_key=self._create_cache_key(sha256=file.sha256, strategy=strategy, options=options))
+        return job
+
+    def _create_cache_key(self, sha256: str, strategy: ParserStrategy, options: Dict[str, Any]) -> str | None:
+        """Get the result cache key of a job, if the cache is enabled"""
+
+        if self._results is None:
+            return None
+
+        return self._results.create_key(sha256=sha256, strategy=strategy, options=options)
+
+    async def _get_cached_response(self, cache_key: str | None) -> ParserResponse | None:
+        """Get a cached response, keeping the assets it references from being pruned"""
+
+        if cache_key is None:
+            return None
+
+        response: ParserResponse | None = await self._results.get(key=cache_key)
+
+        if response is not None and self._assets is not None:
+            # Assets may instead be in the backwards compatible container element
+            assets: List[dict] = [asset.model_dump() for asset in response.assets] + [
+                asset for element in response.elements if element.type == ElementType.BACKWARDS_COMPATIBLE_ASSET_CONTAINER
+                for asset in element.metadata.get('assets', [])
+            ]
+
+            await self._assets.touch(keys=[asset['data_ref'] for asset in assets if asset.get('data_ref')])
+
+        return response
+
+    async def get_asset(self, asset_id: str) -> Blob | None:
+        """Get an asset written to the blob store"""
+        return await self._assets.get(key=asset_id) if self._assets is not None else None
+
+    def _cache_response(self, job: Job, cache_key: str | None) -> None:
+        """Fill the result cache once a job has its response, or stop pointing clients at the job if it fails"""
+
+        if cache_key is not None:
+            job.add_response_callback(lambda response: self._results.put(key=cache_key, response=response))
+            job.add_failure_callback(lambda: self._results.clear_in_flight(key=cache_key))
+
+    async def events(self, job_id: str, heartbeat_seconds: float = 15) -> AsyncIterator[JobEvent | None]:
+        """
+        Stream the events of a job as they're published by whichever process runs it
+
+        :param job_id: The ID of the job
+        :param heartbeat_seconds: Yield None after this long without an event, so idle connections can be kept alive
+        :return: The job's current status, then each event until it finishes or is cancelled. Nothing if the job doesn't exist.
+
+        """
+
+        async with self._redis.pubsub() as pubsub:
+            # Subscribe before reading the status so no event is missed in between
+            await pubsub.subscribe(JobData.create_channel(job_id=job_id))
+            job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis, include_response=False)
+
+            if job_data is None:
+                return
+
+            event: JobEvent = JobEvent.from_job_data(job_data=job_data, event=JobEventType.STATUS)
+            yield event
+
+            while not (event.finished or event.cancelled):
+                # Watching the stream counts as polling, so the job isn't reaped as abandoned
+                await self._canceller.touch(job_id)
+                message: dict | None = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat_seconds)
+
+                if message is not None:
+                    event = JobEvent(**json.loads(message["data"]))
+                    yield event
+                    continue
+
+                # Jobs that failed never finish, so stop once their data expires
+                if not await self._redis.exists(JobData._create_key(job_id=job_id)):
+                    return
+
+                yield None
+
+    async def has_job(self, job_id: str) -> bool:
+        """Check a job exists without loading its data"""
+        return bool(await self._redis.exists(JobData._create_key(job_id=job_id)))
+
+    async def elements(self, job_id: str) -> AsyncIterator[str]:
+        """
+        Stream the elements of a job as its parser finalizes them
+
+        :param job_id: The ID of the job
+        :return: Each element as JSON, until the job finishes or is cancelled. Nothing if the job doesn't exist.
+
+        """
+
+        key: str = JobData.create_elements_key(job_id=job_id)
+        streamed: int = 0
+
+        async for event in self.events(job_id=job_id):
+            if event is None:
+                continue
+
+            elements: List[bytes] = await self._redis.lrange(key, streamed, -1)
+            streamed += len(elements)
+
+            for element in elements:
+                yield element.decode()
+
+            # The elements that weren't emitted as the job ran (or all of them, if it didn't stream or was served from the cache) follow from the response
+            if event.finished:
+                job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis)
+
+                for element in job_data.response.elements[streamed:] if job_data and job_data.response else []:
+                    yield element.json()
+
+    async def poll_serialized(self, job_id: str) -> SerializedJobData | None:
+        """
+        Poll a job as JSON, without parsing its stored response. Finished jobs are atomically deleted.
+
+        :param job_id: The ID of the job
+        :return: The serialized job data, or None if it doesn't exist
+
+        """
+
+        job_data: SerializedJobData | None = await JobData.pop_serialized(job_id=job_id, redis=self._redis)
+
+        # Keep the job from being reaped as abandoned
+        if job_data is not None and not job_data.finished:
+            await self._canceller.touch(job_id)
+
+        return job_data
+
+    async def poll(self, job_id: str, progress_only: bool = False) -> JobData | None:
+        """
+        Poll the status of a job
+
+        :param job_id: The ID of the job
+        :param progress_only: Only read the job's progress, never its response. The job is kept to be polled again.
+        :return: The job data, or None if it doesn't exist
+
+        """
 
         # Get the key
-        job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis)
+        job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis, include_response=not progress_only)
 
         # If no response
         if job_data is None:
             return None
 
+        # Keep the job from being reaped as abandoned
+        if not job_data.finished:
+            await self._canceller.touch(job_id)
+
         # If it's finished, delete the key as we are retrieving the parse data
-        if job_data.finished:
+        if job_data.finished and not progress_only:
             await job_data.delete()
 
         # Return the data
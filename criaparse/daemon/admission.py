@@ -0,0 +1,126 @@
+import math
+import time
+from collections import deque
+
+from criaparse.daemon.batch import BatchTooLargeError
+
+
+class QueueFullError(RuntimeError):
+    """
+    Thrown when a job is refused because the queue is over its limits
+
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after: int = retry_after
+
+
+class ThroughputMeter:
+    """Measures recently completed jobs & bytes per second over a sliding window"""
+
+    def __init__(self, window_seconds: float = 15 * 60):
+        self._window_seconds: float = window_seconds
+        self._completions: deque[tuple[float, int]] = deque()
+        self._started_at: float = time.monotonic()
+
+    def record(self, size: int) -> None:
+        """Record a completed job of a given size"""
+        self._completions.append((time.monotonic(), size))
+        self._expire()
+
+    def _expire(self) -> None:
+        """Drop completions that fell out of the window"""
+        cutoff: float = time.monotonic() - self._window_seconds
+
+        while self._completions and self._completions[0][0] < cutoff:
+            self._completions.popleft()
+
+    def rate(self) -> tuple[float, float]:
+        """
+        Get the recent throughput
+
+        :return: (jobs per second, bytes per second)
+
+        """
+
+        self._expire()
+
+        # Don't under-estimate throughput while the window is still filling up after a restart
+        elapsed: float = min(time.monotonic() - self._started_at, self._window_seconds)
+
+        if not self._completions or elapsed <= 0:
+            return 0.0, 0.0
+
+        return len(self._completions) / elapsed, sum(size for _, size in self._completions) / elapsed
+
+
+class AdmissionController:
+    """Refuses new jobs once the backlog exceeds its job count or byte limits"""
+
+    # Retry-After bounds, in seconds, also used when no throughput has been measured yet
+    DEFAULT_RETRY_AFTER: int = 30
+    MAX_RETRY_AFTER: int = 60 * 60
+
+    def __init__(
+            self,
+            max_jobs: int | None = None,
+            max_bytes: int | None = None
+    ):
+        """
+        Create the admission controller
+
+        :param max_jobs: The max # of queued & running jobs. None for no limit.
+        :param max_bytes: The max total size of queued & running files. None for no limit.
+
+        """
+
+        self._max_jobs: int | None = max_jobs
+        self._max_bytes: int | None = max_bytes
+
+    def check(
+            self,
+            size: int,
+            backlog_jobs: int,
+            backlog_bytes: int,
+            throughput: tuple[float, float],
+            jobs: int = 1
+    ) -> None:
+        """
+        Check new jobs can be admitted
+
+        :param size: The total size of the new jobs' files
+        :param backlog_jobs: The # of queued & running jobs
+        :param backlog_bytes: The total size of queued & running files
+        :param throughput: The recent (jobs per second, bytes per second)
+        :param jobs: The # of new jobs
+        :raises QueueFullError: If the jobs would exceed a limit
+        :raises BatchTooLargeError: If there are more jobs than the queue ever holds, so they could never be admitted
+
+        """
+
+        if self._max_jobs is not None and jobs > self._max_jobs:
+            raise BatchTooLargeError(f"The batch has {jobs} files, but the parsing queue holds at most {self._max_jobs} jobs.")
+
+        jobs_per_second, bytes_per_second = throughput
+        excess_seconds: list[float] = []
+
+        if self._max_jobs is not None and backlog_jobs + jobs > self._max_jobs:
+            excess_jobs: int = min(backlog_jobs + jobs - self._max_jobs, backlog_jobs)
+            excess_seconds.append(excess_jobs / jobs_per_second if jobs_per_second else self.DEFAULT_RETRY_AFTER)
+
+        if self._max_bytes is not None and backlog_bytes + size > self._max_bytes:
+            # A file larger than the whole budget is only admitted into an empty queue
+            excess_bytes: int = min(backlog_bytes + size - self._max_bytes, backlog_bytes)
+            excess_seconds.append(excess_bytes / bytes_per_second if bytes_per_second else self.DEFAULT_RETRY_AFTER)
+
+            if backlog_bytes == 0:
+                excess_seconds.pop()
+
+        if not excess_seconds:
+            return
+
+        raise QueueFullError(
+            "The parsing queue is full. Try again later.",
+            retry_after=min(max(math.ceil(max(excess_seconds)), 1), self.MAX_RETRY_AFTER)
+        )
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import mimetypes
+import os
+import uuid
+import zipfile
+from typing import Dict, List, ClassVar
+
+from pydantic import BaseModel, PrivateAttr, Field
+from redis.asyncio import Redis
+
+from criaparse.daemon.job import JobData
+from criaparse.models import ParserFile
+
+ZIP_CONTENT_TYPES: List[str] = ["application/zip", "application/x-zip-compressed"]
+
+
+class BatchTooLargeError(RuntimeError):
+    """
+    Thrown when a batch (or the ZIP it was uploaded as) has too many files
+
+    """
+
+
+def is_zip(file: ParserFile) -> bool:
+    """Check if a file is a ZIP archive to be expanded into a batch"""
+    return file.content_type in ZIP_CONTENT_TYPES or file.filename.lower().endswith(".zip")
+
+
+def list_zip(file: ParserFile, max_files: int) -> List[zipfile.ZipInfo]:
+    """
+    List the files of a ZIP archive, without decompressing any of them
+
+    :param file: The archive
+    :param max_files: The max # of files to extract
+    :return: The files' entries, whose sizes can be checked before they're extracted
+    :raises BatchTooLargeError: If the archive has too many files
+
+    """
+
+    with file.open() as fp, zipfile.ZipFile(fp) as archive:
+        # Skip folders & macOS resource forks
+        entries: List[zipfile.ZipInfo] = [
+            info for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/") and not os.path.basename(info.filename).startswith(".")
+        ]
+
+    if len(entries) > max_files:
+        raise BatchTooLargeError(f"The archive has {len(entries)} files, but a batch can have at most {max_files}.")
+
+    return entries
+
+
+def expand_zip(
+        file: ParserFile,
+        entries: List[zipfile.ZipInfo],
+        spool_directory: str | None = None,
+        spool_max_memory_bytes: int = 0,
+        max_bytes: int | None = None
+) -> List[ParserFile]:
+    """
+    Extract the files of a ZIP archive, streaming large ones to disk as they're decompressed
+
+    :param file: The archive
+    :param entries: The entries to extract, from list_zip
+    :param spool_directory: Directory to spool large files to. None to hold every file in memory.
+    :param spool_max_memory_bytes: Files up to this size are held in memory anyway
+    :param max_bytes: The max size of each file. None for no limit.
+    :return: The files, with content types guessed from their names
+    :raises FileTooLargeError: As soon as a file is found to be over the limit, whatever size its entry claims
+
+    """
+
+    files: List[ParserFile] = []
+
+    try:
+        with file.open() as fp, zipfile.ZipFile(fp) as archive:
+            for info in entries:
+                with archive.open(info) as member:
+                    files.append(ParserFile.from_stream(
+                        stream=member,
+                        filename=os.path.basename(info.filename),
+                        content_type=mimetypes.guess_type(info.filename)[0] or "application/octet-stream",
+                        spool_directory=spool_directory,
+                        spool_max_memory_bytes=spool_max_memory_bytes,
+                        max_bytes=max_bytes
+                    ))
+    except BaseException:
+        for extracted in files:
+            extracted.close()
+        raise
+
+    return files
+
+
+class BatchJobStatus(BaseModel):
+    """
+    The status of a job in a batch
+
+    """
+
+    job_id: str
+    filename: str
+
+    # None once the job data has expired or been retrieved with a poll
+    step: int | None = None
+    steps: int | None = None
+    finished: bool | None = None
+    cancelled: bool | None = None
+
+
+class BatchProgress(BaseModel):
+    """
+    Aggregate progress of a batch
+
+    """
+
+    batch_id: str
+    total: int
+    finished: int
+    cancelled: int
+
+    # Jobs whose data expired or was already retrieved with a poll
+    missing: int
+
+    # Share of all steps completed, from 0 to 1
+    progress: float
+
+    jobs: List[BatchJobStatus]
+
+
+class BatchData(BaseModel):
+    """
+    A batch of jobs queued together
+
+    """
+
+    # Private redis for sync'ing the model
+    _redis: Redis = PrivateAttr()
+
+    # The ID of the batch
+    batch_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+
+    # Strategy name
+    strategy: str
+
+    # Map<JobID, Filename>
+    jobs: Dict[str, str] = {}
+
+    # The progress fields of each job's status
+    STATUS_FIELDS: ClassVar[List[str]] = ['step', 'steps', 'finished', 'cancelled']
+
+    def __init__(self, _redis: Redis, **kwargs):
+        """Create a BatchData instance"""
+        super().__init__(**kwargs)
+        self._redis = _redis
+
+    async def upsert(self) -> None:
+        """Upsert the batch data. Expires after 1 day."""
+        await self._redis.set(self._create_key(self.batch_id), self.json(), ex=(60 * 60 * 24))
+
+    async def progress(self) -> BatchProgress:
+        """Get the aggregate progress of the jobs in the batch"""
+
+        job_ids: List[str] = list(self.jobs.keys())
+
+        # Only the progress hashes are read, never the responses
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hmget(JobData._create_key(job_id=job_id), self.STATUS_FIELDS)
+
+            # Jobs written as one string before progress was split out fail with WRONGTYPE, & are reported as unknown
+            raw_jobs: List[List[bytes | None] | Exception] = await pipe.execute(raise_on_error=False) if job_ids else []
+
+        statuses: List[BatchJobStatus] = []
+        steps_done: float = 0
+
+        for job_id, raw_job in zip(job_ids, raw_jobs):
+            status: BatchJobStatus = BatchJobStatus(job_id=job_id, filename=self.jobs[job_id])
+
+            if isinstance(raw_job, list) and raw_job[0] is not None:
+                status.step, status.steps, status.finished, status.cancelled = [json.loads(value) for value in raw_job]
+
+            # Missing jobs were most likely finished & retrieved
+            if status.finished is None or status.finished:
+                steps_done += 1
+            elif status.steps:
+                steps_done += (status.step or 0) / status.steps
+
+            statuses.append(status)
+
+        return BatchProgress(
+            batch_id=self.batch_id,
+            total=len(statuses),
+            finished=sum(1 for status in statuses if status.finished),
+            cancelled=sum(1 for status in statuses if status.cancelled),
+            missing=sum(1 for status in statuses if status.finished is None),
+            progress=steps_done / len(statuses) if statuses else 1.0,
+            jobs=statuses
+        )
+
+    @classmethod
+    async def from_redis(cls, batch_id: str, redis: Redis) -> BatchData | None:
+        """Load the batch data from Redis"""
+        data: str | None = await redis.get(cls._create_key(batch_id=batch_id))
+        return cls(**json.loads(data), _redis=redis) if data is not None else None
+
+    @classmethod
+    def _create_key(cls, batch_id: str) -> str:
+        """Get the redis Key for a batch"""
+        return f"criaparse:batch:{batch_id}"
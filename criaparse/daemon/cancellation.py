@@ -0,0 +1,153 @@
+import asyncio
+import json
+import logging
+from typing import List
+
+from redis.asyncio import Redis
+
+from criaparse.daemon.daemon import Daemon
+from criaparse.daemon.job import JobData, JobEventType
+
+
+class JobCanceller:
+    """
+    Cancels jobs on whichever CriaParse process holds them.
+
+    Cancellations are stored on the job data, then broadcast over Redis pub/sub to every process's Daemon.
+    Optionally reaps jobs held by this process that nobody has polled within `abandon_seconds`.
+
+    """
+
+    CHANNEL: str = "criaparse:cancel"
+
+    def __init__(
+            self,
+            redis: Redis,
+            daemon: Daemon,
+            abandon_seconds: int | None = None
+    ):
+        """
+        Create the canceller
+
+        :param redis: The Redis pool
+        :param daemon: The local daemon
+        :param abandon_seconds: Cancel jobs that go this long without being polled. None to never reap jobs.
+
+        """
+
+        self._redis: Redis = redis
+        self._daemon: Daemon = daemon
+        self._abandon_seconds: int | None = abandon_seconds
+        self._tasks: List[asyncio.Task] = []
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    def start(self) -> None:
+        """Start listening for cancellations & reaping abandoned jobs"""
+        self._tasks = [asyncio.create_task(self._listen())]
+
+        if self._abandon_seconds:
+            self._tasks.append(asyncio.create_task(self._reap()))
+
+    async def stop(self) -> None:
+        """Stop listening & reaping"""
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def cancel(self, job_id: str, reason: str) -> JobData | None:
+        """
+        Cancel a job
+
+        :param job_id: The ID of the job
+        :param reason: Why the job was cancelled
+        :return: The job data, unchanged if the job had already finished. None if it doesn't exist.
+
+        """
+
+        job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis, include_response=False)
+
+        if job_data is None or job_data.finished or job_data.cancelled:
+            return job_data
+
+        # Stored so jobs still waiting in the job stream are dropped when consumed
+        job_data.cancelled = True
+        job_data.cancel_reason = reason
+        await job_data.update('cancelled', 'cancel_reason', event=JobEventType.CANCELLED)
+
+        # Any process may be running it
+        await self._redis.publish(self.CHANNEL, json.dumps({"job_id": job_id, "reason": reason}))
+        return job_data
+
+    async def touch(self, *job_ids: str) -> None:
+        """Record that the clients of jobs are still interested in them"""
+
+        if not self._abandon_seconds or not job_ids:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.set(self._create_polled_key(job_id=job_id), 1, ex=self._abandon_seconds)
+
+            await pipe.execute()
+
+    async def _listen(self) -> None:
+        """Cancel jobs held by the local daemon as cancellations are broadcast"""
+
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+
+                        cancellation: dict = json.loads(message["data"])
+
+                        if self._daemon.cancel(job_id=cancellation["job_id"], reason=cancellation["reason"]):
+                            self._logger.info(self._logger_prefix + f"Cancelled job \"{cancellation['job_id']}\": {cancellation['reason']}")
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception:
+                self._logger.error(self._logger_prefix + "Job cancellation listener encountered an error.", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _reap(self) -> None:
+        """Periodically cancel local jobs nobody has polled recently"""
+
+        while True:
+            try:
+                await asyncio.sleep(min(self._abandon_seconds / 4, 60))
+                job_ids: List[str] = self._daemon.job_ids
+
+                if not job_ids:
+                    continue
+
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for job_id in job_ids:
+                        pipe.exists(self._create_polled_key(job_id=job_id))
+
+                    polled: List[int] = await pipe.execute()
+
+                for job_id, was_polled in zip(job_ids, polled):
+                    if was_polled:
+                        continue
+
+                    await self.cancel(job_id=job_id, reason=f"The job was not polled for {self._abandon_seconds} seconds.")
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception:
+                self._logger.error(self._logger_prefix + "Job reaper encountered an error.", exc_info=True)
+
+    @classmethod
+    def _create_polled_key(cls, job_id: str) -> str:
+        """Get the redis Key marking a job as recently polled"""
+        return f"criaparse:job:{job_id}:polled"
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any
+
+
+class CheckpointStore:
+    """
+    Local store for the intermediate outputs of a job, keyed by job ID.
+
+    When a job is interrupted (e.g. its process is restarted during a rolling deploy) & is reclaimed from the
+    job stream, its parser resumes from the last checkpoint instead of starting over. Point the directory
+    at a volume shared between pods for jobs to resume on a different host.
+
+    """
+
+    def __init__(self, directory: str, max_age_seconds: int = 60 * 60 * 24):
+        """
+        Create the checkpoint store
+
+        :param directory: The directory checkpoints are written to
+        :param max_age_seconds: Checkpoints untouched for this long are pruned on start
+
+        """
+
+        self._directory: str = directory
+        self._max_age_seconds: int = max_age_seconds
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    def start(self) -> None:
+        """Create the directory & prune checkpoints of jobs that were never resumed"""
+
+        os.makedirs(self._directory, exist_ok=True)
+        cutoff: float = time.time() - self._max_age_seconds
+
+        for job_id in os.listdir(self._directory):
+            job_directory: str = os.path.join(self._directory, job_id)
+
+            if os.path.getmtime(job_directory) < cutoff:
+                shutil.rmtree(job_directory, ignore_errors=True)
+
+    async def save(self, job_id: str, name: str, data: Any) -> None:
+        """
+        Save a checkpoint
+
+        :param job_id: The ID of the job
+        :param name: The name of the checkpoint
+        :param data: JSON-serializable checkpoint data
+
+        """
+
+        # A missing checkpoint only costs a restart, so never fail the job over one
+        try:
+            await asyncio.to_thread(self._save, job_id, name, data)
+        except (OSError, TypeError, ValueError):
+            self._logger.warning(self._logger_prefix + f"Failed to save checkpoint \"{name}\" of job \"{job_id}\".", exc_info=True)
+
+    async def load(self, job_id: str, name: str) -> Any | None:
+        """
+        Load a checkpoint
+
+        :param job_id: The ID of the job
+        :param name: The name of the checkpoint
+        :return: The checkpoint data, or None if there is no checkpoint
+
+        """
+
+        return await asyncio.to_thread(self._load, job_id, name)
+
+    async def delete(self, job_id: str) -> None:
+        """Delete every checkpoint of a job"""
+        await asyncio.to_thread(shutil.rmtree, self._create_path(job_id=job_id), True)
+
+    def _save(self, job_id: str, name: str, data: Any) -> None:
+        path: str = self._create_path(job_id=job_id, name=name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Written to a temporary file first so an interrupted write never leaves a partial checkpoint
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+
+        os.replace(path + ".tmp", path)
+
+    def _load(self, job_id: str, name: str) -> Any | None:
+        try:
+            with open(self._create_path(job_id=job_id, name=name)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _create_path(self, job_id: str, name: str | None = None) -> str:
+        """Get the path to a job's checkpoint directory, or to one of its checkpoints"""
+
+        # Job IDs come from the job stream, so never let one escape the directory
+        job_directory: str = os.path.join(self._directory, os.path.basename(job_id))
+        return os.path.join(job_directory, f"{name}.json") if name is not None else job_directory
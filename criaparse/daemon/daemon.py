@@ -1,4 +1,8 @@
+import asyncio
+
+from criaparse.daemon.admission import ThroughputMeter
 from criaparse.daemon.job import Job
+from criaparse.daemon.scheduling import JobQueue
 from criaparse.daemon.worker import Worker
 
 
@@ -7,10 +11,29 @@ class Daemon:
 
     def __init__(
             self,
-            workers: int
+            workers: int,
+            concurrency: dict[str, int] | None = None,
+            aging_factor: float = 1.0
     ):
+        """
+        Create the daemon
+
+        :param workers: The # of workers
+        :param concurrency: Map<Strategy, Limit> of how many jobs of each strategy a worker may run at once
+        :param aging_factor: Seconds a job waits per estimated second of work before it goes ahead of smaller jobs
+
+        """
+
+        # Jobs wait in one shared queue, shortest first, & are taken by whichever worker frees up first
+        self._queue: JobQueue = JobQueue(aging_factor=aging_factor)
+
         # Create workers
-        self._workers: list[Worker] = [Worker(worker_id=idx + 1) for idx in range(workers)]
+        self._workers: list[Worker] = [Worker(worker_id=idx + 1, queue=self._queue, concurrency=concurrency) for idx in range(workers)]
+
+        # Queued & running jobs by ID, & how fast they are being completed
+        self._jobs: dict[str, Job] = {}
+        self._backlog_tasks: set[asyncio.Task] = set()
+        self._throughput: ThroughputMeter = ThroughputMeter()
 
     def start(self) -> None:
         """Start the daemon"""
@@ -22,10 +45,61 @@ class Daemon:
         for worker in self._workers:
             await worker.stop()
 
+        for task in self._backlog_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._backlog_tasks, return_exceptions=True)
+
+    @property
+    def queued(self) -> int:
+        """Check the # of jobs waiting for a worker"""
+        return self._queue.qsize()
+
+    @property
+    def backlog(self) -> tuple[int, int]:
+        """Check the # of queued & running jobs, and the total size of their files"""
+        return len(self._jobs), sum(job.file.size for job in self._jobs.values())
+
+    @property
+    def job_ids(self) -> list[str]:
+        """The IDs of queued & running jobs"""
+        return list(self._jobs.keys())
+
+    @property
+    def throughput(self) -> tuple[float, float]:
+        """Check the recent jobs & bytes completed per second"""
+        return self._throughput.rate()
+
     async def queue(self, job: Job) -> Job:
-        """Add to the worker with the least amount of jobs queued"""
+        """Add to the shared queue, ordered by estimated cost & priority"""
+
+        # Placed by its cost once it's queued, so scan the file for it first
+        await job.estimate_cost()
+        self._jobs[job.data.job_id] = job
 
-        # Find the worker with the least amount of jobs
-        worker = min(self._workers, key=lambda w: w.queued)
-        await worker.queue(job=job)
+        task: asyncio.Task = asyncio.create_task(self._track(job=job))
+        self._backlog_tasks.add(task)
+        task.add_done_callback(self._backlog_tasks.discard)
+
+        await self._queue.put(job)
         return job
+
+    async def _track(self, job: Job) -> None:
+        """Remove a job from the backlog once a worker is done with it"""
+
+        await job.wait()
+        self._jobs.pop(job.data.job_id, None)
+        self._throughput.record(size=job.file.size)
+
+    def cancel(self, job_id: str, reason: str) -> bool:
+        """
+        Cancel a queued or running job held by this daemon
+
+        :param job_id: The ID of the job
+        :param reason: Why the job was cancelled
+        :return: Whether the job was found & cancelled
+
+        """
+
+        job: Job | None = self._jobs.get(job_id)
+        return job.cancel(reason=reason) if job is not None else False
@@ -0,0 +1,129 @@
+import enum
+import json
+import threading
+from typing import Any
+
+import msgpack
+import orjson
+import zstandard
+
+# Prefixes every binary record. Never the first byte of a JSON record, so legacy records are told apart.
+MAGIC: bytes = b"\x00CP"
+
+
+class RecordEncoding(str, enum.Enum):
+    """How records are written to Redis. Both are always readable."""
+
+    # The default, read by every version. Keep writing it until every process can read MSGPACK, then switch.
+    JSON = "json"
+
+    # Version 1 of the binary encoding: msgpack, compressed with zstd
+    MSGPACK = "msgpack"
+
+
+MSGPACK_ZSTD_VERSION: int = 1
+ZSTD_LEVEL: int = 3
+
+# zstd contexts can't be shared between threads, but are worth reusing
+_local: threading.local = threading.local()
+
+# Set once per process on start
+_encoding: RecordEncoding = RecordEncoding.JSON
+
+
+def configure_record_encoding(encoding: RecordEncoding) -> None:
+    """
+    Configure how the current process writes records
+
+    :param encoding: The encoding
+
+    """
+
+    global _encoding
+    _encoding = encoding
+
+
+def encode_record(record: dict[str, Any]) -> bytes:
+    """
+    Encode a record for Redis
+
+    :param record: A JSON-compatible record (e.g. model_dump(mode="json"))
+    :return: The encoded record
+
+    """
+
+    if _encoding == RecordEncoding.JSON:
+        return json.dumps(record, separators=(",", ":")).encode()
+
+    return MAGIC + bytes([MSGPACK_ZSTD_VERSION]) + _compressor().compress(msgpack.packb(record))
+
+
+def decode_record(data: bytes | str) -> dict[str, Any]:
+    """
+    Decode a record from Redis, in whichever encoding it was written
+
+    :param data: The encoded record
+    :return: The record
+    :raises ValueError: If the record was written by a newer version
+
+    """
+
+    if isinstance(data, str) or not data.startswith(MAGIC):
+        return json.loads(data)
+
+    version: int = data[len(MAGIC)]
+
+    if version != MSGPACK_ZSTD_VERSION:
+        raise ValueError(f"Unsupported record encoding version {version}.")
+
+    return msgpack.unpackb(_decompressor().decompress(data[len(MAGIC) + 1:]))
+
+
+def record_to_json(data: bytes) -> bytes:
+    """
+    Get a record from Redis as JSON, without building any models
+
+    :param data: The encoded record
+    :return: The record as JSON. JSON records are returned as they are.
+
+    """
+
+    if not data.startswith(MAGIC):
+        return data
+
+    return orjson.dumps(decode_record(data))
+
+
+def record_to_msgpack(data: bytes) -> bytes:
+    """
+    Get a record from Redis as msgpack, without building any models
+
+    :param data: The encoded record
+    :return: The record as msgpack. Binary records are only decompressed.
+
+    """
+
+    if not data.startswith(MAGIC):
+        return msgpack.packb(orjson.loads(data))
+
+    version: int = data[len(MAGIC)]
+
+    if version != MSGPACK_ZSTD_VERSION:
+        raise ValueError(f"Unsupported record encoding version {version}.")
+
+    return _decompressor().decompress(data[len(MAGIC) + 1:])
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    if not hasattr(_local, "compressor"):
+        # Content size is written to the frame, so decompression allocates its output once
+        _local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, write_content_size=True)
+
+    return _local.compressor
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+
+    return _local.decompressor
@@ -0,0 +1,127 @@
+import asyncio
+import enum
+import functools
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, TypeVar, Any, Tuple, BinaryIO
+
+from criaparse.cache.artifact import source_digest
+
+ConverterResult = TypeVar("ConverterResult")
+
+
+class ExecutorMode(str, enum.Enum):
+    """Where CPU-bound document converters are executed"""
+
+    INLINE = "INLINE"  # On the event loop (legacy behaviour)
+    THREAD = "THREAD"  # In the event loop's default thread pool
+    PROCESS = "PROCESS"  # In a pool of worker processes
+
+
+def _run_converter(converter: Callable[[BinaryIO], ConverterResult], source: bytes | str, sha256: str | None = None) -> ConverterResult:
+    """
+    Run a converter against a file. This is the entrypoint inside pool processes,
+    so the buffer is rebuilt on that side rather than pickling a file object.
+
+    :param converter: Module-level converter function taking a file buffer
+    :param source: The raw bytes of the file, or the path it was spooled to
+    :param sha256: The SHA-256 hex digest of the file, if known, for converters to key cached artifacts by
+    :return: Whatever the converter returns
+
+    """
+
+    with source_digest(sha256=sha256):
+        if isinstance(source, str):
+            with open(source, "rb") as fp:
+                return converter(fp)
+
+        return converter(io.BytesIO(source))
+
+
+class ConverterExecutor:
+    """Runs CPU-bound converters (python-docx, mammoth, BeautifulSoup, pandas) off the event loop"""
+
+    def __init__(
+            self,
+            mode: ExecutorMode = ExecutorMode.INLINE,
+            processes: int = 1,
+            initializer: Callable[..., None] | None = None,
+            initargs: Tuple[Any, ...] = ()
+    ):
+        """
+        Create the executor
+
+        :param mode: Where converters are executed
+        :param processes: The # of pool processes, in PROCESS mode
+        :param initializer: Called with `initargs` in every process converters run in, e.g. to configure caches
+
+        """
+
+        self._mode: ExecutorMode = mode
+        self._processes: int = max(processes, 1)
+        self._pool: ProcessPoolExecutor | None = None
+        self._initializer: Callable[..., None] | None = initializer
+        self._initargs: Tuple[Any, ...] = initargs
+
+    @property
+    def mode(self) -> ExecutorMode:
+        """The execution mode"""
+        return self._mode
+
+    def start(self) -> None:
+        """Start the process pool (if enabled)"""
+
+        if self._pool is not None:
+            return
+
+        # Inline & threaded converters share this process
+        if self._mode != ExecutorMode.PROCESS:
+            if self._initializer is not None:
+                self._initializer(*self._initargs)
+            return
+
+        # Spawn rather than fork, as the parent has a running event loop & open Redis sockets
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self._initializer,
+            initargs=self._initargs
+        )
+
+    def stop(self) -> None:
+        """Stop the process pool & cancel pending conversions"""
+
+        if self._pool is None:
+            return
+
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    async def run(
+            self,
+            converter: Callable[[BinaryIO], ConverterResult],
+            source: bytes | str,
+            sha256: str | None = None
+    ) -> ConverterResult:
+        """
+        Run a converter with the configured execution mode
+
+        :param converter: A module-level (picklable) converter function taking a file buffer
+        :param source: The raw bytes of the file to convert, or the path it was spooled to. Paths are opened where the converter runs.
+        :param sha256: The SHA-256 hex digest of the file, if known
+        :return: The converter output
+
+        """
+
+        if self._mode == ExecutorMode.INLINE:
+            return _run_converter(converter, source, sha256)
+
+        # The pool is lazily started for parsers used outside the CriaParse lifecycle
+        if self._mode == ExecutorMode.PROCESS:
+            self.start()
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool,  # None => default thread pool
+            functools.partial(_run_converter, converter, source, sha256)
+        )
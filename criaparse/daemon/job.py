@@ -1,46 +1,95 @@
 from __future__ import annotations
 
 import asyncio
+import enum
 import json
+import logging
 import time
 import uuid
-from typing import TYPE_CHECKING, Awaitable, Dict
+from typing import TYPE_CHECKING, Dict, Any, Callable, Awaitable, List, Set, ClassVar
 
 from CriadexSDK import CriadexSDK
 from CriadexSDK.routers.models.azure import ModelAboutRoute
-from fastapi import UploadFile
+import msgpack
+import orjson
 from pydantic import BaseModel, PrivateAttr, Field
-from redis import Redis
+from redis import Redis, ResponseError
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
 
-from criaparse.models import ParserResponse, ParserFile
+from criaparse.daemon.encoding import encode_record, decode_record, record_to_json, record_to_msgpack
+from criaparse.daemon.scheduling import estimate_cost
+from criaparse.models import ParserResponse, ParserFile, Element
 
 if TYPE_CHECKING:
     from criaparse.parser import Parser
 
+ResponseCallback = Callable[[ParserResponse], Awaitable[None]]
+FailureCallback = Callable[[], Awaitable[None]]
+
+
+class JobCancelledError(RuntimeError):
+    """
+    Thrown when a job stops because it was cancelled or ran past its deadline
+
+    """
+
 
 class Job:
     """A parsing job to be processed by the job queue"""
 
+    # Progress updates closer together than this are coalesced into one write
+    PROGRESS_INTERVAL_SECONDS: float = 0.5
+
     def __init__(
             self,
             job_data: JobData,
+            parser: "Parser",
+            file: ParserFile,
+            options: Dict[str, Any],
+            priority: int = 0,
+            deadline: float | None = None,
+            **kwargs
     ):
         """Create a Job instance"""
 
-        # The future
-        self._future: asyncio.Task | None = None
-
         # The Redis data model
         self._data: JobData = job_data
 
+        # What to parse & how
+        self._parser: "Parser" = parser
+        self._file: ParserFile = file
+        self._options: Dict[str, Any] = options
+        self._kwargs: Dict[str, Any] = kwargs
+
+        # Scheduling hints
+        self._priority: int = priority
+        self._cost: float | None = None
+
+        # Set once a worker is done with the job, successful or not
+        self._completed: asyncio.Event = asyncio.Event()
+
+        # The running parse, so it can be cancelled
+        self._task: asyncio.Task | None = None
+        self._response_callbacks: List[ResponseCallback] = []
+        self._failure_callbacks: List[FailureCallback] = []
+        self._data.deadline = deadline
+
+        # Progress fields changed since they were last written, & the pending write of them
+        self._dirty: Set[str] = set()
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        self._flushed_at: float = 0
+
     @classmethod
     async def create(
             cls,
             parser: "Parser",
-            file: UploadFile,
+            file: ParserFile,
             criadex: CriadexSDK,
             redis: Redis,
+            job_id: str | None = None,
+            model_info: Dict[str, Any] | None = None,
             **kwargs
     ) -> Job:
         """
@@ -50,6 +99,8 @@ class Job:
         :param file: The file to parse
         :param criadex: The Criadex SDK
         :param redis: The Redis pool
+        :param job_id: Re-use an existing job ID (e.g. a job consumed from the job stream)
+        :param model_info: Model info already resolved with `resolve_model_info` (e.g. once for a whole batch)
         :param kwargs: kwargs
         :return: An instance of the Job class
 
@@ -61,54 +112,282 @@ class Job:
             steps=parser.step_count(**kwargs),  # Number of steps may depend on kwarg config
             step_name=None,
             strategy=parser.name(),
+            file_sha256=file.sha256,
 
             # Private attrs
             _redis=redis
         )
 
-        # Create Job
-        job: "Job" = cls(job_data=job_data)
+        if job_id is not None:
+            job_data.job_id = job_id
+
+        # The options as requested, before model IDs are resolved
+        options: Dict[str, Any] = dict(kwargs)
 
         # Get the model information dynamically
         if kwargs['llm_model_id'] and kwargs['embedding_model_id']:
             llm_model_id = kwargs.pop('llm_model_id')
             embedding_model_id = kwargs.pop('embedding_model_id')
 
-            # Get the model info from Criadex
-            llm_model_info: ModelAboutRoute.Response = await criadex.models.azure.about(model_id=llm_model_id)
-            embedding_model_info: ModelAboutRoute.Response = await criadex.models.azure.about(model_id=embedding_model_id)
+            if model_info is None:
+                model_info = await cls.resolve_model_info(criadex=criadex, llm_model_id=llm_model_id, embedding_model_id=embedding_model_id)
 
-            kwargs['llm_model_info'] = llm_model_info
-            kwargs['embedding_model_info'] = embedding_model_info
+            kwargs.update(model_info)
 
-        # Convert the file here to prevent io stream closing by FastAPI
-        parser_file = await ParserFile.from_upload_file(upload_file=file)
+        # Create the Job & store its initial state
+        job: "Job" = cls(job_data=job_data, parser=parser, file=file, options=options, **kwargs)
+        await job.data.upsert()
 
-        # Start the job & return the Job instance
-        return await job.start(
-            parser.parse(
-                file=parser_file,
-                job=job,
-                **kwargs
-            )
+        return job
+
+    @classmethod
+    async def resolve_model_info(
+            cls,
+            criadex: CriadexSDK,
+            llm_model_id: int,
+            embedding_model_id: int
+    ) -> Dict[str, Any]:
+        """
+        Get the model info from Criadex
+
+        :param criadex: The Criadex SDK
+        :param llm_model_id: The ID of the LLM model
+        :param embedding_model_id: The ID of the embedding model
+        :return: The parser kwargs holding the model info
+
+        """
+
+        llm_model_info: ModelAboutRoute.Response = await criadex.models.azure.about(model_id=llm_model_id)
+        embedding_model_info: ModelAboutRoute.Response = await criadex.models.azure.about(model_id=embedding_model_id)
+
+        return {
+            'llm_model_info': llm_model_info,
+            'embedding_model_info': embedding_model_info
+        }
+
+    @classmethod
+    async def create_finished(
+            cls,
+            parser: "Parser",
+            file: ParserFile,
+            redis: Redis,
+            response: ParserResponse,
+            **kwargs
+    ) -> Job:
+        """
+        Create a job that is already finished, e.g. with a cached response
+
+        :param parser: The parser that would have been used
+        :param file: The file
+        :param redis: The Redis pool
+        :param response: The response
+        :param kwargs: kwargs
+        :return: An instance of the Job class
+
+        """
+
+        job_data: JobData = JobData(
+            step=None,
+            steps=parser.step_count(**kwargs),
+            step_name=None,
+            strategy=parser.name(),
+            finished=True,
+            response=response,
+            file_sha256=file.sha256,
+            _redis=redis
         )
 
-    @property
-    def future(self) -> Awaitable[ParserResponse] | None:
-        """The future representing the Job completion """
-        return self._future
+        job: "Job" = cls(job_data=job_data, parser=parser, file=file, options=dict(kwargs), **kwargs)
+        job.set_completed()
+        await job.data.upsert()
+
+        return job
+
+    async def run(self) -> ParserResponse:
+        """
+        Parse the file
+
+        :raises JobCancelledError: If the job is cancelled or runs past its deadline
+
+        """
+
+        try:
+            # The job may have been cancelled or expired while it was queued
+            self.check_cancelled()
+
+            self._task = asyncio.create_task(self._parser.parse(
+                file=self._file,
+                job=self,
+                **self._kwargs
+            ))
+
+            return await self._task
+
+        except asyncio.CancelledError:
+            # Only the parse was cancelled, not whoever is running the job
+            if not self._data.cancelled or asyncio.current_task().cancelling():
+                raise
+
+            await self._set_cancelled()
+            raise JobCancelledError(self._data.cancel_reason)
+
+        except JobCancelledError:
+            await self._set_cancelled()
+            raise
 
-    async def start(self, future: Awaitable[ParserResponse]) -> Job:
-        """Set the future for the job"""
-        self._future = future
-        await self._data.upsert()
-        return self
+        finally:
+            self._task = None
+
+    def cancel(self, reason: str) -> bool:
+        """
+        Cancel the job. A running parse is stopped at its next await, which aborts in-flight Azure calls.
+
+        :param reason: Why the job was cancelled
+        :return: Whether the job could still be cancelled
+
+        """
+
+        if self._data.finished or self._data.cancelled:
+            return False
+
+        self._data.cancelled = True
+        self._data.cancel_reason = reason
+
+        if self._task is not None:
+            self._task.cancel()
+
+        return True
+
+    def check_cancelled(self) -> None:
+        """
+        Stop the job if it was cancelled or is past its deadline
+
+        :raises JobCancelledError: If the job should stop
+
+        """
+
+        # Called from within the parse, so the flag is set without cancelling the task
+        if not self._data.cancelled and self._data.deadline is not None and time.time() > self._data.deadline:
+            self._data.cancelled = True
+            self._data.cancel_reason = "The job did not finish before its deadline."
+
+        if self._data.cancelled:
+            raise JobCancelledError(self._data.cancel_reason)
+
+    async def _set_cancelled(self) -> None:
+        """Store the job as finished without a response"""
+
+        self._data.finished = True
+        await self._write_final(event=JobEventType.CANCELLED)
+
+    def _update_progress(self, *fields: str) -> None:
+        """
+        Write changed progress fields, coalescing updates less than PROGRESS_INTERVAL_SECONDS apart
+
+        :param fields: The names of the changed fields
+
+        """
+
+        self._dirty.update(fields)
+
+        if self._flush_task is None:
+            delay: float = max(0.0, self._flushed_at + self.PROGRESS_INTERVAL_SECONDS - time.monotonic())
+            self._flush_task = asyncio.create_task(self._flush_progress(delay=delay))
+
+    async def _flush_progress(self, delay: float) -> None:
+        """Write the changed progress fields after a delay, notifying anyone streaming the job of the latest step"""
+
+        await asyncio.sleep(delay)
+
+        # Past here the write can't be cancelled, so a final write waits for it instead
+        self._flush_task = None
+
+        async with self._flush_lock:
+            fields, self._dirty = self._dirty, set()
+            self._flushed_at = time.monotonic()
+
+            # Nothing awaits the write, & a missed progress update must never fail the job
+            try:
+                await self._data.update(*fields, event=JobEventType.STEP)
+            except Exception:
+                logging.getLogger('uvicorn.info').warning(f"[CriaParse] Failed to write the progress of job \"{self._data.job_id}\".", exc_info=True)
+
+    async def _write_final(self, event: JobEventType) -> None:
+        """Write the whole job, superseding any pending progress write"""
+
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        async with self._flush_lock:
+            self._dirty.clear()
+            await self._data.upsert(event=event)
 
     @property
     def data(self) -> JobData:
         """Redis model for the ob"""
         return self._data
 
+    @property
+    def file(self) -> ParserFile:
+        """The file being parsed"""
+        return self._file
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """The (serializable) options the job was requested with"""
+        return self._options
+
+    @property
+    def priority(self) -> int:
+        """The client-supplied priority. Higher goes first."""
+        return self._priority
+
+    @property
+    def cost(self) -> float:
+        """The estimated cost of the job, in seconds. From the size of its file alone until `estimate_cost` has scanned it."""
+
+        if self._cost is None:
+            return estimate_cost(file=self._file, strategy=self._data.strategy, scan=False)
+
+        return self._cost
+
+    async def estimate_cost(self) -> float:
+        """
+        Estimate the cost of the job from a pre-scan of its file, off the event loop since it reads the whole file
+
+        :return: The estimated cost, in seconds
+
+        """
+
+        if self._cost is None:
+            self._cost = await asyncio.to_thread(estimate_cost, self._file, self._data.strategy)
+
+        return self._cost
+
+    def add_response_callback(self, callback: ResponseCallback) -> None:
+        """Call back with the response once the job has one"""
+        self._response_callbacks.append(callback)
+
+    def add_failure_callback(self, callback: FailureCallback) -> None:
+        """Call back once the job has stopped without a response, e.g. it raised or was cancelled"""
+        self._failure_callbacks.append(callback)
+
+    async def set_failed(self) -> None:
+        """Mark the job as stopped without a response"""
+
+        for callback in self._failure_callbacks:
+            await callback()
+
+    def set_completed(self) -> None:
+        """Mark the job as done by a worker, whether it succeeded or not"""
+        self._file.close()
+        self._completed.set()
+
+    async def wait(self) -> None:
+        """Wait until a worker is done with the job"""
+        await self._completed.wait()
+
     async def set_steps(
             self,
             steps: dict[int, str]
@@ -122,7 +401,7 @@ class Job:
                 timestamp_completed=None
             )
 
-        await self._data.upsert()
+        self._update_progress('step_timings')
 
     async def set_step_finished(
             self,
@@ -149,8 +428,26 @@ class Job:
         self._data.step = step_number
         self._data.step_name = step_name
 
-        # Update the JobData model
-        await self._data.upsert()
+        # Update the JobData model & notify anyone streaming the job
+        self._update_progress('step_timings', 'step', 'step_name')
+
+        # Deadlines are enforced between steps
+        self.check_cancelled()
+
+    async def emit_elements(self, elements: List[Element]) -> None:
+        """
+        Stream the elements finalized so far, before the job has its response
+
+        :param elements: Every element finalized so far, in order. Must be a prefix of the response's elements.
+            Those already streamed, including by an earlier run of a reclaimed job, are skipped.
+            Nothing is stored unless the job was queued with `stream_elements`.
+
+        """
+
+        if not self._options.get('stream_elements'):
+            return
+
+        await self._data.append_elements(elements=elements)
 
     async def set_response(
             self,
@@ -165,7 +462,10 @@ class Job:
         self._data.finished = True
         self._data.response = response
 
-        await self._data.upsert()
+        await self._write_final(event=JobEventType.FINISHED)
+
+        for callback in self._response_callbacks:
+            await callback(response)
 
 
 class JobDataTiming(BaseModel):
@@ -179,9 +479,79 @@ class JobDataTiming(BaseModel):
     timestamp_completed: float | None
 
 
+class JobEventType(str, enum.Enum):
+    """What changed about a job"""
+
+    # The current state of the job when a stream is opened
+    STATUS = "status"
+
+    STEP = "step"
+    ELEMENTS = "elements"
+    FINISHED = "finished"
+    CANCELLED = "cancelled"
+
+
+class JobEvent(BaseModel):
+    """
+    A change to a job, published to the clients streaming it. Omits the response, which is only fetched once.
+
+    """
+
+    event: JobEventType
+    job_id: str
+    step: int | None
+    step_name: str | None
+    steps: int
+    finished: bool
+    cancelled: bool
+    cancel_reason: str | None = None
+
+    @classmethod
+    def from_job_data(cls, job_data: JobData, event: JobEventType) -> JobEvent:
+        """Create the event from the job's current data"""
+        return cls(event=event, **job_data.dict(include={'job_id', 'step', 'step_name', 'steps', 'finished', 'cancelled', 'cancel_reason'}))
+
+
+class SerializedJobData(BaseModel):
+    """
+    Job data as stored, with the fields needed to describe it. Rendered as JSON or msgpack without building any models.
+
+    """
+
+    job_id: str
+    finished: bool
+    cancelled: bool
+    cancel_reason: str | None
+
+    # Map<Field, JSON-encoded value> of everything but the response
+    progress: Dict[str, bytes]
+
+    # The response as an encoded record, or None if there is none
+    result: bytes | None = None
+
+    def to_json(self) -> bytes:
+        """Render the job data as JSON"""
+
+        fields: List[bytes] = [json.dumps(key).encode() + b":" + value for key, value in self.progress.items()]
+        result: bytes = record_to_json(self.result) if self.result else b"null"
+
+        return b"{" + b",".join(fields + [b'"response":' + result]) + b"}"
+
+    def to_msgpack(self) -> bytes:
+        """Render the job data as msgpack"""
+
+        fields: List[bytes] = [msgpack.packb(key) + msgpack.packb(orjson.loads(value)) for key, value in self.progress.items()]
+        result: bytes = record_to_msgpack(self.result) if self.result else msgpack.packb(None)
+
+        return msgpack.Packer().pack_map_header(len(fields) + 1) + b"".join(fields + [msgpack.packb("response") + result])
+
+
 class JobData(BaseModel):
     """
-    A job to be processed by the job queue
+    A job to be processed by the job queue.
+
+    Progress is kept in a Redis hash, one JSON-encoded field per attribute, so updates only write what changed.
+    The response is kept under a separate key, so reading progress never loads it.
 
     """
 
@@ -212,26 +582,251 @@ class JobData(BaseModel):
     # Whether finished
     finished: bool = False
 
+    # Whether cancelled (also finished once the job has stopped) & why
+    cancelled: bool = False
+    cancel_reason: str | None = None
+
+    # Unix time after which the job is cancelled
+    deadline: float | None = None
+
+    # The SHA-256 hex digest of the file, hashed as it was uploaded
+    file_sha256: str | None = None
+
+    # Reads a job & deletes it if it's finished, atomically, so its response is only ever returned once
+    POP_SCRIPT: ClassVar[str] = """
+        if redis.call('TYPE', KEYS[1]).ok == 'string' then
+            return {'legacy'}
+        end
+
+        local progress = redis.call('HGETALL', KEYS[1])
+
+        if #progress == 0 then
+            return {'missing'}
+        end
+
+        local result = false
+
+        if redis.call('HGET', KEYS[1], 'finished') == 'true' then
+            result = redis.call('GET', KEYS[2])
+            redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+        end
+
+        return {'job', progress, result}
+    """
+
+    # Everything but the response, which is stored separately
+    PROGRESS_FIELDS: ClassVar[tuple[str, ...]] = (
+        'job_id', 'step', 'step_name', 'steps', 'strategy', 'step_timings', 'finished', 'cancelled', 'cancel_reason', 'deadline', 'file_sha256'
+    )
+
     def __init__(self, _redis: Redis, **kwargs):
         """Create a JobData instance"""
         super().__init__(**kwargs)
         self._redis = _redis
 
-    async def upsert(self) -> None:
-        """Upsert the job data. Expires after 1 hour."""
-        await self._redis.set(self._create_key(self.job_id), self.json(), ex=(60 * 60))
+    async def upsert(self, event: JobEventType | None = None) -> None:
+        """
+        Upsert the job data, including the response if it has one. Expires after 1 hour.
+
+        :param event: Also publish this event to the clients streaming the job, in the same round trip
+
+        """
+
+        # A transaction, so the job is never seen missing between the delete & the write
+        async with self._redis.pipeline(transaction=True) as pipe:
+            # Replaces records written as one string before progress was split out
+            pipe.delete(self._create_key(self.job_id))
+            self._write_fields(pipe, *self.PROGRESS_FIELDS)
+
+            if self.response is not None:
+                pipe.set(self.create_result_key(self.job_id), encode_record(self.response.model_dump(mode="json")), ex=(60 * 60))
+
+            if event is not None:
+                pipe.publish(self.create_channel(self.job_id), JobEvent.from_job_data(job_data=self, event=event).json())
+
+            await pipe.execute()
+
+    async def update(self, *fields: str, event: JobEventType | None = None) -> None:
+        """
+        Write only some progress fields, leaving the rest (e.g. set by another process) as they are
+
+        :param fields: The names of the fields
+        :param event: Also publish this event to the clients streaming the job, in the same round trip
+
+        """
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                self._write_fields(pipe, *fields)
+
+                if event is not None:
+                    pipe.publish(self.create_channel(self.job_id), JobEvent.from_job_data(job_data=self, event=event).json())
+
+                await pipe.execute()
+        except ResponseError:
+            # Written as one string before progress was split out, so it can only be replaced whole
+            await self.upsert(event=event)
+
+    def _write_fields(self, pipe: Pipeline, *fields: str) -> None:
+        """Queue the writes of progress fields on a pipeline"""
+
+        if fields:
+            values: Dict[str, Any] = self.model_dump(mode="json", include=set(fields))
+            pipe.hset(self._create_key(self.job_id), mapping={field: json.dumps(value) for field, value in values.items()})
+
+        pipe.expire(self._create_key(self.job_id), 60 * 60)
 
     async def delete(self) -> None:
-        """Delete the job data from redis"""
-        await self._redis.delete(self._create_key(job_id=self.job_id))
+        """Delete the job data, its response & its streamed elements from redis"""
+        await self._redis.delete(
+            self._create_key(job_id=self.job_id),
+            self.create_result_key(job_id=self.job_id),
+            self.create_elements_key(job_id=self.job_id)
+        )
+
+    async def append_elements(self, elements: List[Element]) -> None:
+        """
+        Append the elements not yet streamed & notify anyone streaming the job. Expires with the job data.
+
+        :param elements: Every element finalized so far, in order
+
+        """
+
+        key: str = self.create_elements_key(job_id=self.job_id)
+        new_elements: List[Element] = elements[await self._redis.llen(key):]
+
+        if not new_elements:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, *[element.json() for element in new_elements])
+            pipe.expire(key, 60 * 60)
+            pipe.publish(self.create_channel(self.job_id), JobEvent.from_job_data(job_data=self, event=JobEventType.ELEMENTS).json())
+            await pipe.execute()
+
+    @classmethod
+    async def from_redis(cls, job_id: str, redis: Redis, include_response: bool = True) -> JobData | None:
+        """
+        Load the job data from Redis
+
+        :param job_id: The ID of the job
+        :param redis: The Redis pool
+        :param include_response: Whether to load the response. Without it, only the progress hash is read.
+        :return: The job data, or None if it doesn't exist
+
+        """
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(cls._create_key(job_id=job_id))
+
+            if include_response:
+                pipe.get(cls.create_result_key(job_id=job_id))
+
+            try:
+                results: List[Any] = await pipe.execute()
+            except ResponseError:
+                # Written as one string before progress was split out
+                return await cls._from_legacy_redis(job_id=job_id, redis=redis, include_response=include_response)
+
+        if not results[0]:
+            return None
+
+        job_data: JobData = cls(**cls.decode_fields(results[0]), _redis=redis)
+
+        if include_response and results[1] is not None:
+            job_data.response = ParserResponse(**decode_record(results[1]))
+
+        return job_data
+
+    @classmethod
+    async def pop_serialized(cls, job_id: str, redis: Redis) -> SerializedJobData | None:
+        """
+        Get a job as JSON, deleting it if it's finished. The stored progress & response are spliced together without being parsed.
+
+        :param job_id: The ID of the job
+        :param redis: The Redis pool
+        :return: The serialized job data, or None if it doesn't exist
+
+        """
+
+        reply: List[Any] = await redis.eval(
+            cls.POP_SCRIPT, 3,
+            cls._create_key(job_id=job_id), cls.create_result_key(job_id=job_id), cls.create_elements_key(job_id=job_id)
+        )
+
+        kind: str = reply[0].decode() if isinstance(reply[0], bytes) else reply[0]
+
+        if kind == 'missing':
+            return None
+
+        if kind == 'legacy':
+            job_data: JobData | None = await cls.from_redis(job_id=job_id, redis=redis)
+
+            if job_data is not None and job_data.finished:
+                await job_data.delete()
+
+            return job_data.serialize() if job_data is not None else None
+
+        # HGETALL replies with a flat list of fields & values, each value already JSON
+        progress: Dict[str, bytes] = {key.decode(): value for key, value in zip(reply[1][::2], reply[1][1::2])}
+
+        return SerializedJobData(
+            job_id=job_id,
+            finished=json.loads(progress.get('finished', b'false')),
+            cancelled=json.loads(progress.get('cancelled', b'false')),
+            cancel_reason=json.loads(progress.get('cancel_reason', b'null')),
+            progress=progress,
+            result=reply[2] if len(reply) > 2 and reply[2] else None
+        )
+
+    def serialize(self) -> SerializedJobData:
+        """Serialize the job data"""
+        return SerializedJobData(
+            job_id=self.job_id,
+            finished=self.finished,
+            cancelled=self.cancelled,
+            cancel_reason=self.cancel_reason,
+            progress={field: orjson.dumps(value) for field, value in self.model_dump(mode="json", exclude={'response'}).items()},
+            result=self.response.model_dump_json().encode() if self.response is not None else None
+        )
 
     @classmethod
-    async def from_redis(cls, job_id: str, redis: Redis) -> JobData | None:
-        """Load the job data from Redis"""
-        data: str | None = await redis.get(cls._create_key(job_id=job_id))
-        return cls(**json.loads(data), _redis=redis) if data is not None else None
+    async def _from_legacy_redis(cls, job_id: str, redis: Redis, include_response: bool) -> JobData | None:
+        """Load job data written as one record"""
+
+        data: bytes | None = await redis.get(cls._create_key(job_id=job_id))
+
+        if data is None:
+            return None
+
+        record: Dict[str, Any] = decode_record(data)
+
+        if not include_response:
+            record.pop('response', None)
+
+        return cls(**record, _redis=redis)
+
+    @classmethod
+    def decode_fields(cls, fields: Dict[bytes | str, bytes | str]) -> Dict[str, Any]:
+        """Decode the fields of a progress hash"""
+        return {(key.decode() if isinstance(key, bytes) else key): json.loads(value) for key, value in fields.items()}
 
     @classmethod
     def _create_key(cls, job_id: str) -> str:
         """Get the redis Key for a job"""
         return f"criaparse:job:{job_id}"
+
+    @classmethod
+    def create_result_key(cls, job_id: str) -> str:
+        """Get the redis Key of a job's response"""
+        return f"criaparse:job:{job_id}:result"
+
+    @classmethod
+    def create_elements_key(cls, job_id: str) -> str:
+        """Get the redis Key of the list of a job's streamed elements, one JSON element per item"""
+        return f"criaparse:job:{job_id}:elements"
+
+    @classmethod
+    def create_channel(cls, job_id: str) -> str:
+        """Get the redis pub/sub channel a job's events are published to"""
+        return f"criaparse:job:{job_id}:events"
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import itertools
+import mmap
+import re
+import time
+import zipfile
+from asyncio import PriorityQueue
+from heapq import heappush, heappop
+from typing import TYPE_CHECKING, BinaryIO
+
+from criaparse.models import ParserFile, ParserStrategy
+
+if TYPE_CHECKING:
+    from criaparse.daemon.job import Job
+
+# Rough seconds of work per job, per MB, per page & per image. GENERIC is dominated by LLM captioning & embedding.
+BASE_SECONDS: dict[str, float] = {ParserStrategy.GENERIC: 30.0}
+SECONDS_PER_MB: dict[str, float] = {ParserStrategy.GENERIC: 10.0}
+SECONDS_PER_PAGE: dict[str, float] = {ParserStrategy.GENERIC: 2.0}
+SECONDS_PER_IMAGE: dict[str, float] = {ParserStrategy.GENERIC: 6.0}
+
+# Fallbacks for the DOCX converters, which only scale with size
+DEFAULT_BASE_SECONDS: float = 1.0
+DEFAULT_SECONDS_PER_MB: float = 2.0
+
+# How far ahead one point of client-supplied priority moves a job
+SECONDS_PER_PRIORITY: float = 60.0
+
+PDF_PAGE_PATTERN: re.Pattern = re.compile(rb"/Type\s*/Page(?!s)")
+
+
+def count_pdf_pages(filedata: bytes | mmap.mmap) -> int:
+    """Count the page objects in a PDF without parsing it"""
+    return len(PDF_PAGE_PATTERN.findall(filedata))
+
+
+def count_archive_images(fp: BinaryIO) -> int:
+    """Count the embedded media of an Office Open XML document (docx, pptx, xlsx)"""
+
+    try:
+        with zipfile.ZipFile(fp) as archive:
+            return sum(1 for name in archive.namelist() if "/media/" in name)
+    except zipfile.BadZipFile:
+        return 0
+
+
+def estimate_cost(file: ParserFile, strategy: str, scan: bool = True) -> float:
+    """
+    Estimate how many seconds a job will take from a cheap pre-scan of the file. The scan reads the whole file, so run it in a thread.
+
+    :param file: The file to parse
+    :param strategy: The parser strategy
+    :param scan: Whether to scan the file for pages & images. Otherwise, estimate from its size alone.
+    :return: The estimated cost, in seconds
+
+    """
+
+    size_mb: float = file.size / (1024 * 1024)
+    cost: float = BASE_SECONDS.get(strategy, DEFAULT_BASE_SECONDS) + size_mb * SECONDS_PER_MB.get(strategy, DEFAULT_SECONDS_PER_MB)
+
+    # Only strategies that scale with pages & images are worth the pre-scan
+    if not scan or strategy not in SECONDS_PER_PAGE:
+        return cost
+
+    # Spooled files are scanned in place rather than read into memory
+    if file.content_type == "application/pdf":
+        with file.view() as filedata:
+            cost += count_pdf_pages(filedata) * SECONDS_PER_PAGE[strategy]
+    elif file.content_type.startswith("application/vnd.openxmlformats-officedocument"):
+        with file.open() as fp:
+            cost += count_archive_images(fp) * SECONDS_PER_IMAGE[strategy]
+
+    return cost
+
+
+class JobQueue(PriorityQueue):
+    """
+    Queue of jobs, shortest (estimated) job first.
+
+    A job's place is its enqueue time plus its estimated cost (scaled by the aging factor),
+    less its client-supplied priority. Since newer jobs are placed after older ones with the same cost,
+    a large job is overtaken by small jobs for at most (cost * aging factor) seconds & can never starve.
+
+    """
+
+    def __init__(self, aging_factor: float = 1.0):
+        """
+        Create the queue
+
+        :param aging_factor: Seconds of waiting a job must do per estimated second of work before it goes first
+
+        """
+
+        super().__init__()
+        self._aging_factor: float = aging_factor
+        self._counter = itertools.count()
+
+    def sort_key(self, job: Job) -> float:
+        """Get the place of a job being added to the queue"""
+        return time.monotonic() + job.cost * self._aging_factor - job.priority * SECONDS_PER_PRIORITY
+
+    def _put(self, job: Job) -> None:
+        # The counter keeps jobs with equal keys in FIFO order & avoids comparing jobs
+        heappush(self._queue, (self.sort_key(job), next(self._counter), job))
+
+    def _get(self) -> Job:
+        return heappop(self._queue)[-1]
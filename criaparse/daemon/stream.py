@@ -0,0 +1,307 @@
+import asyncio
+import enum
+import json
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Dict, Any, List, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from criaparse.daemon.daemon import Daemon
+from criaparse.daemon.job import Job, JobData
+from criaparse.models import ParserFile, ParserStrategy
+
+JobBuilder = Callable[[str, ParserStrategy, ParserFile, Dict[str, Any]], Awaitable[Job]]
+StreamEntry = Tuple[bytes, Dict[bytes, bytes]]
+
+
+class QueueBackend(str, enum.Enum):
+    """Where queued jobs are kept until a worker picks them up"""
+
+    MEMORY = "MEMORY"  # In-process queues, lost on restart (legacy behaviour)
+    REDIS = "REDIS"  # A Redis Stream shared by every CriaParse process
+
+
+class JobStream:
+    """
+    Durable job queue backed by a Redis Stream & consumer group.
+
+    Any CriaParse process can publish to the stream, and every process consumes from it into its local Daemon.
+    Entries are only acknowledged once the job is done, so jobs held by a process that dies are reclaimed by
+    another consumer after sitting idle for `claim_idle_ms`.
+
+    """
+
+    STREAM_KEY: str = "criaparse:stream:jobs"
+    GROUP_NAME: str = "criaparse:workers"
+    BYTES_KEY: str = "criaparse:stream:bytes"
+
+    # Uploaded files are kept until their entry is acknowledged, bounded in case it never is
+    FILE_EXPIRY: int = 60 * 60 * 24
+
+    def __init__(
+            self,
+            redis: Redis,
+            daemon: Daemon,
+            build_job: JobBuilder,
+            claim_idle_ms: int = 10 * 60 * 1000,
+            block_ms: int = 5000
+    ):
+        """
+        Create the job stream
+
+        :param redis: The Redis pool
+        :param daemon: The local daemon consumed jobs are handed to
+        :param build_job: Rebuilds a Job from a stream entry
+        :param claim_idle_ms: How long an entry can go without a heartbeat before another consumer reclaims it
+        :param block_ms: How long to block waiting for new entries
+
+        """
+
+        self._redis: Redis = redis
+        self._daemon: Daemon = daemon
+        self._build_job: JobBuilder = build_job
+        self._claim_idle_ms: int = claim_idle_ms
+        self._block_ms: int = block_ms
+
+        self._consumer_name: str = f"{socket.gethostname()}-{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    def start(self) -> None:
+        """Start consuming the stream"""
+        self._logger.info(self._logger_prefix + f"Job stream consumer {self._consumer_name} is now starting...")
+        self._tasks = [asyncio.create_task(self._consume()), asyncio.create_task(self._heartbeat())]
+
+    async def stop(self) -> None:
+        """Stop consuming. Unfinished entries are left pending for another consumer to reclaim."""
+
+        for task in [*self._tasks, *self._inflight.values()]:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, *self._inflight.values(), return_exceptions=True)
+        self._inflight.clear()
+
+    async def publish(self, job: Job) -> Job:
+        """
+        Publish a job to the stream
+
+        :param job: The job to publish
+        :return: The published job
+
+        """
+
+        file: ParserFile = job.file
+        file_key: str = self._create_file_key(job_id=job.data.job_id)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(file_key, mapping={
+                "filename": file.filename,
+                "content_type": file.content_type,
+                "filedata": await asyncio.to_thread(file.read),
+                "sha256": file.sha256
+            })
+            pipe.expire(file_key, self.FILE_EXPIRY)
+            pipe.incrby(self.BYTES_KEY, file.size)
+            pipe.xadd(self.STREAM_KEY, {
+                "job_id": job.data.job_id,
+                "strategy": job.data.strategy,
+                "options": json.dumps(job.options),
+                "size": file.size
+            })
+            await pipe.execute()
+
+        # Whichever process consumes the job reads the file from Redis
+        file.close()
+        return job
+
+    async def backlog(self) -> Tuple[int, int]:
+        """
+        Check the backlog of every consumer. Entries stay in the stream until acknowledged, so this includes running jobs.
+
+        :return: The # of queued & running jobs, and the total size of their files
+
+        """
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.STREAM_KEY)
+            pipe.get(self.BYTES_KEY)
+            jobs, size = await pipe.execute()
+
+        return jobs, int(size or 0)
+
+    async def _ensure_group(self) -> None:
+        """Create the consumer group (and stream) if it doesn't exist yet"""
+
+        try:
+            await self._redis.xgroup_create(self.STREAM_KEY, self.GROUP_NAME, id="0", mkstream=True)
+        except ResponseError as ex:
+            if "BUSYGROUP" not in str(ex):
+                raise
+
+    async def _consume(self) -> None:
+        """Read entries from the stream into the local daemon"""
+
+        await self._ensure_group()
+
+        while True:
+            try:
+                # Only take on work when nothing is waiting locally, so idle consumers elsewhere get their share
+                if self._daemon.queued > 0:
+                    await asyncio.sleep(self._block_ms / 1000)
+                    continue
+
+                for entry_id, fields in await self._read():
+                    await self._dispatch(entry_id=entry_id, fields=fields)
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception:
+                self._logger.error(self._logger_prefix + "Job stream consumer encountered an error.", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _read(self) -> List[StreamEntry]:
+        """Read the next entry, blocking for up to `block_ms` if there is none"""
+
+        # Abandoned entries take precedence over new ones
+        entries: List[StreamEntry] = await self._reclaim()
+
+        if entries:
+            return entries
+
+        response = await self._redis.xreadgroup(
+            self.GROUP_NAME,
+            self._consumer_name,
+            {self.STREAM_KEY: ">"},
+            count=1,
+            block=self._block_ms
+        )
+
+        return response[0][1] if response else []
+
+    async def _reclaim(self) -> List[StreamEntry]:
+        """Claim an entry left pending by a consumer that stopped sending heartbeats"""
+
+        response = await self._redis.xautoclaim(
+            self.STREAM_KEY,
+            self.GROUP_NAME,
+            self._consumer_name,
+            min_idle_time=self._claim_idle_ms,
+            start_id="0-0",
+            count=1
+        )
+
+        # Entries deleted from the stream since they were read come back empty
+        return [(entry_id, fields) for entry_id, fields in response[1] if fields]
+
+    async def _dispatch(self, entry_id: bytes, fields: Dict[bytes, bytes]) -> None:
+        """Rebuild the job for an entry & hand it to the local daemon"""
+
+        job_id: str = fields[b"job_id"].decode()
+        file_key: str = self._create_file_key(job_id=job_id)
+
+        try:
+            job_data: JobData | None = await JobData.from_redis(job_id=job_id, redis=self._redis, include_response=False)
+
+            # Jobs cancelled while waiting in the stream are never started. Nor are jobs reclaimed from a consumer that finished them but died before acknowledging.
+            if job_data is not None and (job_data.finished or job_data.cancelled):
+                self._logger.info(self._logger_prefix + f"Dropping {'cancelled' if job_data.cancelled else 'finished'} job \"{job_id}\" from the job stream.")
+                await self._ack(entry_id=entry_id, job_id=job_id, size=self._entry_size(fields=fields))
+                return
+
+            # Job data expires an hour after its last write, but entries can wait longer. It's rebuilt from the entry with the job.
+            if job_data is None:
+                self._logger.warning(self._logger_prefix + f"The data of job \"{job_id}\" expired while it was queued, rebuilding it from the job stream.")
+
+            file_fields: Dict[bytes, bytes] = await self._redis.hgetall(file_key)
+
+            if not file_fields:
+                raise FileNotFoundError(f"The file for job \"{job_id}\" is no longer stored in Redis.")
+
+            job: Job = await self._build_job(
+                job_id,
+                ParserStrategy(fields[b"strategy"].decode()),
+                ParserFile(
+                    filename=file_fields[b"filename"].decode(),
+                    content_type=file_fields[b"content_type"].decode(),
+                    filedata=file_fields[b"filedata"],
+                    # Hashed when uploaded. Missing from files published before hashes were stored.
+                    sha256=file_fields[b"sha256"].decode() if b"sha256" in file_fields else None
+                ),
+                json.loads(fields[b"options"])
+            )
+        except Exception:
+            # Entries that can't be rebuilt would otherwise be reclaimed forever
+            self._logger.error(self._logger_prefix + f"Dropping job \"{job_id}\" from the job stream.", exc_info=True)
+            await self._ack(entry_id=entry_id, job_id=job_id, size=self._entry_size(fields=fields))
+            return
+
+        await self._daemon.queue(job=job)
+        self._inflight[entry_id] = asyncio.create_task(self._ack_when_completed(entry_id=entry_id, job=job))
+
+    @classmethod
+    def _entry_size(cls, fields: Dict[bytes, bytes]) -> int:
+        """Get the file size of an entry. Entries published before sizes were recorded count as 0."""
+        return int(fields.get(b"size", 0))
+
+    async def _ack_when_completed(self, entry_id: bytes, job: Job) -> None:
+        """Acknowledge an entry once the worker is done with its job"""
+
+        await job.wait()
+        self._inflight.pop(entry_id, None)
+        await self._ack(entry_id=entry_id, job_id=job.data.job_id, size=job.file.size)
+
+    async def _ack(self, entry_id: bytes, job_id: str, size: int) -> None:
+        """Acknowledge & remove an entry along with its stored file"""
+
+        # A reclaimed entry can be acknowledged twice, only release its bytes the first time
+        acknowledged: int = await self._redis.xack(self.STREAM_KEY, self.GROUP_NAME, entry_id)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xdel(self.STREAM_KEY, entry_id)
+            pipe.delete(self._create_file_key(job_id=job_id))
+
+            if acknowledged:
+                pipe.decrby(self.BYTES_KEY, size)
+
+            await pipe.execute()
+
+    async def _heartbeat(self) -> None:
+        """Periodically re-claim in-flight entries so long-running jobs aren't reclaimed by other consumers"""
+
+        while True:
+            try:
+                await asyncio.sleep(self._claim_idle_ms / 1000 / 3)
+                await self._extend_claims()
+
+            except asyncio.CancelledError:
+                break
+
+            except Exception:
+                self._logger.error(self._logger_prefix + "Job stream heartbeat failed.", exc_info=True)
+
+    async def _extend_claims(self) -> None:
+        """Reset the idle time of the in-flight entries"""
+
+        if not self._inflight:
+            return
+
+        await self._redis.xclaim(
+            self.STREAM_KEY,
+            self.GROUP_NAME,
+            self._consumer_name,
+            min_idle_time=0,
+            message_ids=list(self._inflight.keys()),
+            justid=True
+        )
+
+    @classmethod
+    def _create_file_key(cls, job_id: str) -> str:
+        """Get the redis Key for a queued job's file"""
+        return f"criaparse:job:{job_id}:file"
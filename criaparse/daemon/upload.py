@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import glob
+import hashlib
+import logging
+import os
+import time
+import uuid
+from typing import Dict, List, AsyncIterator, BinaryIO
+
+from pydantic import BaseModel, Field
+
+from criaparse.models import ParserFile, ParserStrategy, FileTooLargeError
+
+
+class UploadOffsetError(RuntimeError):
+    """
+    Thrown when a chunk doesn't start where the upload left off, or an unfinished upload is finalized
+
+    """
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset: int = offset
+
+
+class UploadSession(BaseModel):
+    """
+    A resumable upload, assembled on disk one chunk at a time
+
+    """
+
+    # The ID of the upload
+    upload_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+
+    filename: str
+    content_type: str
+
+    # The strategy the file will be parsed with, which sets its size limit
+    strategy: ParserStrategy
+
+    # The size of the whole file, in bytes
+    size: int
+
+    # The # of bytes received so far, where the next chunk must start
+    offset: int = 0
+
+
+class UploadDigest:
+    """
+    The running SHA-256 of an upload, with how many of its bytes it has covered
+
+    """
+
+    def __init__(self):
+        self.hash: "hashlib._Hash" = hashlib.sha256()
+        self.offset: int = 0
+
+    def update(self, chunk: bytes) -> None:
+        self.hash.update(chunk)
+        self.offset += len(chunk)
+
+
+class UploadStore:
+    """
+    Local store of resumable uploads. Each is a file that chunks are appended to, next to its session.
+
+    Chunks are hashed as they are written, so a finalized file needs no second pass to be looked up in the
+    result cache. Uploads with chunks written by another process (or before a restart) are hashed when they're parsed instead.
+
+    """
+
+    def __init__(self, directory: str, max_age_seconds: int = 60 * 60 * 24):
+        """
+        Create the upload store
+
+        :param directory: The directory uploads are assembled in. Finalized files are parsed from here.
+        :param max_age_seconds: Uploads without a chunk for this long are pruned
+
+        """
+
+        self._directory: str = directory
+        self._max_age_seconds: int = max_age_seconds
+        self._task: asyncio.Task | None = None
+
+        # Map<UploadID, Lock> so chunks of one upload are never written at once
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Map<UploadID, Digest> of the uploads hashed from their first byte on this process
+        self._digests: Dict[str, UploadDigest] = {}
+
+        self._logger: logging.Logger = logging.getLogger('uvicorn.info')
+        self._logger_prefix: str = f"[CriaParse] "
+
+    def start(self) -> None:
+        """Create the directory & prune abandoned uploads every hour"""
+        os.makedirs(self._directory, exist_ok=True)
+        self._task = asyncio.create_task(self._prune_periodically())
+
+    async def stop(self) -> None:
+        """Stop pruning"""
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def create(self, filename: str, content_type: str, strategy: ParserStrategy, size: int) -> UploadSession:
+        """
+        Start an upload
+
+        :param filename: The name of the file
+        :param content_type: The mimetype of the file
+        :param strategy: The strategy the file will be parsed with
+        :param size: The size of the whole file, in bytes
+        :return: The upload session
+
+        """
+
+        session: UploadSession = UploadSession(filename=filename, content_type=content_type, strategy=strategy, size=size)
+        await asyncio.to_thread(self._create, session)
+        return session
+
+    async def get(self, upload_id: str) -> UploadSession | None:
+        """
+        Get an upload, with how much of it was received
+
+        :param upload_id: The ID of the upload
+        :return: The upload session, or None if it doesn't exist
+
+        """
+
+        return await asyncio.to_thread(self._load, upload_id)
+
+    async def write(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> UploadSession | None:
+        """
+        Append a chunk to an upload. What was written is kept if the chunk is cut off, to be resumed from.
+
+        :param upload_id: The ID of the upload
+        :param offset: Where the chunk starts in the file
+        :param chunks: The chunk, as it streams in
+        :return: The upload session, or None if it doesn't exist
+        :raises UploadOffsetError: If the chunk doesn't start where the upload left off
+        :raises FileTooLargeError: If the chunk runs past the size of the file
+
+        """
+
+        async with self._locks.setdefault(upload_id, asyncio.Lock()):
+            session: UploadSession | None = await self.get(upload_id=upload_id)
+
+            if session is None:
+                return None
+
+            if offset != session.offset:
+                raise UploadOffsetError(f"The chunk starts at byte {offset}, but the upload has {session.offset} bytes.", offset=session.offset)
+
+            # Uploads only stay hashed while every chunk is written here, in order
+            if offset == 0:
+                self._digests[upload_id] = UploadDigest()
+            else:
+                self._get_digest(session=session)
+
+            fp: BinaryIO = await asyncio.to_thread(open, self._create_path(upload_id=upload_id, extension=".part"), "ab")
+            pending: List[bytes] = []
+            pending_bytes: int = 0
+
+            try:
+                async for chunk in chunks:
+                    if session.offset + pending_bytes + len(chunk) > session.size:
+                        raise FileTooLargeError(f"The chunk runs past the {session.size} bytes the upload was created with.")
+
+                    pending.append(chunk)
+                    pending_bytes += len(chunk)
+
+                    # Written in large blocks, so memory use stays bounded without a thread hop per chunk
+                    if pending_bytes >= ParserFile.CHUNK_BYTES:
+                        await self._append(upload_id=upload_id, fp=fp, chunks=pending)
+                        session.offset += pending_bytes
+                        pending, pending_bytes = [], 0
+
+            finally:
+                try:
+                    if pending:
+                        await self._append(upload_id=upload_id, fp=fp, chunks=pending)
+                        session.offset += pending_bytes
+                finally:
+                    fp.close()
+
+            return session
+
+    @contextlib.asynccontextmanager
+    async def finalize(self, upload_id: str) -> AsyncIterator[ParserFile | None]:
+        """
+        Finish an upload, handing its file over to be parsed. The file is deleted once it's closed.
+        If the block raises (e.g. the job couldn't be queued), the upload is put back so it can be finalized again.
+
+        :param upload_id: The ID of the upload
+        :return: The file, or None if the upload doesn't exist
+        :raises UploadOffsetError: If the upload hasn't received the whole file
+
+        """
+
+        async with self._locks.setdefault(upload_id, asyncio.Lock()):
+            session: UploadSession | None = await self.get(upload_id=upload_id)
+
+            if session is None:
+                yield None
+                return
+
+            if session.offset != session.size:
+                raise UploadOffsetError(f"The upload has {session.offset} of its {session.size} bytes.", offset=session.offset)
+
+            digest: UploadDigest | None = self._get_digest(session=session)
+            filepath: str = await asyncio.to_thread(self._claim, session)
+
+            try:
+                yield ParserFile(
+                    filename=session.filename,
+                    content_type=session.content_type,
+                    filepath=filepath,
+                    sha256=digest.hash.hexdigest() if digest is not None else None
+                )
+            except BaseException:
+                await asyncio.to_thread(self._restore, session, filepath)
+                raise
+
+        self._locks.pop(upload_id, None)
+        self._digests.pop(upload_id, None)
+
+    def prune(self) -> List[str]:
+        """
+        Delete the uploads without a chunk for longer than the max age
+
+        :return: The IDs of the deleted uploads
+
+        """
+
+        cutoff: float = time.time() - self._max_age_seconds
+        pruned: List[str] = []
+
+        for path in glob.glob(os.path.join(self._directory, "*.part")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    os.remove(os.path.splitext(path)[0] + ".json")
+                    pruned.append(os.path.basename(os.path.splitext(path)[0]))
+            except FileNotFoundError:
+                continue
+
+        return pruned
+
+    async def _append(self, upload_id: str, fp: BinaryIO, chunks: List[bytes]) -> None:
+        """Write chunks to an upload's file, hashing them if the upload is hashed"""
+
+        try:
+            await asyncio.to_thread(self._write, fp, chunks, self._digests.get(upload_id))
+        except BaseException:
+            # How much of the chunks was written is unknown
+            self._digests.pop(upload_id, None)
+            raise
+
+    def _get_digest(self, session: UploadSession) -> UploadDigest | None:
+        """Get the digest of an upload, dropping it if another process has written to the file since"""
+
+        digest: UploadDigest | None = self._digests.get(session.upload_id)
+
+        if digest is not None and digest.offset != session.offset:
+            self._digests.pop(session.upload_id, None)
+            return None
+
+        return digest
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            try:
+                for upload_id in await asyncio.to_thread(self.prune):
+                    self._locks.pop(upload_id, None)
+                    self._digests.pop(upload_id, None)
+
+                await asyncio.sleep(60 * 60)
+
+            except asyncio.CancelledError:
+                break
+
+            except OSError:
+                self._logger.error(self._logger_prefix + f"Failed to prune {self._directory}.", exc_info=True)
+                await asyncio.sleep(60 * 60)
+
+    def _create(self, session: UploadSession) -> None:
+        self._save(session)
+        open(self._create_path(upload_id=session.upload_id, extension=".part"), "wb").close()
+
+    def _save(self, session: UploadSession) -> None:
+        # The file's size is the offset, so only what never changes is stored in the session
+        with open(self._create_path(upload_id=session.upload_id, extension=".json"), "w") as f:
+            f.write(session.model_dump_json(exclude={'offset'}))
+
+    def _load(self, upload_id: str) -> UploadSession | None:
+        try:
+            with open(self._create_path(upload_id=upload_id, extension=".json")) as f:
+                session: UploadSession = UploadSession.model_validate_json(f.read())
+
+            session.offset = os.path.getsize(self._create_path(upload_id=upload_id, extension=".part"))
+            return session
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def _write(cls, fp: BinaryIO, chunks: List[bytes], digest: UploadDigest | None) -> None:
+        for chunk in chunks:
+            fp.write(chunk)
+
+            if digest is not None:
+                digest.update(chunk)
+
+        fp.flush()
+
+    def _claim(self, session: UploadSession) -> str:
+        """Move a finished upload's file out of the way of the pruning, keeping its extension for converters that sniff it"""
+
+        filepath: str = os.path.join(self._directory, f"criaparse-{session.upload_id}{os.path.splitext(session.filename)[1]}")
+        os.replace(self._create_path(upload_id=session.upload_id, extension=".part"), filepath)
+        os.remove(self._create_path(upload_id=session.upload_id, extension=".json"))
+        return filepath
+
+    def _restore(self, session: UploadSession, filepath: str) -> None:
+        """Undo a claim, so the upload can be finalized again"""
+
+        os.replace(filepath, self._create_path(upload_id=session.upload_id, extension=".part"))
+        self._save(session)
+
+    def _create_path(self, upload_id: str, extension: str) -> str:
+        """Get the path to one of an upload's files"""
+
+        # Upload IDs come from requests, so never let one escape the directory
+        return os.path.join(self._directory, os.path.basename(upload_id) + extension)
@@ -1,8 +1,8 @@
 import asyncio
 import logging
-from asyncio import Queue
+from asyncio import Queue, Semaphore
 
-from criaparse.daemon.job import Job
+from criaparse.daemon.job import Job, JobCancelledError
 from criaparse.models import ParserResponse
 
 
@@ -11,18 +11,30 @@ class Worker:
 
     def __init__(
             self,
-            worker_id: int
+            worker_id: int,
+            queue: Queue[Job],
+            concurrency: dict[str, int] | None = None
     ):
+        """
+        Create a worker
+
+        :param worker_id: The ID of the worker
+        :param queue: The shared queue to take jobs from
+        :param concurrency: Map<Strategy, Limit> of how many jobs of each strategy may run at once. Defaults to 1.
+
+        """
+
         self._worker_id: str = f"Llama-{worker_id}"
         self._task: asyncio.Task | None = None
-        self._queue: Queue[Job] = Queue()
+        self._queue: Queue[Job] = queue
         self._logger: logging.Logger = logging.getLogger('uvicorn.info')
         self._logger_prefix: str = f"[CriaParse] "
 
-    @property
-    def queued(self) -> int:
-        """Check the # of queued tasks"""
-        return self._queue.qsize()
+        # I/O-bound strategies can overlap many jobs, CPU-bound ones gain little from it
+        self._concurrency: dict[str, int] = concurrency or {}
+        self._strategy_slots: dict[str, Semaphore] = {}
+        self._slots: Semaphore = Semaphore(max(self._concurrency.values(), default=1))
+        self._running: set[asyncio.Task] = set()
 
     def start(self) -> None:
         """Start the worker"""
@@ -34,36 +46,73 @@ class Worker:
         self._task.cancel()
         await self._task
 
-    async def queue(self, job: Job) -> None:
-        """Add a job to the worker queue"""
-        await self._queue.put(job)
+    @property
+    def running(self) -> int:
+        """Check the # of jobs being processed"""
+        return len(self._running)
+
+    def _strategy_slot(self, strategy: str) -> Semaphore:
+        """Get the semaphore bounding the concurrency of a strategy"""
+
+        if strategy not in self._strategy_slots:
+            self._strategy_slots[strategy] = Semaphore(self._concurrency.get(strategy, 1))
+
+        return self._strategy_slots[strategy]
 
     async def handler(self) -> None:
-        """Handle items in the worker queue"""
-        current_job_id: str | None = None
+        """Take items from the shared queue while there are free slots"""
 
         while True:
-            # Parse jobs
             try:
-                current_job_id = None
-                # Wait until a job has been added
+                # Wait for a free slot, then until a job has been added
+                await self._slots.acquire()
                 job: Job = await self._queue.get()
-                current_job_id = job.data.job_id
-                self._logger.info(self._logger_prefix + f"Worker {self._worker_id} is now processing job \"{current_job_id}\"")
 
-                # Complete the job
-                job_result: ParserResponse = await job.future
+                # Waiting here (rather than in the task) stops the worker taking more jobs it can't start
+                await self._strategy_slot(job.data.strategy).acquire()
 
-                # Set the parser response
-                await job.set_response(response=job_result)
-                self._logger.info(self._logger_prefix + f"Worker {self._worker_id} has completed job \"{current_job_id}\"")
+                task: asyncio.Task = asyncio.create_task(self.process(job=job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
 
             # Gracefully shut down
             except asyncio.CancelledError:
-                self._logger.info(self._logger_prefix + f"Worker {self._worker_id} is shutting down with {self.queued} queued jobs...")
+                self._logger.info(self._logger_prefix + f"Worker {self._worker_id} is shutting down with {self.running} running & {self._queue.qsize()} queued jobs...")
+
+                for task in self._running:
+                    task.cancel()
+
+                await asyncio.gather(*self._running, return_exceptions=True)
                 break
 
-            # Ignore exceptions & log
-            except Exception:
-                self._logger.error(self._logger_prefix + f"Worker {self._worker_id} encountered an error while processing job \"{current_job_id}\".", exc_info=True)
-                continue
+    async def process(self, job: Job) -> None:
+        """Process a job, releasing its slots when done"""
+
+        current_job_id: str = job.data.job_id
+
+        try:
+            self._logger.info(self._logger_prefix + f"Worker {self._worker_id} is now processing job \"{current_job_id}\"")
+
+            try:
+                # Complete the job
+                job_result: ParserResponse = await job.run()
+
+                # Set the parser response
+                await job.set_response(response=job_result)
+            finally:
+                job.set_completed()
+
+            self._logger.info(self._logger_prefix + f"Worker {self._worker_id} has completed job \"{current_job_id}\"")
+
+        except JobCancelledError as ex:
+            self._logger.info(self._logger_prefix + f"Worker {self._worker_id} stopped cancelled job \"{current_job_id}\": {ex}")
+            await job.set_failed()
+
+        # Ignore exceptions & log
+        except Exception:
+            self._logger.error(self._logger_prefix + f"Worker {self._worker_id} encountered an error while processing job \"{current_job_id}\".", exc_info=True)
+            await job.set_failed()
+
+        finally:
+            self._strategy_slot(job.data.strategy).release()
+            self._slots.release()
@@ -1,57 +1,275 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import enum
+import hashlib
 import importlib
 import io
+import mmap
+import os
+import tempfile
 import typing
 import uuid
 from io import BytesIO
-from typing import List, Generator
+from typing import List, Generator, BinaryIO, ClassVar
 
 from pydantic import BaseModel, Field, PrivateAttr
 from starlette.datastructures import UploadFile
 
 if typing.TYPE_CHECKING:
+    from criaparse.blob.store import BlobStore
+    from criaparse.daemon.checkpoint import CheckpointStore
+    from criaparse.daemon.executor import ConverterExecutor
     from criaparse.parser import Parser
 
 
 class ParserFile(BaseModel):
     """
-    A file to be parsed
+    A file to be parsed. Held in memory, or spooled to disk so queued jobs only hold a path.
 
     """
 
     filename: str
     content_type: str
-    filedata: bytes
 
-    _buffer: io.BytesIO | None = PrivateAttr()
+    # The contents, if held in memory
+    filedata: bytes = b""
+
+    # The file the contents were spooled to, if on disk. Deleted when the file is closed.
+    filepath: str | None = None
+
+    _buffer: BinaryIO | None = PrivateAttr()
+    _sha256: str | None = PrivateAttr()
+    _size: int = PrivateAttr()
+
+    # Read from disk in chunks of this size
+    CHUNK_BYTES: ClassVar[int] = 1024 * 1024
+
+    def __init__(self, sha256: str | None = None, **kwargs):
+        """
+        Create a file
+
+        :param sha256: The SHA-256 hex digest of the file, if already known
+
+        """
 
-    def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._buffer = None
+        self._sha256 = sha256
+
+        # Known even once a spooled file is deleted
+        self._size = os.path.getsize(self.filepath) if self.filepath is not None else len(self.filedata)
+
+    @property
+    def sha256(self) -> str:
+        """The SHA-256 hex digest of the file"""
+
+        if self._sha256 is None:
+            if self.filepath is None:
+                self._sha256 = hashlib.sha256(self.filedata).hexdigest()
+            else:
+                with open(self.filepath, "rb") as fp:
+                    self._sha256 = hashlib.file_digest(fp, "sha256").hexdigest()
+
+        return self._sha256
+
+    @property
+    def known_sha256(self) -> str | None:
+        """The SHA-256 hex digest of the file, if it's been computed. Never reads the file."""
+        return self._sha256
+
+    @property
+    def size(self) -> int:
+        """The size of the file, in bytes"""
+        return self._size
 
     @property
-    def buffer(self) -> io.BytesIO:
-        """Convert the filedata to a BytesIO buffer"""
+    def buffer(self) -> BinaryIO:
+        """A file object of the contents, rewound on every access"""
 
         if self._buffer:
             self._buffer.seek(0)
             return self._buffer
 
-        buffer = BytesIO()
-        buffer.write(self.filedata)
-        buffer.seek(0)
-
-        self._buffer = buffer
+        self._buffer = self.open()
         return self._buffer
 
+    def open(self) -> BinaryIO:
+        """Open a new file object of the contents, without copying them into memory"""
+
+        if self.filepath is not None:
+            return open(self.filepath, "rb")
+
+        # Shares the bytes until written to
+        return BytesIO(self.filedata)
+
+    def read(self) -> bytes:
+        """Read the whole contents into memory"""
+
+        if self.filepath is None:
+            return self.filedata
+
+        with open(self.filepath, "rb") as fp:
+            return fp.read()
+
+    @contextlib.contextmanager
+    def view(self) -> Generator[bytes | mmap.mmap, None, None]:
+        """A read-only view of the contents, memory-mapped if on disk"""
+
+        if self.filepath is None or self.size == 0:
+            yield self.filedata
+            return
+
+        with open(self.filepath, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+    def close(self) -> None:
+        """Release the file. Spooled files are deleted."""
+
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+        if self.filepath is not None:
+            try:
+                os.remove(self.filepath)
+            except FileNotFoundError:
+                pass
+
     @classmethod
-    async def from_upload_file(cls, upload_file: UploadFile) -> "ParserFile":
+    async def from_upload_file(
+            cls,
+            upload_file: UploadFile,
+            spool_directory: str | None = None,
+            spool_max_memory_bytes: int = 0,
+            max_bytes: int | None = None
+    ) -> "ParserFile":
+        """
+        Read an upload before FastAPI closes it. It's hashed & measured as it's read, so neither takes another pass.
+
+        :param upload_file: The upload
+        :param spool_directory: Directory to spool large uploads to. None to hold every upload in memory.
+        :param spool_max_memory_bytes: Uploads up to this size are held in memory anyway
+        :param max_bytes: The max size of the upload. None for no limit.
+        :return: The file
+        :raises FileTooLargeError: As soon as the upload is found to be over the limit
+
+        """
+
+        if max_bytes is not None and upload_file.size is not None and upload_file.size > max_bytes:
+            raise FileTooLargeError(f"The file is {upload_file.size} bytes, but at most {max_bytes} bytes can be parsed.")
+
+        digest = hashlib.sha256()
+        chunks: List[bytes] = []
+        size: int = 0
+
+        # Uploads roll over from memory to disk once they outgrow the memory limit
+        filepath: str | None = None
+        fp: BinaryIO | None = None
+
+        try:
+            await upload_file.seek(0)
+
+            while chunk := await upload_file.read(cls.CHUNK_BYTES):
+                size += len(chunk)
+
+                if max_bytes is not None and size > max_bytes:
+                    raise FileTooLargeError(f"The file is over {max_bytes} bytes, the most that can be parsed.")
+
+                digest.update(chunk)
+                chunks.append(chunk)
+
+                if fp is None and spool_directory is not None and size > spool_max_memory_bytes:
+                    # Keep the extension, for converters that sniff it
+                    fd, filepath = tempfile.mkstemp(dir=spool_directory, prefix="criaparse-", suffix=os.path.splitext(upload_file.filename or "")[1])
+                    fp = os.fdopen(fd, "wb")
+
+                if fp is not None:
+                    await asyncio.to_thread(fp.writelines, chunks)
+                    chunks.clear()
+
+        except BaseException:
+            if fp is not None:
+                fp.close()
+                os.remove(filepath)
+            raise
+
+        if fp is not None:
+            fp.close()
+
         return cls(
             filename=upload_file.filename,
             content_type=upload_file.content_type,
-            filedata=await upload_file.read()
+            filedata=b"".join(chunks),
+            filepath=filepath,
+            sha256=digest.hexdigest()
+        )
+
+    @classmethod
+    def from_stream(
+            cls,
+            stream: BinaryIO,
+            filename: str,
+            content_type: str,
+            spool_directory: str | None = None,
+            spool_max_memory_bytes: int = 0,
+            max_bytes: int | None = None
+    ) -> "ParserFile":
+        """
+        Read a file from a stream (e.g. a ZIP member) as it's decompressed, the same way uploads are read. Blocks, so run it in a thread.
+
+        :param stream: The stream
+        :param filename: The name of the file
+        :param content_type: The mimetype of the file
+        :param spool_directory: Directory to spool large files to. None to hold every file in memory.
+        :param spool_max_memory_bytes: Files up to this size are held in memory anyway
+        :param max_bytes: The max size of the file. None for no limit.
+        :return: The file
+        :raises FileTooLargeError: As soon as the file is found to be over the limit
+
+        """
+
+        digest = hashlib.sha256()
+        chunks: List[bytes] = []
+        size: int = 0
+
+        filepath: str | None = None
+        fp: BinaryIO | None = None
+
+        try:
+            while chunk := stream.read(cls.CHUNK_BYTES):
+                size += len(chunk)
+
+                if max_bytes is not None and size > max_bytes:
+                    raise FileTooLargeError(f"The file \"{filename}\" is over {max_bytes} bytes, the most that can be parsed.")
+
+                digest.update(chunk)
+                chunks.append(chunk)
+
+                if fp is None and spool_directory is not None and size > spool_max_memory_bytes:
+                    fd, filepath = tempfile.mkstemp(dir=spool_directory, prefix="criaparse-", suffix=os.path.splitext(filename)[1])
+                    fp = os.fdopen(fd, "wb")
+
+                if fp is not None:
+                    fp.writelines(chunks)
+                    chunks.clear()
+
+        except BaseException:
+            if fp is not None:
+                fp.close()
+                os.remove(filepath)
+            raise
+
+        if fp is not None:
+            fp.close()
+
+        return cls(
+            filename=filename,
+            content_type=content_type,
+            filedata=b"".join(chunks),
+            filepath=filepath,
+            sha256=digest.hexdigest()
         )
 
 
@@ -95,7 +313,12 @@ class ParserStrategy(str, enum.Enum):
     AL_SYLLABUS_FR = "ALSYLLABUSFR"
     PARAGRAPH = "PARAGRAPH"
 
-    def create(self) -> "Parser":
+    def create(
+            self,
+            executor: "ConverterExecutor | None" = None,
+            checkpoints: "CheckpointStore | None" = None,
+            assets: "BlobStore | None" = None
+    ) -> "Parser":
         parser_classes = {
             self.GENERIC: "criaparse.parsers.generic.generic.GenericParser",
             self.AL_SYLLABUS: "criaparse.parsers.alsyllabus.alsyllabus.AlSyllabusParser",
@@ -105,7 +328,7 @@ class ParserStrategy(str, enum.Enum):
 
         module_path, class_name = parser_classes[self].rsplit(".", 1)
         module = importlib.import_module(module_path)
-        return getattr(module, class_name)()
+        return getattr(module, class_name)(executor=executor, checkpoints=checkpoints, assets=assets)
 
     @classmethod
     def iterator(cls) -> Generator["ParserStrategy", None, None]:
@@ -122,9 +345,12 @@ class Asset(BaseModel):
 
     uuid: str  # Must not be passed, must be generated based on WHATEVER the element_id is, as this is used to caption the image & thus must match for embeds.
     data_mimetype: str
-    data_base64: str
     description: str
 
+    # Inline data, or empty if the asset was written to the blob store & is served by /parser/assets/{data_ref}
+    data_base64: str = ""
+    data_ref: str | None = None
+
 
 class Element(BaseModel):
     type: ElementType
@@ -144,3 +370,10 @@ class FileUnsupportedParseError(RuntimeError):
     Thrown when someone tries to parse a file not supported by a parser
 
     """
+
+
+class FileTooLargeError(RuntimeError):
+    """
+    Thrown when a file is over the size limit of its parsing strategy
+
+    """
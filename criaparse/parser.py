@@ -1,8 +1,15 @@
+import asyncio
+import base64
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Callable, TypeVar, Any, BinaryIO
 
+from criaparse.blob.store import BlobStore
+from criaparse.daemon.checkpoint import CheckpointStore
+from criaparse.daemon.executor import ConverterExecutor
 from criaparse.daemon.job import Job
-from criaparse.models import ParserResponse, FileUnsupportedParseError, ParserFile, ParserStrategy
+from criaparse.models import ParserResponse, FileUnsupportedParseError, ParserFile, ParserStrategy, Asset
+
+ConverterResult = TypeVar("ConverterResult")
 
 
 class Parser(ABC):
@@ -11,6 +18,25 @@ class Parser(ABC):
 
     """
 
+    def __init__(
+            self,
+            executor: ConverterExecutor | None = None,
+            checkpoints: CheckpointStore | None = None,
+            assets: BlobStore | None = None
+    ):
+        """
+        Create a parser
+
+        :param executor: Executor for CPU-bound conversions. Defaults to running them inline.
+        :param checkpoints: Store for intermediate outputs, so interrupted jobs can resume. Defaults to none.
+        :param assets: Store for the raw bytes of assets. Defaults to inlining them as base64.
+
+        """
+
+        self._executor: ConverterExecutor = executor or ConverterExecutor()
+        self._checkpoints: CheckpointStore | None = checkpoints
+        self._assets: BlobStore | None = assets
+
     @abstractmethod
     def accepted_mimetypes(self) -> List[str]:
         """
@@ -33,6 +59,72 @@ class Parser(ABC):
 
         return file.content_type in self.accepted_mimetypes()
 
+    async def convert(
+            self,
+            converter: Callable[[BinaryIO], ConverterResult],
+            file: ParserFile
+    ) -> ConverterResult:
+        """
+        Run a CPU-bound converter against the file without blocking the event loop
+
+        :param converter: A module-level converter function taking a file buffer
+        :param file: The file to convert
+        :return: The converter output
+
+        """
+
+        # Files read from an upload were hashed as they were read
+        return await self._executor.run(converter, file.filepath or file.filedata, sha256=file.known_sha256)
+
+    async def load_checkpoint(self, job: Job, name: str) -> Any | None:
+        """
+        Load the output of a step a previous run of the job completed
+
+        :param job: The job
+        :param name: The name of the checkpoint
+        :return: The checkpoint data, or None if there is none
+
+        """
+
+        if self._checkpoints is None:
+            return None
+
+        return await self._checkpoints.load(job_id=job.data.job_id, name=name)
+
+    async def save_checkpoint(self, job: Job, name: str, data: Any) -> None:
+        """
+        Save the output of a step, so it can be skipped if the job is interrupted
+
+        :param job: The job
+        :param name: The name of the checkpoint
+        :param data: JSON-serializable checkpoint data
+
+        """
+
+        if self._checkpoints is not None:
+            await self._checkpoints.save(job_id=job.data.job_id, name=name, data=data)
+
+    async def store_assets(self, assets: List[Asset]) -> List[Asset]:
+        """
+        Move the data of assets to the blob store, leaving a reference in its place
+
+        :param assets: Assets with inline data
+        :return: The assets referencing their data, or unchanged if there is no blob store
+
+        """
+
+        if self._assets is None:
+            return assets
+
+        async def store(asset: Asset) -> Asset:
+            if not asset.data_base64:
+                return asset
+
+            await self._assets.put(key=asset.uuid, data=base64.b64decode(asset.data_base64), content_type=asset.data_mimetype)
+            return asset.model_copy(update={'data_base64': "", 'data_ref': asset.uuid})
+
+        return list(await asyncio.gather(*[store(asset) for asset in assets]))
+
     @abstractmethod
     async def _parse(self, file: ParserFile, job: "Job", **kwargs) -> ParserResponse:
         """
@@ -62,11 +154,23 @@ class Parser(ABC):
                 f"The file content type {file.content_type} is not supported by {type(self)}"
             )
 
-        return await self._parse(
-            file=file,
-            job=job,
-            **kwargs
-        )
+        try:
+            response: ParserResponse = await self._parse(
+                file=file,
+                job=job,
+                **kwargs
+            )
+        except Exception:
+            # Failed & cancelled jobs won't be resumed. Interruptions (asyncio.CancelledError) keep their checkpoints.
+            if self._checkpoints is not None:
+                await self._checkpoints.delete(job_id=job.data.job_id)
+            raise
+
+        if self._checkpoints is not None:
+            await self._checkpoints.delete(job_id=job.data.job_id)
+
+        # Whatever the parser didn't emit as it went is streamed from the response, rather than stored twice
+        return response
 
     @classmethod
     @abstractmethod
@@ -37,9 +37,7 @@ class AlSyllabusParser(Parser):
 
         """
 
-        al_nodes: List[AlNode] = convert_file(
-            file_bytes=file.buffer
-        )
+        al_nodes: List[AlNode] = await self.convert(convert_file, file)
 
         elements: List[Element] = []
         for node in al_nodes:
@@ -1,6 +1,6 @@
 import io
 import re
-from typing import List, Any, Tuple, Optional
+from typing import List, Any, Tuple, Optional, BinaryIO
 
 import mammoth
 import pandas as pd
@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 from docx import Document
 from docx.text.paragraph import Paragraph
 
+from criaparse.cache.artifact import cached_artifact, cached_source_artifact
 from criaparse.parsers.alsyllabus.al_types import AlNode
 
 
@@ -116,6 +117,18 @@ def convert_doc_to_nodes(
     return nodes_text
 
 
+def convert_to_html(file_buffer: BinaryIO) -> str:
+    """
+    Convert the docx to HTML with mammoth, re-using the output for files converted before
+
+    :param file_buffer: File in an io.BytesIO buffer, or opened from disk
+    :return: The HTML text
+
+    """
+
+    return cached_source_artifact("mammoth_html", file_buffer, lambda: mammoth.convert_to_html(file_buffer).value)
+
+
 def read_tables_bs4mp(html_text: str) -> List[pd.DataFrame]:
     """
     Parse the HTML tables with BeautifulSoup
@@ -159,7 +172,7 @@ def read_tables(html_text, sections):
     # With the following two code lines, pd.read_html did not keep the links. So I used beautiful soup instead
     # html_buffer = StringIO(html_text)  # Had to wrap the HTML string in a StringIO object because a direct pd.read (see line below) will be deprecated
     # doc_tables_df = pd.read_html(html_buffer)  # This grabs all the tables in the syllabus and stores them in a dataframe
-    doc_tables_df = read_tables_bs4mp(html_text)
+    doc_tables_df = cached_artifact("html_tables", html_text.encode(), lambda: read_tables_bs4mp(html_text))
 
     # find all caption
     # pattern = r"</table>(.*?)</p>"  # All captions are right after the table between <p> and </p>
@@ -554,7 +567,7 @@ def convert_file(
     """
 
     docx_file: Document = Document(file_bytes)
-    html_text: str = mammoth.convert_to_html(file_bytes).value
+    html_text: str = convert_to_html(file_bytes)
     sections: List[str] = find_h_level(docx_file)
 
     # The sections in the sections list are assigned a paragraph
@@ -631,7 +644,7 @@ def convert_file_partial(file_buffer: io.BytesIO) -> List[dict]:
 
     # Parse as HTML text
     file_buffer.seek(0)
-    html_text: str = mammoth.convert_to_html(file_buffer).value
+    html_text: str = convert_to_html(file_buffer)
 
     # Initialize an empty nodes_text array
     nodes_text: list[str] = convert_file_partial__render_course_information(docx_file, sections)
@@ -42,9 +42,7 @@ class AlSyllabusParserFr(Parser):
 
         start_time = time.time()
 
-        parsed_elements: List[Element] = run_converter(
-            docx=file.buffer
-        )
+        parsed_elements: List[Element] = await self.convert(run_converter, file)
 
         end_time = time.time()
 
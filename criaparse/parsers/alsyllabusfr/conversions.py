@@ -2,19 +2,18 @@ import io
 import re
 from typing import List
 
-import mammoth
 import pandas as pd
 from bs4 import BeautifulSoup
 from docx import Document
 
 from criaparse.models import ElementType, Element
+from criaparse.parsers.alsyllabus.conversions import convert_to_html
 
 
 def run_converter(docx: io.BytesIO) -> List[Element]:
-    result = mammoth.convert_to_html(docx)
+    html_text = convert_to_html(docx)
 
     doc = Document(docx)
-    html_text = result.value
 
     def find_hlevel(doc):
         headings = []
@@ -1,16 +1,16 @@
-import functools
-import io
+import copy
 import os
+import time
 from typing import List
 
 from CriadexSDK.routers.models.azure import ModelAboutRoute
 from SemanticDocumentParser import SemanticDocumentParser
 from SemanticDocumentParser.llama_extensions.node_parser import AsyncSemanticSplitterNodeParser
-from SemanticDocumentParser.utils import with_timings_sync
 from fastapi import UploadFile
 from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
-from llama_index.multi_modal_llms.azure_openai import AzureOpenAIMultiModal
 
+from criaparse.cache.caption import CachedAzureOpenAIMultiModal, get_caption_cache
+from criaparse.cache.embedding import CachedEmbedding, get_embedding_cache
 from criaparse.daemon.job import Job
 from criaparse.parser import Parser
 from criaparse.models import ElementType, Element, ParserResponse, Asset, FileUnsupportedParseError, ParserFile, ParserStrategy
@@ -33,6 +33,11 @@ semantic_step_map_inverted: dict[int, str] = {v: k for k, v in semantic_step_map
 DOCX_FILETYPE: str = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 AL_EXT_STEP_NAME: str = 'Al Extension'
 
+# SemanticDocumentParser runs all nine of its steps in one call & only returns the final output, so they're checkpointed as one.
+# A job interrupted during any of them (e.g. 'Image Captioning') starts them over, reusing only the captions & embeddings already cached.
+SEMANTIC_CHECKPOINT: str = 'semantic'
+AL_EXT_CHECKPOINT: str = 'al_extension'
+
 
 class GenericParser(Parser):
     """
@@ -111,8 +116,9 @@ class GenericParser(Parser):
         if llm_model_info is None or embedding_model_info is None:
             raise ParseModelMissingError("LLM and embedding model IDs must be provided")
 
-        # Build the LLM Model
-        _llm_model = AzureOpenAIMultiModal(
+        # Build the LLM Model, captioning repeated images from the cache
+        _llm_model = CachedAzureOpenAIMultiModal(
+            captions=get_caption_cache(),
             model=llm_model_info.model.api_model,
             api_key=llm_model_info.model.api_key,
             api_version=llm_model_info.model.api_version,
@@ -121,16 +127,20 @@ class GenericParser(Parser):
             max_new_tokens=2048
         )
 
-        # Build the node parser
+        # Build the node parser, embedding boilerplate seen in earlier documents from the cache
         _node_parser = AsyncSemanticSplitterNodeParser(
             buffer_size=2,
             breakpoint_percentile_threshold=85,
-            embed_model=AzureOpenAIEmbedding(
-                model=embedding_model_info.model.api_model,
-                api_key=embedding_model_info.model.api_key,
-                api_version=embedding_model_info.model.api_version,
-                azure_endpoint=f"https://{embedding_model_info.model.api_resource}.openai.azure.com",
-                azure_deployment=embedding_model_info.model.api_deployment,
+            embed_model=CachedEmbedding(
+                embed_model=AzureOpenAIEmbedding(
+                    model=embedding_model_info.model.api_model,
+                    api_key=embedding_model_info.model.api_key,
+                    api_version=embedding_model_info.model.api_version,
+                    azure_endpoint=f"https://{embedding_model_info.model.api_resource}.openai.azure.com",
+                    azure_deployment=embedding_model_info.model.api_deployment,
+                ),
+                model_key=f"{embedding_model_info.model.api_resource}:{embedding_model_info.model.api_deployment}:{embedding_model_info.model.api_model}",
+                embeddings=get_embedding_cache()
             ),
         )
 
@@ -140,22 +150,53 @@ class GenericParser(Parser):
         )
 
         # Function to update the job after each step
+        step_times: dict[str, float] = {}
+
         async def on_step_finished(step_name: str, parse_time: float) -> None:
             step_num = semantic_step_map[step_name]
+            step_times[step_name] = parse_time
             await job.set_step_finished(step_name=step_name, step_number=step_num, time_taken=parse_time)
 
-        # Parse using the SemanticDocumentParser
-        parsed_elements, parser_timings = await parser.aparse(
-            document=file.buffer,
-            document_filename=file.filename,
-            on_step_finished=on_step_finished
-        )
+        # Resume from the output of an interrupted run of this job, if there is one
+        checkpoint: dict | None = await self.load_checkpoint(job, SEMANTIC_CHECKPOINT)
+
+        if checkpoint is not None:
+            parsed_elements, parser_timings = checkpoint['elements'], checkpoint['timings']
+
+            for step_name, parse_time in checkpoint['step_times'].items():
+                await on_step_finished(step_name=step_name, parse_time=parse_time)
+        else:
+            # Parse using the SemanticDocumentParser
+            parsed_elements, parser_timings = await parser.aparse(
+                document=file.buffer,
+                document_filename=file.filename,
+                on_step_finished=on_step_finished
+            )
+
+            parser_timings['caption_cache_hit_rate'] = _llm_model.caption_cache_hit_rate
+
+            await self.save_checkpoint(job, SEMANTIC_CHECKPOINT, {
+                'elements': parsed_elements,
+                'timings': parser_timings,
+                'step_times': step_times
+            })
+
+        # Without grouping, the semantic elements are final as-is & can be streamed while the extension runs
+        if al_extension and not kwargs.get('group_by_h1', True):
+            semantic_elements, _ = self.parse_parser_outputs(copy.deepcopy(parsed_elements))
+            await job.emit_elements(elements=semantic_elements)
 
         # If al is enabled, parse using that & extend the elements with the extra step
         if al_extension:
-            timings, response = with_timings_sync(fn=functools.partial(self.al_extension, file_buffer=file.buffer))
+            start_time = time.time()
+            response: List[dict] | None = await self.load_checkpoint(job, AL_EXT_CHECKPOINT)
+
+            if response is None:
+                response = await self.convert(alsyllabus.convert_file_partial, file)
+                await self.save_checkpoint(job, AL_EXT_CHECKPOINT, response)
+
             parsed_elements.extend(response)
-            await job.set_step_finished(step_name=AL_EXT_STEP_NAME, step_number=len(semantic_step_map) + 1, time_taken=timings)
+            await job.set_step_finished(step_name=AL_EXT_STEP_NAME, step_number=len(semantic_step_map) + 1, time_taken=time.time() - start_time)
 
         # Group elements by top-level H1 sections and extract assets
         if kwargs.get('group_by_h1', True):
@@ -177,6 +218,9 @@ class GenericParser(Parser):
             # Preserve legacy behavior for indexer compatibility
             output_elements, output_assets = self.parse_parser_outputs(parsed_elements)
 
+        # Images are written out once & referenced, rather than carried as base64 through Redis & every poll
+        output_assets = await self.store_assets(output_assets)
+
         # Feb 5, 2025, Patrick is away. To add immediate support for assets,
         # I have added 'ENABLE_BACKWARDS_COMPATIBLE_ASSET_CONTAINER' as a TEMPORARY << read: TEMPORARY!!!! solution.
         # This passed an additional 'meta' element Criadex extracts when uploading a document.
@@ -196,11 +240,6 @@ class GenericParser(Parser):
 
         return ParserResponse(elements=output_elements, assets=output_assets, timings=parser_timings)
 
-    @classmethod
-    def al_extension(cls, file_buffer: io.BytesIO) -> List[dict]:
-        """Execute the Al extension to extend the generic parser to handle syllabi matching the Al Syllabus template format"""
-        return alsyllabus.convert_file_partial(file_buffer)
-
     @classmethod
     def parse_raw_description(cls, description: str) -> str:
         """
@@ -36,8 +36,6 @@ class ParagraphParser(Parser):
 
         """
 
-        parsed_elements: List[Element] = run_converter(
-            docx=file.buffer
-        )
+        parsed_elements: List[Element] = await self.convert(run_converter, file)
 
         return ParserResponse(elements=parsed_elements)
@@ -0,0 +1,39 @@
+import io
+
+import fakeredis
+import pytest
+from docx import Document
+
+DOCX_CONTENT_TYPE: str = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run async tests on asyncio, which the app runs on"""
+    return "asyncio"
+
+
+@pytest.fixture
+def docx_bytes() -> bytes:
+    """A small syllabus, with the sections the AL syllabus parsers look for"""
+
+    document: Document = Document()
+    document.add_paragraph("HUMA 1740")
+    document.add_paragraph("Critical Thinking")
+    document.add_heading("Course Information", 1)
+    document.add_paragraph("Course Director: Jane Doe")
+    document.add_heading("Evaluation", 1)
+    document.add_paragraph("Final exam " * 50)
+
+    buffer: io.BytesIO = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+async def redis():
+    """An in-memory Redis, with Lua scripting for the job stream"""
+
+    client: fakeredis.aioredis.FakeRedis = fakeredis.aioredis.FakeRedis()
+    yield client
+    await client.aclose()
@@ -0,0 +1,31 @@
+import pytest
+
+from criaparse.daemon.admission import AdmissionController, QueueFullError
+from criaparse.daemon.batch import BatchTooLargeError
+
+
+def test_jobs_over_the_limit_wait_for_the_backlog():
+    admission: AdmissionController = AdmissionController(max_jobs=10)
+
+    with pytest.raises(QueueFullError) as info:
+        admission.check(size=0, backlog_jobs=8, backlog_bytes=0, throughput=(0.5, 0), jobs=4)
+
+    assert info.value.retry_after == 4
+
+
+def test_batch_larger_than_the_queue_is_refused_for_good():
+    admission: AdmissionController = AdmissionController(max_jobs=10)
+
+    # Even into an empty queue, so retrying would never help
+    with pytest.raises(BatchTooLargeError):
+        admission.check(size=0, backlog_jobs=0, backlog_bytes=0, throughput=(0, 0), jobs=11)
+
+    admission.check(size=0, backlog_jobs=0, backlog_bytes=0, throughput=(0, 0), jobs=10)
+
+
+def test_file_larger_than_the_budget_is_admitted_into_an_empty_queue():
+    admission: AdmissionController = AdmissionController(max_bytes=100)
+    admission.check(size=1000, backlog_jobs=0, backlog_bytes=0, throughput=(0, 0))
+
+    with pytest.raises(QueueFullError):
+        admission.check(size=1000, backlog_jobs=1, backlog_bytes=10, throughput=(0, 0))
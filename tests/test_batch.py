@@ -0,0 +1,54 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from criaparse.daemon.batch import BatchTooLargeError, expand_zip, list_zip
+from criaparse.models import ParserFile, FileTooLargeError
+
+
+def create_zip(members: dict[str, bytes]) -> ParserFile:
+    buffer: io.BytesIO = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+    return ParserFile(filename="batch.zip", content_type="application/zip", filedata=buffer.getvalue())
+
+
+def test_list_zip_reports_claimed_sizes_without_extracting():
+    archive: ParserFile = create_zip({"a.docx": b"a" * 10, "b.pdf": b"\0" * 50_000_000, "__MACOSX/._a.docx": b"", ".hidden": b""})
+    entries = list_zip(archive, max_files=10)
+
+    assert [info.filename for info in entries] == ["a.docx", "b.pdf"]
+    assert sum(info.file_size for info in entries) == 50_000_010
+    assert archive.size < 100_000
+
+
+def test_list_zip_refuses_too_many_files():
+    with pytest.raises(BatchTooLargeError):
+        list_zip(create_zip({f"{idx}.pdf": b"" for idx in range(3)}), max_files=2)
+
+
+def test_expand_zip_spools_large_files(tmp_path):
+    archive: ParserFile = create_zip({"small.pdf": b"s" * 10, "large.pdf": b"l" * 100_000})
+    files = expand_zip(archive, list_zip(archive, max_files=10), spool_directory=str(tmp_path), spool_max_memory_bytes=1_000)
+
+    assert [(file.filename, file.filepath is not None, file.size) for file in files] == [("small.pdf", False, 10), ("large.pdf", True, 100_000)]
+    assert files[1].read() == b"l" * 100_000
+
+    for file in files:
+        file.close()
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_expand_zip_stops_at_limit_and_cleans_up(tmp_path):
+    archive: ParserFile = create_zip({"small.pdf": b"s" * 100_000, "bomb.pdf": b"\0" * 50_000_000})
+
+    with pytest.raises(FileTooLargeError):
+        expand_zip(archive, list_zip(archive, max_files=10), spool_directory=str(tmp_path), spool_max_memory_bytes=1_000, max_bytes=1_000_000)
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,65 @@
+import asyncio
+import io
+
+import pytest
+from starlette.datastructures import UploadFile, Headers
+
+from criaparse.client import CriaParse
+from criaparse.daemon.job import Job, JobData
+from criaparse.models import Element, ElementType, ParserFile, ParserStrategy
+from tests.conftest import DOCX_CONTENT_TYPE
+
+ELEMENTS: list[Element] = [Element(type=ElementType.NARRATIVE_TEXT, text=f"Section {idx}") for idx in range(3)]
+
+
+async def create_job(redis, **options) -> Job:
+    return await Job.create(
+        parser=ParserStrategy.PARAGRAPH.create(),
+        file=ParserFile(filename="syllabus.docx", content_type=DOCX_CONTENT_TYPE, filedata=b"docx"),
+        criadex=None,
+        redis=redis,
+        llm_model_id=None,
+        embedding_model_id=None,
+        **options
+    )
+
+
+@pytest.mark.anyio
+async def test_elements_are_only_stored_when_streamed(redis):
+    streamed: Job = await create_job(redis, stream_elements=True)
+    unstreamed: Job = await create_job(redis)
+
+    for job in (streamed, unstreamed):
+        await job.emit_elements(elements=ELEMENTS[:2])
+        await job.emit_elements(elements=ELEMENTS)
+
+    assert await redis.lrange(JobData.create_elements_key(job_id=streamed.data.job_id), 0, -1) == [element.json().encode() for element in ELEMENTS]
+    assert not await redis.exists(JobData.create_elements_key(job_id=unstreamed.data.job_id))
+
+
+@pytest.mark.anyio
+async def test_unstreamed_elements_are_read_from_the_response(redis, docx_bytes):
+    criaparse: CriaParse = CriaParse(criadex=None, redis=redis, workers=1)
+    criaparse.start()
+
+    try:
+        job: Job = await criaparse.queue(
+            file=UploadFile(file=io.BytesIO(docx_bytes), filename="syllabus.docx", headers=Headers({"content-type": DOCX_CONTENT_TYPE})),
+            strategy=ParserStrategy.PARAGRAPH,
+            llm_model_id=None,
+            embedding_model_id=None
+        )
+
+        elements: list[str] = await asyncio.wait_for(_collect(criaparse.elements(job_id=job.data.job_id)), timeout=30)
+        job_data: JobData = await JobData.from_redis(job_id=job.data.job_id, redis=redis)
+
+        # Nothing was stored besides the response
+        assert not await redis.exists(JobData.create_elements_key(job_id=job.data.job_id))
+        assert elements == [element.json() for element in job_data.response.elements]
+        assert elements
+    finally:
+        await criaparse.close()
+
+
+async def _collect(stream) -> list:
+    return [item async for item in stream]
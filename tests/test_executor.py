@@ -0,0 +1,65 @@
+import hashlib
+from typing import Callable, Any
+
+import pytest
+
+from criaparse.cache import artifact
+from criaparse.daemon.executor import ConverterExecutor, ExecutorMode
+from criaparse.models import ParserFile, ParserStrategy
+from criaparse.parsers.alsyllabus.conversions import convert_file, convert_file_partial
+from criaparse.parsers.alsyllabusfr.conversions import run_converter as run_converter_fr
+from criaparse.parsers.paragraph.conversions import run_converter as run_converter_paragraph
+from tests.conftest import DOCX_CONTENT_TYPE
+
+DOCX_CONVERTERS: dict[str, tuple[ParserStrategy, Callable[..., Any]]] = {
+    "al_syllabus": (ParserStrategy.AL_SYLLABUS, convert_file),
+    "al_syllabus_partial": (ParserStrategy.GENERIC, convert_file_partial),
+    "al_syllabus_fr": (ParserStrategy.AL_SYLLABUS_FR, run_converter_fr),
+    "paragraph": (ParserStrategy.PARAGRAPH, run_converter_paragraph),
+}
+
+
+def strip_ids(output: list) -> list:
+    """Element IDs are random, so compare converter output without them"""
+    return [{key: value for key, value in (item.model_dump() if hasattr(item, "model_dump") else item).items() if key != "element_id"} for item in output]
+
+
+@pytest.fixture
+def artifact_cache(tmp_path):
+    """Cache artifacts, as converters do by default"""
+
+    artifact.configure_artifact_cache(path=str(tmp_path / "artifacts.sqlite3"), max_bytes=64 * 1024 * 1024)
+    yield
+    artifact.configure_artifact_cache(path=None, max_bytes=0)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("mode", [ExecutorMode.INLINE, ExecutorMode.THREAD])
+@pytest.mark.parametrize("name", list(DOCX_CONVERTERS))
+async def test_docx_converters_run_from_spooled_file(artifact_cache, tmp_path, docx_bytes, mode, name):
+    strategy, converter = DOCX_CONVERTERS[name]
+    parser = strategy.create(executor=ConverterExecutor(mode=mode))
+
+    path = tmp_path / "syllabus.docx"
+    path.write_bytes(docx_bytes)
+
+    from_disk = await parser.convert(converter, ParserFile(filename="syllabus.docx", content_type=DOCX_CONTENT_TYPE, filepath=str(path)))
+    from_memory = await parser.convert(converter, ParserFile(filename="syllabus.docx", content_type=DOCX_CONTENT_TYPE, filedata=docx_bytes))
+
+    assert from_disk
+    assert strip_ids(from_disk) == strip_ids(from_memory)
+
+
+@pytest.mark.anyio
+async def test_cached_html_is_keyed_by_file_hash(artifact_cache, tmp_path, docx_bytes):
+    path = tmp_path / "syllabus.docx"
+    path.write_bytes(docx_bytes)
+    sha256: str = hashlib.sha256(docx_bytes).hexdigest()
+
+    parser = ParserStrategy.AL_SYLLABUS_FR.create(executor=ConverterExecutor(mode=ExecutorMode.INLINE))
+
+    # Hashed by the converter when the digest isn't known, or handed over when it is
+    await parser.convert(run_converter_fr, ParserFile(filename="syllabus.docx", content_type=DOCX_CONTENT_TYPE, filepath=str(path)))
+    await parser.convert(run_converter_fr, ParserFile(filename="syllabus.docx", content_type=DOCX_CONTENT_TYPE, filepath=str(path), sha256=sha256))
+
+    assert artifact._artifact_cache.get(key=f"mammoth_html:{sha256}") is not None
@@ -0,0 +1,36 @@
+import pytest
+
+from criaparse.cache.result import ResultCache
+from criaparse.models import ParserResponse, Element, ElementType
+
+
+def create_response() -> ParserResponse:
+    return ParserResponse(elements=[Element(type=ElementType.NARRATIVE_TEXT, text="Final exam " * 50)])
+
+
+@pytest.mark.anyio
+async def test_put_clears_the_job_in_flight(redis):
+    cache: ResultCache = ResultCache(redis=redis)
+    key: str = cache.create_key(sha256="0" * 64, strategy="GENERIC", options={})
+
+    await cache.set_in_flight(key=key, job_id="job")
+    assert await cache.get_in_flight(key=key) == "job"
+
+    response: ParserResponse = create_response()
+    await cache.put(key=key, response=response)
+
+    assert await cache.get(key=key) == response
+    assert await cache.get_in_flight(key=key) is None
+
+
+@pytest.mark.anyio
+async def test_oversized_response_clears_the_job_in_flight(redis):
+    # Nothing will be cached, so clients must not keep following the job
+    cache: ResultCache = ResultCache(redis=redis, max_bytes=10)
+    key: str = cache.create_key(sha256="0" * 64, strategy="GENERIC", options={})
+
+    await cache.set_in_flight(key=key, job_id="job")
+    await cache.put(key=key, response=create_response())
+
+    assert await cache.get(key=key) is None
+    assert await cache.get_in_flight(key=key) is None
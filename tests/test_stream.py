@@ -0,0 +1,161 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from criaparse.daemon.job import Job, JobData
+from criaparse.daemon.stream import JobStream
+from criaparse.models import ParserFile, ParserStrategy
+from tests.conftest import DOCX_CONTENT_TYPE
+
+CLAIM_IDLE_MS: int = 200
+
+
+class RecordingDaemon:
+    """Quacks like the Daemon, but only records the jobs handed to it"""
+
+    def __init__(self):
+        self.jobs: List[Job] = []
+
+    @property
+    def queued(self) -> int:
+        return 0
+
+    async def queue(self, job: Job) -> Job:
+        self.jobs.append(job)
+        return job
+
+
+async def create_job(redis, data: bytes = b"docx", job_id: str | None = None) -> Job:
+    return await Job.create(
+        parser=ParserStrategy.PARAGRAPH.create(),
+        file=ParserFile(filename="syllabus.docx", content_type=DOCX_CONTENT_TYPE, filedata=data),
+        criadex=None,
+        redis=redis,
+        job_id=job_id,
+        llm_model_id=None,
+        embedding_model_id=None
+    )
+
+
+def create_stream(redis, daemon: RecordingDaemon) -> JobStream:
+    """A consumer that rebuilds jobs as the app does. Each stream is its own consumer, as if in its own process."""
+
+    async def build_job(job_id: str, strategy: ParserStrategy, file: ParserFile, options: dict) -> Job:
+        return await Job.create(parser=strategy.create(), file=file, criadex=None, redis=redis, job_id=job_id, **options)
+
+    stream: JobStream = JobStream(redis=redis, daemon=daemon, build_job=build_job, claim_idle_ms=CLAIM_IDLE_MS, block_ms=1)
+    stream._consumer_name = f"consumer-{id(stream)}"
+    return stream
+
+
+async def pending_consumers(redis) -> List[bytes]:
+    return [entry['consumer'] for entry in await redis.xpending_range(JobStream.STREAM_KEY, JobStream.GROUP_NAME, "-", "+", 10)]
+
+
+@pytest.fixture
+async def streams(redis):
+    """Two consumers of the same stream"""
+
+    consumers: List[JobStream] = [create_stream(redis, RecordingDaemon()) for _ in range(2)]
+    await consumers[0]._ensure_group()
+    yield consumers
+
+    for consumer in consumers:
+        await consumer.stop()
+
+
+@pytest.mark.anyio
+async def test_publish_consume_ack(redis, streams):
+    consumer, _ = streams
+    published: Job = await consumer.publish(job=await create_job(redis, data=b"x" * 1000))
+
+    assert await consumer.backlog() == (1, 1000)
+
+    entries = await consumer._read()
+    assert len(entries) == 1
+
+    await consumer._dispatch(*entries[0])
+    job: Job = consumer._daemon.jobs[0]
+
+    assert job.data.job_id == published.data.job_id
+    assert job.file.read() == b"x" * 1000
+    assert job.file.known_sha256 == published.file.sha256
+
+    # Acknowledged once the worker is done with the job
+    job.set_completed()
+    await asyncio.gather(*consumer._inflight.values())
+
+    assert await consumer.backlog() == (0, 0)
+    assert await pending_consumers(redis) == []
+    assert not await redis.exists(JobStream._create_file_key(job_id=job.data.job_id))
+
+
+@pytest.mark.anyio
+async def test_entries_of_dead_consumers_are_reclaimed(redis, streams):
+    dead, alive = streams
+    published: Job = await dead.publish(job=await create_job(redis))
+
+    # Read, but never acknowledged or heartbeated
+    assert len(await dead._read()) == 1
+    assert await alive._read() == []
+
+    await asyncio.sleep(CLAIM_IDLE_MS * 1.5 / 1000)
+    entries = await alive._read()
+
+    assert [fields[b"job_id"].decode() for _, fields in entries] == [published.data.job_id]
+    assert await pending_consumers(redis) == [alive._consumer_name.encode()]
+
+    await alive._dispatch(*entries[0])
+    assert [job.data.job_id for job in alive._daemon.jobs] == [published.data.job_id]
+
+
+@pytest.mark.anyio
+async def test_heartbeat_keeps_running_entries_from_being_reclaimed(redis, streams):
+    running, other = streams
+    await running.publish(job=await create_job(redis))
+
+    entries = await running._read()
+    await running._dispatch(*entries[0])
+
+    # Idle for longer than the claim window, but the heartbeat re-claims the entry in time
+    await asyncio.sleep(CLAIM_IDLE_MS * 1.5 / 1000)
+    await running._extend_claims()
+
+    assert await other._read() == []
+    assert await pending_consumers(redis) == [running._consumer_name.encode()]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("state", ["finished", "cancelled"])
+async def test_reclaimed_entries_of_ended_jobs_are_acknowledged_without_running(redis, streams, state):
+    dead, alive = streams
+    published: Job = await dead.publish(job=await create_job(redis))
+    await dead._read()
+
+    # The consumer ended the job, but died before acknowledging its entry
+    setattr(published.data, state, True)
+    await published.data.update(state)
+
+    await asyncio.sleep(CLAIM_IDLE_MS * 1.5 / 1000)
+    await alive._dispatch(*(await alive._read())[0])
+
+    assert alive._daemon.jobs == []
+    assert await alive.backlog() == (0, 0)
+    assert await pending_consumers(redis) == []
+    assert getattr(await JobData.from_redis(job_id=published.data.job_id, redis=redis), state)
+
+
+@pytest.mark.anyio
+async def test_entries_outliving_their_job_data_are_still_run(redis, streams):
+    consumer, _ = streams
+    published: Job = await consumer.publish(job=await create_job(redis, data=b"x" * 1000))
+
+    # Job data expires after an hour, but the entry waited longer in the stream
+    await published.data.delete()
+
+    await consumer._dispatch(*(await consumer._read())[0])
+
+    assert [job.data.job_id for job in consumer._daemon.jobs] == [published.data.job_id]
+    assert consumer._daemon.jobs[0].file.read() == b"x" * 1000
+    assert await JobData.from_redis(job_id=published.data.job_id, redis=redis) is not None
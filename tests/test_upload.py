@@ -0,0 +1,94 @@
+import hashlib
+import os
+
+import pytest
+
+from criaparse.daemon.upload import UploadStore, UploadOffsetError
+from criaparse.models import ParserStrategy
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def create_upload(store: UploadStore, data: bytes) -> str:
+    session = await store.create(filename="syllabus.pdf", content_type="application/pdf", strategy=ParserStrategy.GENERIC, size=len(data))
+    await store.write(upload_id=session.upload_id, offset=0, chunks=stream(data[:4], data[4:]))
+    return session.upload_id
+
+
+@pytest.mark.anyio
+async def test_finalize_hands_over_the_hashed_file(tmp_path):
+    store: UploadStore = UploadStore(directory=str(tmp_path))
+    upload_id: str = await create_upload(store, b"%PDF-1.7 syllabus")
+
+    async with store.finalize(upload_id=upload_id) as parser_file:
+        assert parser_file.read() == b"%PDF-1.7 syllabus"
+        assert parser_file.known_sha256 == hashlib.sha256(b"%PDF-1.7 syllabus").hexdigest()
+        assert parser_file.filepath.endswith(".pdf")
+
+    # Claimed, so neither finalized again nor pruned
+    assert await store.get(upload_id=upload_id) is None
+    assert os.path.exists(parser_file.filepath)
+
+
+@pytest.mark.anyio
+async def test_finalize_refuses_an_unfinished_upload(tmp_path):
+    store: UploadStore = UploadStore(directory=str(tmp_path))
+    session = await store.create(filename="syllabus.pdf", content_type="application/pdf", strategy=ParserStrategy.GENERIC, size=10)
+    await store.write(upload_id=session.upload_id, offset=0, chunks=stream(b"12345"))
+
+    with pytest.raises(UploadOffsetError) as info:
+        async with store.finalize(upload_id=session.upload_id):
+            pass
+
+    assert info.value.offset == 5
+
+
+@pytest.mark.anyio
+async def test_failed_finalize_keeps_the_upload(tmp_path):
+    store: UploadStore = UploadStore(directory=str(tmp_path))
+    upload_id: str = await create_upload(store, b"%PDF-1.7 syllabus")
+
+    # e.g. the job was refused or Redis was down
+    with pytest.raises(ConnectionError):
+        async with store.finalize(upload_id=upload_id):
+            raise ConnectionError()
+
+    session = await store.get(upload_id=upload_id)
+    assert session.offset == session.size == len(b"%PDF-1.7 syllabus")
+
+    async with store.finalize(upload_id=upload_id) as parser_file:
+        assert parser_file.read() == b"%PDF-1.7 syllabus"
+        assert parser_file.known_sha256 == hashlib.sha256(b"%PDF-1.7 syllabus").hexdigest()
+
+
+@pytest.mark.anyio
+async def test_chunks_written_by_another_process_drop_the_digest(tmp_path):
+    # e.g. two uvicorn workers, or two hosts sharing the volume
+    first: UploadStore = UploadStore(directory=str(tmp_path))
+    second: UploadStore = UploadStore(directory=str(tmp_path))
+
+    session = await first.create(filename="syllabus.pdf", content_type="application/pdf", strategy=ParserStrategy.GENERIC, size=6)
+    await first.write(upload_id=session.upload_id, offset=0, chunks=stream(b"abc"))
+    await second.write(upload_id=session.upload_id, offset=3, chunks=stream(b"def"))
+
+    async with first.finalize(upload_id=session.upload_id) as parser_file:
+        assert parser_file.known_sha256 is None
+        assert parser_file.sha256 == hashlib.sha256(b"abcdef").hexdigest()
+
+
+@pytest.mark.anyio
+async def test_resuming_after_another_process_drops_the_digest(tmp_path):
+    first: UploadStore = UploadStore(directory=str(tmp_path))
+    second: UploadStore = UploadStore(directory=str(tmp_path))
+
+    session = await first.create(filename="syllabus.pdf", content_type="application/pdf", strategy=ParserStrategy.GENERIC, size=9)
+    await first.write(upload_id=session.upload_id, offset=0, chunks=stream(b"abc"))
+    await second.write(upload_id=session.upload_id, offset=3, chunks=stream(b"def"))
+    await first.write(upload_id=session.upload_id, offset=6, chunks=stream(b"ghi"))
+
+    async with first.finalize(upload_id=session.upload_id) as parser_file:
+        assert parser_file.known_sha256 is None
+        assert parser_file.sha256 == hashlib.sha256(b"abcdefghi").hexdigest()